@@ -6,6 +6,7 @@ from services.user_service import get_current_user
 from models.user import User
 from models.weekly_summary import WeeklySummaryCache
 from models.alert_state import UserAlertState
+from services.daily_rollup_service import DailyRollupService
 from datetime import datetime, timedelta, timezone
 
 
@@ -31,15 +32,21 @@ def check_negative_alert(
             if now - last < timedelta(days=7):
                 return {"should_alert": False, "suppressed": True}
 
-        cache = db.query(WeeklySummaryCache).filter(
-            WeeklySummaryCache.user_id == current_user.id,
-            WeeklySummaryCache.period_days == 7
-        ).first()
-        if not cache or not cache.items:
-            return {"should_alert": False}
+        # 기록이 있는 최근 7일의 주감정 (일별 롤업, 롤업이 아직 없으면 주간 요약 캐시)
+        rollups = DailyRollupService.get_recent(db, current_user.id, limit=7)
+        if rollups:
+            raw_items = [{"date": r.date.isoformat(), "primary_emotion": r.primary_emotion or ""} for r in rollups]
+        else:
+            cache = db.query(WeeklySummaryCache).filter(
+                WeeklySummaryCache.user_id == current_user.id,
+                WeeklySummaryCache.period_days == 7
+            ).first()
+            if not cache or not cache.items:
+                return {"should_alert": False}
+            raw_items = cache.items
 
         # 방어적으로 items 파싱
-        raw_items = cache.items or []
+        raw_items = raw_items or []
         if not isinstance(raw_items, list):
             raw_items = []
 
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from services.emotion_color_service import EmotionColorService
 from services.user_service import get_current_user
 from models.user import User
@@ -17,13 +17,41 @@ def get_emotion_colors(current_user: User = Depends(get_current_user)):
 @router.get("/debug/ai-status")
 def check_ai_status(current_user: User = Depends(get_current_user)):
     """AI API 상태 확인 (디버깅용)"""
+    from services.openai_client import get_connection_stats
+    from services.ai_cache import ai_result_cache
+    from services.analysis_worker import record_analysis_worker
+    from services.circuit_breaker import get_breaker_stats
+    from services.single_flight import ai_single_flight
+    from services.rate_limiter import openai_rate_limiter
     api_key = os.getenv("OPENAI_API_KEY")
     return {
         "api_key_exists": bool(api_key),
         "api_key_preview": api_key[:10] + "..." if api_key else None,
-        "message": "AI API 키가 설정되어 있습니다." if api_key else "AI API 키가 설정되지 않았습니다."
+        "message": "AI API 키가 설정되어 있습니다." if api_key else "AI API 키가 설정되지 않았습니다.",
+        "openai_connections": get_connection_stats(),
+        "ai_cache": ai_result_cache.stats(),
+        "record_analysis": record_analysis_worker.stats(),
+        "circuit_breakers": get_breaker_stats(),
+        "single_flight": ai_single_flight.stats(),
+        "rate_limiter": openai_rate_limiter.stats()
     }
 
+@router.get("/debug/ai-metrics")
+def get_ai_metrics(current_user: User = Depends(get_current_user)):
+    """외부 AI 호출 지표 (메서드별 지연/토큰/비용/오류/폴백, 디버깅용)"""
+    from services.ai_metrics import ai_metrics
+    return ai_metrics.snapshot()
+
+@router.post("/debug/ai-metrics/reset")
+def reset_ai_metrics(current_user: User = Depends(get_current_user)):
+    """외부 AI 호출 지표 초기화 (프로세스 전체 지표이므로 개발자 계정만) - 초기화 직전 지표 반환"""
+    from services.ai_metrics import ai_metrics
+    if not current_user.is_developer:
+        raise HTTPException(status_code=403, detail="개발자 계정만 사용할 수 있습니다.")
+    snapshot = ai_metrics.snapshot()
+    ai_metrics.reset()
+    return snapshot
+
 @router.get("/analyze")
 def analyze_text_emotion(text: str, current_user: User = Depends(get_current_user)):
     """텍스트 감정 분석 (테스트용)"""
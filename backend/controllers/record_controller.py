@@ -1,12 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
 import os
 from sqlalchemy.orm import Session
-from typing import List, Optional, Dict
-from pydantic import BaseModel
-from datetime import datetime
+from typing import List, Optional, Dict, Union
+from pydantic import BaseModel, TypeAdapter
+from datetime import date, datetime
 
 from database import get_db
 from services.record_service import RecordService
+from services.analysis_worker import ANALYSIS_MAX_WAIT
+from services.record_search_service import RecordSearchService
 from services.user_service import get_current_user
 from models.user import User
 
@@ -33,12 +36,62 @@ class RecordResponse(BaseModel):
     ai_keywords: List[str]
     ai_summary: str
     emotion_analysis: Dict
+    analysis_status: str = "completed"
     share_with_counselor: bool
     created_at: datetime
     
     class Config:
         from_attributes = True
 
+class RecordListItem(BaseModel):
+    """목록 화면용 요약 (view=compact) - 본문/키워드/감정 분석 JSON은 GET /records/{id}로 조회"""
+    id: int
+    created_at: datetime
+    record_date: Optional[date] = None
+    ai_summary: Optional[str] = None
+    emotion_primary: Optional[str] = None
+    emotion_intensity: Optional[int] = None
+    emotion_color_hex: Optional[str] = None
+    sleep_score: Optional[int] = None
+    stress_score: Optional[int] = None
+    analysis_status: str = "completed"
+    share_with_counselor: bool
+
+    class Config:
+        from_attributes = True
+
+# view=full이면 RecordResponse 목록, compact면 RecordListItem 목록 (OpenAPI 문서용)
+RecordListResponse = Union[List[RecordResponse], List[RecordListItem]]
+# 실제 직렬화는 view로 모델을 골라서 함 (Union 검증에 맡기면 full 검증 실패 시 조용히 compact로 바뀜)
+_RECORD_LIST_ADAPTERS = {
+    "full": TypeAdapter(List[RecordResponse]),
+    "compact": TypeAdapter(List[RecordListItem]),
+}
+
+def _record_list_response(records, view: str, headers: Optional[Dict[str, str]] = None) -> JSONResponse:
+    """view에 맞는 응답 모델로 기록 목록 직렬화"""
+    adapter = _RECORD_LIST_ADAPTERS[view]
+    items = adapter.validate_python(records, from_attributes=True)
+    return JSONResponse(content=adapter.dump_python(items, mode="json"), headers=headers)
+
+class RecordSearchResult(BaseModel):
+    id: int
+    created_at: datetime
+    record_date: Optional[date] = None
+    ai_summary: Optional[str] = None
+    emotion_primary: Optional[str] = None
+    emotion_color_hex: Optional[str] = None
+    score: float
+    snippet: str
+    highlights: List[List[int]]  # snippet 안의 강조 구간 [시작, 끝)
+
+class RecordAnalysisResponse(BaseModel):
+    record_id: int
+    analysis_status: str
+    ai_keywords: List[str]
+    ai_summary: str
+    emotion_analysis: Dict
+
 # API 엔드포인트들
 @router.post("/", response_model=RecordResponse)
 def create_record(
@@ -160,28 +213,49 @@ def seed_weekly_summary(
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"시드 실패: {str(e)}")
 
-@router.get("/", response_model=List[RecordResponse])
+@router.get("/", response_model=RecordListResponse)
 def get_records(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    emotion: Optional[str] = Query(None, max_length=20, description="주감정 필터 (예: 기쁨)"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값 (지정하면 skip 무시)"),
+    view: str = Query("full", pattern="^(full|compact)$", description="compact: 목록용 요약 컬럼만 반환"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """사용자의 감정 기록 목록 조회 (최신순)"""
+    """사용자의 감정 기록 목록 조회 (최신순)
+    - 다음 페이지가 있으면 X-Next-Cursor 헤더로 커서를 돌려줌 (skip 대신 cursor 사용 권장)"""
     try:
-        records = RecordService.get_user_records(
+        if skip and not cursor:
+            # 기존 클라이언트 호환 (offset 방식)
+            records = RecordService.get_user_records(
+                db=db,
+                user_id=current_user.id,
+                skip=skip,
+                limit=limit,
+                emotion=emotion,
+                compact=view == "compact"
+            )
+            return _record_list_response(records, view)
+        records, next_cursor = RecordService.get_user_records_page(
             db=db,
             user_id=current_user.id,
-            skip=skip,
-            limit=limit
+            limit=limit,
+            cursor=cursor,
+            emotion=emotion,
+            compact=view == "compact"
         )
-        return records
+        return _record_list_response(records, view, {"X-Next-Cursor": next_cursor} if next_cursor else None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"감정 기록 조회 실패: {str(e)}")
 
-@router.get("/period/{days}", response_model=List[RecordResponse])
+@router.get("/period/{days}", response_model=RecordListResponse)
 def get_records_by_period(
     days: int,
+    emotion: Optional[str] = Query(None, max_length=20, description="주감정 필터 (예: 기쁨)"),
+    view: str = Query("full", pattern="^(full|compact)$", description="compact: 목록용 요약 컬럼만 반환"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -193,9 +267,11 @@ def get_records_by_period(
         records = RecordService.get_user_records_by_period(
             db=db,
             user_id=current_user.id,
-            days=days
+            days=days,
+            emotion=emotion,
+            compact=view == "compact"
         )
-        return records
+        return _record_list_response(records, view)
     except HTTPException:
         raise
     except Exception as e:
@@ -206,20 +282,52 @@ def get_records_count(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """사용자의 총 감정 기록 수 조회"""
+    """사용자의 총 감정 기록 수 조회 (연속 작성 일수, 이번 달 기록 수 포함)"""
     try:
-        count = RecordService.get_user_records_count(
+        stats = RecordService.get_user_record_stats(
             db=db,
             user_id=current_user.id
         )
+        count = stats["total_records"]
         return {
             "user_id": current_user.id,
             "total_records": count,
+            "current_streak": stats["current_streak"],
+            "month_records": stats["month_records"],
             "message": f"총 {count}개의 감정 기록이 있습니다."
         }
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"기록 수 조회 실패: {str(e)}")
 
+# /{record_id}보다 먼저 등록해야 함
+@router.get("/search", response_model=List[RecordSearchResult])
+def search_records(
+    q: str = Query(..., min_length=1, max_length=100, description="검색어 (본문, 요약, 키워드)"),
+    emotion: Optional[str] = Query(None, max_length=20, description="주감정 필터 (예: 기쁨)"),
+    start_date: Optional[date] = Query(None, description="작성일 시작 (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="작성일 끝 (YYYY-MM-DD)"),
+    limit: int = Query(20, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """내 감정 기록 검색 (관련도 순, 검색어 주변 본문 스니펫 포함)"""
+    try:
+        if start_date and end_date and start_date > end_date:
+            raise HTTPException(status_code=400, detail="시작일이 종료일보다 늦습니다.")
+        return RecordSearchService.search(
+            db=db,
+            user_id=current_user.id,
+            query=q,
+            emotion=emotion,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"기록 검색 실패: {str(e)}")
+
 @router.get("/{record_id}", response_model=RecordResponse)
 def get_record(
     record_id: int,
@@ -241,6 +349,29 @@ def get_record(
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"감정 기록 조회 실패: {str(e)}")
 
+@router.get("/{record_id}/analysis", response_model=RecordAnalysisResponse)
+def get_record_analysis(
+    record_id: int,
+    wait: float = Query(0, ge=0, le=ANALYSIS_MAX_WAIT, description="분석 완료까지 대기할 시간(초, 최대 ANALYSIS_MAX_WAIT), 0이면 즉시 반환"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """감정 기록의 AI 분석 상태 조회 (pending이면 wait초 동안 완료를 기다림)"""
+    try:
+        analysis = RecordService.get_record_analysis(
+            db=db,
+            record_id=record_id,
+            user_id=current_user.id,
+            wait=wait
+        )
+        if not analysis:
+            raise HTTPException(status_code=404, detail="감정 기록을 찾을 수 없습니다.")
+        return analysis
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"분석 상태 조회 실패: {str(e)}")
+
 @router.get("/today/record", response_model=RecordResponse)
 def get_today_record(
     db: Session = Depends(get_db),
@@ -267,17 +398,18 @@ def get_today_status(
 ):
     """오늘 감정 기록 작성 상태 조회"""
     try:
-        record = RecordService.get_today_record(
+        record = RecordService.get_today_record_brief(
             db=db,
             user_id=current_user.id
         )
         
         if record:
+            record_id, created_at = record
             return {
                 "has_record": True,
                 "message": "오늘 감정 기록을 작성했습니다.",
-                "record_id": record.id,
-                "created_at": record.created_at
+                "record_id": record_id,
+                "created_at": created_at
             }
         else:
             return {
@@ -3,10 +3,14 @@ from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from database import get_db
 from services.voice_service import VoiceService
+from services.ai_analysis_service import AIAnalysisService
 from services.user_service import get_current_user
 from models.user import User
 from typing import Dict
+import asyncio
 import logging
+import os
+import tempfile
 
 router = APIRouter(prefix="/voice", tags=["voice"])
 
@@ -55,7 +59,7 @@ async def speech_to_text(
             raise HTTPException(status_code=400, detail=validation_result["error"])
         
         # 음성인식 수행
-        stt_result = voice_service.speech_to_text(audio_data)
+        stt_result = await asyncio.to_thread(voice_service.speech_to_text, audio_data)
         
         if not stt_result["success"]:
             raise HTTPException(status_code=500, detail=stt_result["error"])
@@ -87,7 +91,8 @@ async def voice_to_emotion(
             temp_file.write(content)
             temp_file_path = temp_file.name
         
-        text = AIAnalysisService.speech_to_text_with_clova(temp_file_path)
+        # 블로킹 HTTP 호출은 스레드에서 실행 (이벤트 루프 점유 방지)
+        text = await asyncio.to_thread(AIAnalysisService.speech_to_text_with_clova, temp_file_path)
         os.unlink(temp_file_path)
         
         if not text:
@@ -96,17 +101,16 @@ async def voice_to_emotion(
                 detail="음성 인식에 실패했습니다."
             )
         
-        # 2단계: 텍스트를 감정 분석
-        emotion_analysis = AIAnalysisService.analyze_emotion_with_ai(text)
-        
-        # 3단계: 요약 생성
-        summary = AIAnalysisService.generate_summary_with_ai(text)
+        # 2단계: 감정 분석과 요약 생성을 동시에 수행 (호출별 폴백 유지)
+        analysis = await AIAnalysisService.analyze_text_concurrently_async(
+            text, fields=("summary", "emotion")
+        )
         
         return {
             "success": True,
             "original_text": text,
-            "emotion_analysis": emotion_analysis,
-            "summary": summary,
+            "emotion_analysis": analysis["emotion_analysis"],
+            "summary": analysis["ai_summary"],
             "message": "음성 분석이 완료되었습니다."
         }
         
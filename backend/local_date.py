@@ -0,0 +1,42 @@
+"""
+사용자 기준 날짜 계산 (models, services 양쪽에서 쓰므로 database.py처럼 최상위 모듈로 둠)
+- 하루 한 번 작성 제한/오늘 기록 조회는 서버 시간대가 아니라 서비스 시간대(SIMLOG_TIMEZONE) 날짜를 사용
+- created_at처럼 시간대 정보가 없는 값은 서버 로컬 시각으로 보고 변환 (datetime.now()와 같은 기준)
+"""
+import os
+import logging
+from datetime import date, datetime, timezone, tzinfo
+from typing import Optional
+
+from dotenv import load_dotenv
+
+# 환경 변수 로딩
+load_dotenv(dotenv_path=".env")
+
+# 서비스 시간대 (IANA 이름)
+SIMLOG_TIMEZONE = os.getenv("SIMLOG_TIMEZONE", "Asia/Seoul")
+
+
+def _load_timezone(name: str) -> Optional[tzinfo]:
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(name)
+    except Exception as e:
+        # tzdata가 없는 환경(Windows 등) → 서버 로컬 시간대 사용
+        logging.warning(f"시간대 '{name}'를 불러오지 못해 서버 로컬 시간대를 사용합니다: {e}")
+        return None
+
+
+APP_TIMEZONE = _load_timezone(SIMLOG_TIMEZONE)
+
+
+def local_date(moment: Optional[datetime] = None) -> date:
+    """moment(기본: 현재)의 서비스 시간대 날짜"""
+    if moment is None:
+        moment = datetime.now(timezone.utc)
+    return moment.astimezone(APP_TIMEZONE).date()
+
+
+def local_today() -> date:
+    """서비스 시간대 기준 오늘 날짜"""
+    return local_date()
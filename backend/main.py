@@ -1,7 +1,7 @@
 from fastapi import FastAPI
 import os
 import logging
-from sqlalchemy import text
+from sqlalchemy import text, inspect
 from database import Base, engine
 
 # 기본 모델들만 먼저 import
@@ -50,6 +50,27 @@ try:
 except Exception as e:
     logging.warning(f"Failed to import SharedReport model: {e}")
 
+try:
+    from models.ai_analysis_cache import AIAnalysisCache
+    additional_models.append(AIAnalysisCache.__table__)
+    logging.info("AIAnalysisCache model imported successfully")
+except Exception as e:
+    logging.warning(f"Failed to import AIAnalysisCache model: {e}")
+
+try:
+    from models.daily_emotion_rollup import DailyEmotionRollup
+    additional_models.append(DailyEmotionRollup.__table__)
+    logging.info("DailyEmotionRollup model imported successfully")
+except Exception as e:
+    logging.warning(f"Failed to import DailyEmotionRollup model: {e}")
+
+try:
+    from models.user_record_stats import UserRecordStats
+    additional_models.append(UserRecordStats.__table__)
+    logging.info("UserRecordStats model imported successfully")
+except Exception as e:
+    logging.warning(f"Failed to import UserRecordStats model: {e}")
+
 # 실제로는 garden_item_templates와 garden_items를 사용
 # shop_items, user_inventory는 별도 테이블이 아님
 logging.info("Shop and inventory use garden_item_templates and garden_items tables")
@@ -67,8 +88,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # 모든 HTTP 메서드 허용
     allow_headers=["*"],  # 모든 헤더 허용
+    expose_headers=["X-Next-Cursor"],  # 기록 목록 다음 페이지 커서
 )
 
+# 요청별 외부 API 마감 시간 (OpenAI/CLOVA 호출은 남은 예산만큼만 대기 후 폴백)
+from services.deadline import deadline_budget, REQUEST_DEADLINE_SECONDS
+
+@app.middleware("http")
+async def request_deadline_budget(request, call_next):
+    with deadline_budget(REQUEST_DEADLINE_SECONDS):
+        return await call_next(request)
+
 # 기본 엔드포인트
 @app.get("/")
 def read_root():
@@ -78,6 +108,77 @@ def read_root():
 def health_check():
     return {"status": "healthy", "message": "SimLog API is running!"}
 
+# create_all은 기존 테이블에 컬럼을 추가하지 않으므로 새 컬럼/인덱스는 여기서 보완
+# (테이블, 컬럼, 컬럼 DDL)
+SCHEMA_COLUMN_MIGRATIONS = [
+    ("records", "analysis_status", "VARCHAR(20) NOT NULL DEFAULT 'completed'"),
+    ("records", "analysis_claimed_at", "DATETIME NULL"),
+    ("records", "emotion_primary", "VARCHAR(20) NULL"),
+    ("records", "emotion_intensity", "INTEGER NULL"),
+    ("records", "emotion_confidence", "FLOAT NULL"),
+    ("records", "emotion_color_hex", "VARCHAR(7) NULL"),
+    ("records", "record_date", "DATE NULL"),
+    ("records", "daily_record_date", "DATE NULL"),
+    ("records", "keywords_text", "TEXT NULL"),
+]
+# (테이블, 인덱스 이름, 인덱스 컬럼 목록)
+SCHEMA_INDEX_MIGRATIONS = [
+    ("records", "ix_records_analysis_status", "analysis_status"),
+    ("records", "ix_records_user_created_id", "user_id, created_at, id"),
+    ("records", "ix_records_user_emotion_created", "user_id, emotion_primary, created_at"),
+    ("records", "ix_records_user_record_date", "user_id, record_date"),
+]
+# (테이블, 유니크 인덱스 이름, 인덱스 컬럼 목록)
+SCHEMA_UNIQUE_INDEX_MIGRATIONS = [
+    ("records", "ux_records_user_daily_date", "user_id, daily_record_date"),
+]
+# (테이블, FULLTEXT 인덱스 이름, 인덱스 컬럼 목록) - MySQL 전용, 한국어 검색을 위해 ngram 파서 사용
+SCHEMA_FULLTEXT_INDEX_MIGRATIONS = [
+    ("records", "ft_records_search", "content, ai_summary, keywords_text"),
+]
+
+def _apply_schema_migrations():
+    """기존 테이블에 누락된 컬럼/인덱스 추가"""
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    with engine.begin() as connection:
+        for table, column, ddl in SCHEMA_COLUMN_MIGRATIONS:
+            if table not in existing_tables:
+                continue
+            columns = {c["name"] for c in inspector.get_columns(table)}
+            if column not in columns:
+                connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+                logging.info(f"Added column {table}.{column}")
+        # 작성일 컬럼이 비어 있는 기존 기록은 유니크 인덱스(하루 한 번 제한)를 만들기 전에 채움
+        if "records" in existing_tables:
+            from models.record import backfill_record_dates
+            updated = backfill_record_dates(connection)
+            if updated:
+                logging.info(f"Backfilled record dates for {updated} records")
+                # 연속 작성 일수/이번 달 기록 수는 작성일 기준 → 저장된 카운터는 지우고 첫 조회 때 다시 계산
+                if "user_record_stats" in existing_tables:
+                    connection.execute(text("DELETE FROM user_record_stats"))
+                    logging.info("Cleared user_record_stats for recomputation")
+        index_migrations = [(m, "INDEX") for m in SCHEMA_INDEX_MIGRATIONS] + \
+            [(m, "UNIQUE INDEX") for m in SCHEMA_UNIQUE_INDEX_MIGRATIONS]
+        for (table, index_name, index_columns), kind in index_migrations:
+            if table not in existing_tables:
+                continue
+            indexes = {i["name"] for i in inspect(connection).get_indexes(table)}
+            if index_name not in indexes:
+                connection.execute(text(f"CREATE {kind} {index_name} ON {table} ({index_columns})"))
+                logging.info(f"Created index {index_name}")
+        if engine.dialect.name == "mysql":
+            for table, index_name, index_columns in SCHEMA_FULLTEXT_INDEX_MIGRATIONS:
+                if table not in existing_tables:
+                    continue
+                indexes = {i["name"] for i in inspect(connection).get_indexes(table)}
+                if index_name not in indexes:
+                    connection.execute(text(
+                        f"CREATE FULLTEXT INDEX {index_name} ON {table} ({index_columns}) WITH PARSER ngram"
+                    ))
+                    logging.info(f"Created fulltext index {index_name}")
+
 # 데이터베이스 초기화 (오류 처리 포함)
 try:
     # 데이터베이스 연결 테스트
@@ -88,6 +189,10 @@ try:
     Base.metadata.create_all(bind=engine)
     logging.info("Database tables created successfully")
     
+    # 기존 테이블 스키마 보완
+    _apply_schema_migrations()
+    logging.info("Database schema migrations applied")
+    
 except Exception as e:
     logging.error(f"Database initialization failed: {e}")
     logging.error(f"Error type: {type(e)}")
@@ -240,6 +345,20 @@ def seed_on_startup():
         logging.warning(f"Shop initialization failed: {e}")
         # 상점 초기화 실패해도 앱은 계속 실행
     
+    # 재시작 전에 끝나지 않은 기록 분석 작업 재개
+    try:
+        from database import SessionLocal
+        from services.record_service import RecordService
+        db = SessionLocal()
+        try:
+            resumed = RecordService.resume_pending_analyses(db)
+        finally:
+            db.close()
+        if resumed:
+            logging.info(f"Resumed {resumed} pending record analyses")
+    except Exception as e:
+        logging.warning(f"Resuming pending analyses failed: {e}")
+    
     # 개발용 더미 데이터 시드 (옵션)
     if os.environ.get("SIMLOG_DEV_SEED_WEEK") == "1":
         try:
@@ -0,0 +1,216 @@
+"""
+DB 유지보수 작업 모음 (서브커맨드)
+- rollup: 일별 감정 롤업(daily_emotion_rollup)을 records에서 다시 계산 (최초 도입 시 채우기/불일치 복구)
+  사용자 단위 트랜잭션으로 처리하므로 중간에 멈춰도 다시 실행하면 됨
+- emotion-columns: records의 감정 컬럼(emotion_primary 등)을 emotion_analysis JSON에서 채움
+  id 키셋 청크 단위로 읽고 executemany UPDATE 후 청크마다 커밋
+- record-dates: records.record_date(서비스 시간대 작성일)와 daily_record_date(하루 한 번 제한 슬롯)를 채움
+  개발자 모드가 아닌 사용자는 날짜별 첫 기록만 슬롯을 가짐, 사용자 단위 트랜잭션
+  (record_date가 빈 기록은 서버 시작 시 스키마 마이그레이션이 채우므로, 시간대를 바꾼 뒤 다시 계산할 때 사용)
+- search-text: records.keywords_text(FULLTEXT 검색용 키워드 텍스트)를 ai_keywords JSON에서 채움 (emotion-columns와 같은 방식)
+- record-stats: 사용자별 기록 카운터(user_record_stats)를 records에서 다시 계산 (record-dates 이후 실행)
+  사용자 단위 트랜잭션
+- ai-cache: AI 결과 캐시 테이블(ai_analysis_cache)에서 만료된 행을 지우고 최대 행 수(AI_CACHE_MAX_ROWS)를 유지
+  cron 등으로 주기 실행 (예: 매일 새벽)
+
+사용 예:
+    python maintenance_jobs.py rollup
+    python maintenance_jobs.py rollup --user-id 42
+    python maintenance_jobs.py rollup --days 30
+    python maintenance_jobs.py emotion-columns --only-missing
+    python maintenance_jobs.py record-dates --user-id 42
+    python maintenance_jobs.py search-text --only-missing
+    python maintenance_jobs.py record-stats
+    python maintenance_jobs.py ai-cache --max-rows 100000
+"""
+import time
+import logging
+import argparse
+from datetime import timedelta
+from typing import List
+
+from sqlalchemy import bindparam, update
+
+from database import SessionLocal
+from models.user import User
+from models.record import Record, emotion_columns, keywords_text, record_date_updates
+from services.ai_cache import ai_result_cache, AI_CACHE_MAX_ROWS
+from services.daily_rollup_service import DailyRollupService
+from local_date import local_today
+from services.user_stats_service import UserStatsService
+
+
+def _target_user_ids(db, user_id=None) -> List[int]:
+    """기록이 있는 사용자 id 목록"""
+    if user_id is not None:
+        return [user_id]
+    return [uid for (uid,) in db.query(Record.user_id).distinct().order_by(Record.user_id)]
+
+
+# ----- rollup -----
+def run_rollup(args) -> None:
+    start_day = local_today() - timedelta(days=args.days) if args.days else None
+    db = SessionLocal()
+    try:
+        user_ids = _target_user_ids(db, args.user_id)
+        logging.info(f"롤업 재계산 대상 사용자 {len(user_ids)}명" + (f" ({start_day} 이후)" if start_day else ""))
+        started = time.monotonic()
+        total_days = 0
+        for index, user_id in enumerate(user_ids, start=1):
+            try:
+                total_days += DailyRollupService.rebuild_user(db, user_id, start_day)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logging.error(f"사용자 {user_id} 롤업 재계산 실패: {e}")
+            if index % 100 == 0 or index == len(user_ids):
+                logging.info(f"{index}/{len(user_ids)}명 완료, {total_days}일 ({time.monotonic() - started:.1f}초)")
+    finally:
+        db.close()
+
+
+# ----- emotion-columns / search-text -----
+def _backfill_columns(args, source, compute, missing) -> None:
+    """id 키셋 청크로 source 컬럼을 읽어 compute(값) 결과 컬럼을 executemany UPDATE"""
+    table = Record.__table__
+    columns = list(compute(None).keys())
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("b_id"))
+        .values({column: bindparam(column) for column in columns})
+    )
+    db = SessionLocal()
+    try:
+        started = time.monotonic()
+        last_id, total = 0, 0
+        while True:
+            query = db.query(Record.id, source).filter(Record.id > last_id, source.isnot(None))
+            if args.only_missing:
+                query = query.filter(missing)
+            rows = query.order_by(Record.id).limit(args.chunk_size).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            params = [dict(compute(value), b_id=record_id) for record_id, value in rows]
+            db.execute(stmt, params)
+            db.commit()
+            total += len(params)
+            logging.info(f"{', '.join(columns)}: {total}건 갱신 (마지막 id {last_id}, {time.monotonic() - started:.1f}초)")
+        logging.info(f"컬럼 채우기 완료: {total}건")
+    finally:
+        db.close()
+
+
+def run_emotion_columns(args) -> None:
+    _backfill_columns(args, Record.emotion_analysis, emotion_columns, Record.emotion_primary.is_(None))
+
+
+def run_search_text(args) -> None:
+    _backfill_columns(args, Record.ai_keywords, lambda value: {"keywords_text": keywords_text(value)},
+                      Record.keywords_text.is_(None))
+
+
+# ----- record-dates -----
+def run_record_dates(args) -> None:
+    table = Record.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("b_id"))
+        .values(record_date=bindparam("record_date"), daily_record_date=bindparam("daily_record_date"))
+    )
+    db = SessionLocal()
+    try:
+        user_ids = _target_user_ids(db, args.user_id)
+        developers = {uid for (uid,) in db.query(User.id).filter(User.is_developer.is_(True))}
+        logging.info(f"작성일 채우기 대상 사용자 {len(user_ids)}명")
+        started = time.monotonic()
+        total = 0
+        for index, user_id in enumerate(user_ids, start=1):
+            try:
+                rows = db.query(
+                    Record.id, Record.created_at, Record.record_date, Record.daily_record_date
+                ).filter(Record.user_id == user_id).order_by(Record.created_at, Record.id).all()
+                params = record_date_updates(rows, daily_limited=user_id not in developers)
+                if params:
+                    db.execute(stmt, params)
+                db.commit()
+                total += len(params)
+            except Exception as e:
+                db.rollback()
+                logging.error(f"사용자 {user_id} 작성일 채우기 실패: {e}")
+            if index % 100 == 0 or index == len(user_ids):
+                logging.info(f"{index}/{len(user_ids)}명 완료, {total}건 갱신 ({time.monotonic() - started:.1f}초)")
+    finally:
+        db.close()
+
+
+# ----- record-stats -----
+def run_record_stats(args) -> None:
+    db = SessionLocal()
+    try:
+        user_ids = _target_user_ids(db, args.user_id)
+        logging.info(f"기록 카운터 재계산 대상 사용자 {len(user_ids)}명")
+        started = time.monotonic()
+        for index, user_id in enumerate(user_ids, start=1):
+            try:
+                UserStatsService.recompute(db, user_id)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logging.error(f"사용자 {user_id} 기록 카운터 재계산 실패: {e}")
+            if index % 100 == 0 or index == len(user_ids):
+                logging.info(f"{index}/{len(user_ids)}명 완료 ({time.monotonic() - started:.1f}초)")
+    finally:
+        db.close()
+
+
+# ----- ai-cache -----
+def run_ai_cache(args) -> None:
+    db = SessionLocal()
+    try:
+        started = time.monotonic()
+        deleted = ai_result_cache.purge_persistent(db, max_rows=args.max_rows)
+        logging.info(f"AI 캐시 정리 완료: {deleted}행 삭제 ({time.monotonic() - started:.1f}초)")
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SimLog DB 유지보수 작업")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rollup = subparsers.add_parser("rollup", help="일별 감정 롤업 재계산")
+    rollup.add_argument("--user-id", type=int, default=None, help="특정 사용자만 처리")
+    rollup.add_argument("--days", type=int, default=None, help="최근 N일만 다시 계산 (기본: 전체)")
+    rollup.set_defaults(func=run_rollup)
+
+    emotion = subparsers.add_parser("emotion-columns", help="records 감정 컬럼을 emotion_analysis에서 채움")
+    emotion.add_argument("--chunk-size", type=int, default=1000, help="한 번에 읽고 갱신할 기록 수")
+    emotion.add_argument("--only-missing", action="store_true", help="emotion_primary가 비어 있는 기록만 처리")
+    emotion.set_defaults(func=run_emotion_columns)
+
+    search_text = subparsers.add_parser("search-text", help="records 키워드 검색 텍스트(keywords_text)를 ai_keywords에서 채움")
+    search_text.add_argument("--chunk-size", type=int, default=1000, help="한 번에 읽고 갱신할 기록 수")
+    search_text.add_argument("--only-missing", action="store_true", help="keywords_text가 비어 있는 기록만 처리")
+    search_text.set_defaults(func=run_search_text)
+
+    record_dates = subparsers.add_parser("record-dates", help="records 작성일/하루 한 번 제한 슬롯 채우기")
+    record_dates.add_argument("--user-id", type=int, default=None, help="특정 사용자만 처리")
+    record_dates.set_defaults(func=run_record_dates)
+
+    record_stats = subparsers.add_parser("record-stats", help="사용자별 기록 카운터 재계산")
+    record_stats.add_argument("--user-id", type=int, default=None, help="특정 사용자만 처리")
+    record_stats.set_defaults(func=run_record_stats)
+
+    ai_cache = subparsers.add_parser("ai-cache", help="AI 결과 캐시 테이블 정리 (만료 행 삭제, 최대 행 수 유지)")
+    ai_cache.add_argument("--max-rows", type=int, default=AI_CACHE_MAX_ROWS, help="남길 최대 행 수 (0이면 만료 행만 삭제)")
+    ai_cache.set_defaults(func=run_ai_cache)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+부하 테스트용 로컬 AI 모의 서버 (OpenAI chat completions + NAVER CLOVA STT)
+- OpenAI/CLOVA 없이 RecordService.create_record, voice_controller 처리량과 꼬리 지연을 측정하기 위한 대역
+- 응답 지연 분포, 오류율, 고정 응답(JSON)을 환경 변수/실행 옵션 또는 /mock/config로 설정
+
+실행:
+    python mock_ai_server.py --port 8100 --openai-latency lognormal:800,0.5 --openai-error-rate 0.02
+
+백엔드 연결 (.env):
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1
+    OPENAI_API_KEY=mock
+    CLOVA_STT_URL=http://127.0.0.1:8100/recog/v1/stt
+    CLOVA_CLIENT_ID=mock
+    CLOVA_CLIENT_SECRET=mock
+
+지연 분포 형식 (단위 ms):
+    fixed:300 | uniform:200,800 | normal:500,100 | lognormal:500,0.6 (중앙값, sigma)
+고정 응답 파일(--responses, MOCK_RESPONSES_FILE): DEFAULT_RESPONSES와 같은 키를 가진 JSON (일부만 덮어써도 됨)
+"""
+import os
+import json
+import math
+import time
+import random
+import asyncio
+import argparse
+import threading
+from typing import Dict, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from dotenv import load_dotenv
+
+# 환경 변수 로딩
+load_dotenv(dotenv_path=".env")
+
+DEFAULT_RESPONSES = {
+    "combined": {
+        "keywords": ["피곤", "우울", "스트레스"],
+        "summary": "일이 많아 지치고 우울한 하루",
+        "emotion": {
+            "primary_emotion": "슬픔",
+            "intensity": 6,
+            "confidence": 0.8,
+            "reasoning": "피로와 우울감에 대한 표현이 반복됨",
+            "color_name": "깊은 파랑"
+        }
+    },
+    "emotion": {
+        "primary_emotion": "슬픔",
+        "intensity": 6,
+        "confidence": 0.8,
+        "reasoning": "피로와 우울감에 대한 표현이 반복됨",
+        "color_name": "깊은 파랑"
+    },
+    "summary": "일이 많아 지치고 우울한 하루",
+    "keywords": {"keywords": ["피곤", "우울", "스트레스"]},
+    "color_name": "차분한 파랑",
+    "stt": {"text": "오늘은 일이 많아서 조금 피곤했어요.", "confidence": 0.93},
+}
+
+
+def parse_latency(spec: str):
+    """지연 분포 문자열 → 샘플러(초 단위 반환)"""
+    kind, _, params = (spec or "fixed:0").partition(":")
+    values = [float(v) for v in params.split(",") if v.strip()] or [0.0]
+    if kind == "fixed":
+        return lambda: values[0] / 1000
+    if kind == "uniform":
+        low, high = values[0], values[1] if len(values) > 1 else values[0]
+        return lambda: random.uniform(low, high) / 1000
+    if kind == "normal":
+        mean, std = values[0], values[1] if len(values) > 1 else 0.0
+        return lambda: max(0.0, random.gauss(mean, std)) / 1000
+    if kind == "lognormal":
+        median, sigma = values[0], values[1] if len(values) > 1 else 0.5
+        mu = math.log(max(median, 1e-3))
+        return lambda: random.lognormvariate(mu, sigma) / 1000
+    raise ValueError(f"알 수 없는 지연 분포: {spec}")
+
+
+class MockConfig:
+    """업스트림별 지연/오류 설정 (실행 중 /mock/config로 변경 가능)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.upstreams = {}
+        self.responses = json.loads(json.dumps(DEFAULT_RESPONSES))
+        self.stats = {}
+        for name in ("openai", "clova"):
+            prefix = f"MOCK_{name.upper()}"
+            self.configure(name, {
+                "latency": os.getenv(f"{prefix}_LATENCY", "lognormal:600,0.5" if name == "openai" else "lognormal:900,0.4"),
+                "error_rate": float(os.getenv(f"{prefix}_ERROR_RATE", "0")),
+                "error_statuses": os.getenv(f"{prefix}_ERROR_STATUSES", "500,503,429"),
+                "timeout_rate": float(os.getenv(f"{prefix}_TIMEOUT_RATE", "0")),
+            })
+        responses_file = os.getenv("MOCK_RESPONSES_FILE")
+        if responses_file:
+            self.load_responses(responses_file)
+
+    def configure(self, name: str, values: Dict) -> None:
+        with self._lock:
+            current = dict(self.upstreams.get(name, {}))
+            current.update({k: v for k, v in values.items() if v is not None})
+            if isinstance(current.get("error_statuses"), str):
+                current["error_statuses"] = [int(s) for s in current["error_statuses"].split(",") if s.strip()]
+            current["sampler"] = parse_latency(current["latency"])
+            self.upstreams[name] = current
+            self.stats.setdefault(name, {"requests": 0, "errors": 0, "timeouts": 0})
+
+    def load_responses(self, path: str) -> None:
+        with open(path, "r", encoding="utf-8") as f:
+            self.responses.update(json.load(f))
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "upstreams": {
+                    name: {k: v for k, v in cfg.items() if k != "sampler"}
+                    for name, cfg in self.upstreams.items()
+                },
+                "stats": json.loads(json.dumps(self.stats)),
+            }
+
+    def count(self, name: str, key: str) -> None:
+        with self._lock:
+            self.stats[name][key] += 1
+
+
+config = MockConfig()
+app = FastAPI(title="SimLog mock AI server")
+
+
+async def _simulate(name: str) -> Optional[JSONResponse]:
+    """설정된 분포만큼 지연 후, 오류율에 따라 오류 응답 반환 (정상이면 None)"""
+    cfg = config.upstreams[name]
+    config.count(name, "requests")
+    if random.random() < cfg["timeout_rate"]:
+        # 클라이언트 타임아웃을 유도하기 위해 충분히 오래 대기
+        config.count(name, "timeouts")
+        await asyncio.sleep(600)
+    await asyncio.sleep(cfg["sampler"]())
+    if random.random() < cfg["error_rate"]:
+        config.count(name, "errors")
+        status = random.choice(cfg["error_statuses"] or [500])
+        return JSONResponse(
+            status_code=status,
+            content={"error": {"message": f"mock upstream error ({status})", "type": "mock_error", "code": status}},
+        )
+    return None
+
+
+def _classify_prompt(body: Dict) -> str:
+    """요청 형태로 AIAnalysisService의 어느 호출인지 구분"""
+    response_format = body.get("response_format") or {}
+    if response_format.get("type") == "json_schema":
+        return "combined"
+    prompt = " ".join(m.get("content", "") for m in body.get("messages", []) if isinstance(m.get("content"), str))
+    if '"keywords"' in prompt:
+        return "keywords"
+    if '"primary_emotion"' in prompt:
+        return "emotion"
+    if "색상 이름" in prompt:
+        return "color_name"
+    return "summary"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    error = await _simulate("openai")
+    if error:
+        return error
+
+    kind = _classify_prompt(body)
+    canned = config.responses.get(kind, "")
+    content = canned if isinstance(canned, str) else json.dumps(canned, ensure_ascii=False)
+    prompt_chars = sum(len(m.get("content", "")) for m in body.get("messages", []) if isinstance(m.get("content"), str))
+    # 한국어 기준 대략 2자당 1토큰
+    prompt_tokens = max(1, prompt_chars // 2)
+    completion_tokens = max(1, len(content) // 2)
+    return {
+        "id": f"chatcmpl-mock-{int(time.time() * 1000)}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "mock"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+@app.post("/recog/v1/stt")
+async def clova_stt(request: Request):
+    audio = await request.body()
+    error = await _simulate("clova")
+    if error:
+        return error
+    if not audio:
+        return JSONResponse(status_code=400, content={"error": {"errorCode": "STT000", "message": "Empty audio"}})
+    return config.responses["stt"]
+
+
+@app.get("/mock/config")
+def get_mock_config():
+    return config.snapshot()
+
+
+@app.put("/mock/config/{upstream}")
+def update_mock_config(upstream: str, values: Dict):
+    """실행 중 설정 변경 예: {"latency": "fixed:2000", "error_rate": 0.3}"""
+    if upstream not in config.upstreams:
+        return JSONResponse(status_code=404, content={"detail": f"unknown upstream: {upstream}"})
+    try:
+        config.configure(upstream, values)
+    except (ValueError, TypeError) as e:
+        return JSONResponse(status_code=400, content={"detail": str(e)})
+    return config.snapshot()
+
+
+@app.put("/mock/responses")
+def update_mock_responses(values: Dict):
+    config.responses.update(values)
+    return config.responses
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SimLog 부하 테스트용 OpenAI/CLOVA 모의 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.getenv("MOCK_AI_PORT", "8100")))
+    parser.add_argument("--openai-latency", default=None, help="예: lognormal:600,0.5")
+    parser.add_argument("--openai-error-rate", type=float, default=None)
+    parser.add_argument("--clova-latency", default=None, help="예: uniform:500,1500")
+    parser.add_argument("--clova-error-rate", type=float, default=None)
+    parser.add_argument("--responses", default=None, help="고정 응답 JSON 파일")
+    parser.add_argument("--seed", type=int, default=None, help="지연/오류 난수 시드 (재현용)")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    config.configure("openai", {"latency": args.openai_latency, "error_rate": args.openai_error_rate})
+    config.configure("clova", {"latency": args.clova_latency, "error_rate": args.clova_error_rate})
+    if args.responses:
+        config.load_responses(args.responses)
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
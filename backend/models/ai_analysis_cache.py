@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, UniqueConstraint
+from sqlalchemy.sql import func
+from database import Base
+
+
+class AIAnalysisCache(Base):
+    __tablename__ = "ai_analysis_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # sha256(항목 + 모델 + 프롬프트 버전 + 정규화된 본문)
+    cache_key = Column(String(64), nullable=False, index=True)
+    kind = Column(String(20), nullable=False)  # 'emotion', 'summary', 'keywords', 'condensed'
+    model = Column(String(50), nullable=False)
+    prompt_version = Column(String(20), nullable=False)
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    __table_args__ = (
+        UniqueConstraint('cache_key', name='ux_ai_analysis_cache_key'),
+    )
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+from database import Base
+
+
+class DailyEmotionRollup(Base):
+    """사용자별 하루 감정 요약 (그날 마지막 기록 기준, 기록 생성/수정/삭제와 같은 트랜잭션에서 갱신)"""
+    __tablename__ = "daily_emotion_rollup"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    date = Column(Date, nullable=False)
+    # 그날의 대표 기록 (요약/본문 참조용)
+    record_id = Column(Integer, ForeignKey("records.id", ondelete="SET NULL"), nullable=True)
+    record_count = Column(Integer, nullable=False, default=1)
+
+    primary_emotion = Column(String(20), nullable=True)
+    intensity = Column(Integer, nullable=True)
+    color_r = Column(Integer, nullable=True)
+    color_g = Column(Integer, nullable=True)
+    color_b = Column(Integer, nullable=True)
+    sleep_score = Column(Integer, nullable=True)
+    stress_score = Column(Integer, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        # 기간 조회는 (user_id, date) 범위 스캔
+        UniqueConstraint('user_id', 'date', name='ux_daily_emotion_rollup_user_date'),
+    )
@@ -1,10 +1,23 @@
-from sqlalchemy import Column, Integer, String, Text, Float, Boolean, DateTime, ForeignKey, JSON
+from typing import Dict, List, Optional
+from sqlalchemy import Column, Integer, String, Text, Float, Boolean, Date, DateTime, ForeignKey, JSON, Index, event
+from sqlalchemy import bindparam, select, update
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
+from local_date import local_date
 
 class Record(Base):
     __tablename__ = "records"
+    __table_args__ = (
+        # 사용자별 기간 조회/통계, 목록 커서 페이지네이션(created_at, id)용
+        Index("ix_records_user_created_id", "user_id", "created_at", "id"),
+        # 감정별 필터/집계용
+        Index("ix_records_user_emotion_created", "user_id", "emotion_primary", "created_at"),
+        # 오늘 기록 조회용
+        Index("ix_records_user_record_date", "user_id", "record_date"),
+        # 하루 한 번 작성 제한 (개발자 모드 기록은 daily_record_date가 NULL이라 제외)
+        Index("ux_records_user_daily_date", "user_id", "daily_record_date", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -18,12 +31,123 @@ class Record(Base):
     ai_keywords = Column(JSON, nullable=True)  # AI가 추출한 키워드들
     ai_summary = Column(Text, nullable=True)  # AI가 생성한 한 줄 요약
     emotion_analysis = Column(JSON, nullable=True)  # 감정 분석 결과 (색상 포함)
+    # emotion_analysis에서 뽑은 검색/집계용 컬럼 (저장 시 자동 갱신, 기존 행은 maintenance_jobs.py emotion-columns)
+    emotion_primary = Column(String(20), nullable=True)
+    emotion_intensity = Column(Integer, nullable=True)
+    emotion_confidence = Column(Float, nullable=True)
+    emotion_color_hex = Column(String(7), nullable=True)
+    # ai_keywords를 공백으로 이은 검색용 텍스트 (MySQL FULLTEXT 인덱스 대상, 저장 시 자동 갱신)
+    keywords_text = Column(Text, nullable=True)
+    # AI 분석 상태: 'pending'(백그라운드 분석 대기/진행 중), 'completed'
+    # (분석 실패 시 pending으로 남아 서버 재시작 때 다시 시도)
+    analysis_status = Column(String(20), nullable=False, default="completed", server_default="completed", index=True)
+    # 분석 작업을 선점한 시각 (워커 프로세스 간 중복 분석 방지, 완료/미선점이면 의미 없음)
+    analysis_claimed_at = Column(DateTime(timezone=True), nullable=True)
     
     # 상담 공유 설정 (기본값: false)
     share_with_counselor = Column(Boolean, default=False, nullable=False)
     
     # 생성 시간
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    # 작성일 (서비스 시간대 기준, 기존 행은 maintenance_jobs.py record-dates)
+    record_date = Column(Date, nullable=True)
+    # 하루 한 번 제한 대상 기록의 작성일 (개발자 모드 기록은 NULL)
+    daily_record_date = Column(Date, nullable=True)
     
     # 관계 설정
-    user = relationship("User", back_populates="records") 
\ No newline at end of file
+    user = relationship("User", back_populates="records") 
+
+
+def emotion_columns(emotion_analysis: Optional[Dict]) -> Dict:
+    """emotion_analysis JSON → 감정 컬럼 값 (형식이 맞지 않는 값은 None)"""
+    analysis = emotion_analysis if isinstance(emotion_analysis, dict) else {}
+    color = analysis.get("color") if isinstance(analysis.get("color"), dict) else {}
+
+    def _number(value, cast):
+        try:
+            return cast(value) if value is not None else None
+        except (TypeError, ValueError):
+            return None
+
+    primary = analysis.get("primary_emotion")
+    color_hex = color.get("hex")
+    return {
+        "emotion_primary": primary[:20] if isinstance(primary, str) and primary else None,
+        "emotion_intensity": _number(analysis.get("intensity", color.get("intensity")), int),
+        "emotion_confidence": _number(analysis.get("confidence"), float),
+        "emotion_color_hex": color_hex[:7] if isinstance(color_hex, str) and color_hex else None,
+    }
+
+
+def keywords_text(ai_keywords) -> Optional[str]:
+    """ai_keywords JSON → 검색용 텍스트"""
+    if not isinstance(ai_keywords, (list, tuple)):
+        return None
+    words = [str(keyword).strip() for keyword in ai_keywords if keyword is not None and str(keyword).strip()]
+    return " ".join(words) or None
+
+
+def record_date_updates(rows, daily_limited: bool) -> List[dict]:
+    """(id, created_at, record_date, daily_record_date) 목록(작성 순) → 바뀌는 행의 UPDATE 파라미터"""
+    updates = []
+    claimed = set()
+    for record_id, created_at, record_date, daily_record_date in rows:
+        day = local_date(created_at) if created_at else record_date
+        daily = None
+        if daily_limited and day is not None and day not in claimed:
+            daily = day
+            claimed.add(day)
+        if (day, daily) != (record_date, daily_record_date):
+            updates.append({"b_id": record_id, "record_date": day, "daily_record_date": daily})
+    # 슬롯을 비우는 행을 먼저 갱신해야 유니크 인덱스와 충돌하지 않음
+    updates.sort(key=lambda param: param["daily_record_date"] is not None)
+    return updates
+
+
+def backfill_record_dates(connection) -> int:
+    """record_date가 빈 기존 기록이 있는 사용자의 작성일/하루 한 번 제한 슬롯 채우기 (스키마 마이그레이션용), 갱신 행 수 반환
+    컬럼 추가(ALTER) 직후 기존 행은 NULL이라 (user_id, daily_record_date) 유니크 인덱스가 오늘 두 번째 기록을 막지 못함"""
+    from models.user import User
+
+    table = Record.__table__
+    user_ids = connection.execute(
+        select(table.c.user_id).where(table.c.record_date.is_(None)).distinct()
+    ).scalars().all()
+    if not user_ids:
+        return 0
+    developers = set(connection.execute(
+        select(User.__table__.c.id).where(User.__table__.c.is_developer.is_(True))
+    ).scalars())
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("b_id"))
+        .values(record_date=bindparam("record_date"), daily_record_date=bindparam("daily_record_date"))
+    )
+    total = 0
+    for user_id in user_ids:
+        rows = connection.execute(
+            select(table.c.id, table.c.created_at, table.c.record_date, table.c.daily_record_date)
+            .where(table.c.user_id == user_id)
+            .order_by(table.c.created_at, table.c.id)
+        ).all()
+        params = record_date_updates(rows, daily_limited=user_id not in developers)
+        if params:
+            connection.execute(stmt, params)
+        total += len(params)
+    return total
+
+
+@event.listens_for(Record, "before_insert")
+def _set_record_date(mapper, connection, target: Record) -> None:
+    """작성일이 지정되지 않은 기록은 작성 시각(없으면 현재)의 서비스 시간대 날짜로 채움"""
+    if target.record_date is None:
+        target.record_date = local_date(target.created_at)
+
+
+@event.listens_for(Record, "before_insert")
+@event.listens_for(Record, "before_update")
+def _sync_emotion_columns(mapper, connection, target: Record) -> None:
+    """ORM으로 저장할 때 감정/키워드 검색 컬럼을 JSON 값과 맞춤 (일괄 UPDATE는 호출 측에서 emotion_columns/keywords_text 사용)"""
+    for column, value in emotion_columns(target.emotion_analysis).items():
+        setattr(target, column, value)
+    target.keywords_text = keywords_text(target.ai_keywords)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, Date, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from database import Base
+
+
+class UserRecordStats(Base):
+    """사용자별 기록 카운터 (기록 생성/삭제와 같은 트랜잭션에서 갱신, 없으면 첫 조회 때 계산해 저장, 복구: maintenance_jobs.py record-stats)"""
+    __tablename__ = "user_record_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    total_records = Column(Integer, nullable=False, default=0)
+    # last_record_date까지 이어진 연속 작성 일수 (조회 시 어제 이전이면 끊긴 것으로 봄)
+    current_streak = Column(Integer, nullable=False, default=0)
+    last_record_date = Column(Date, nullable=True)
+    # month_start(해당 월 1일)에 작성한 기록 수
+    month_start = Column(Date, nullable=True)
+    month_records = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,312 @@
+"""
+과거 감정 기록 일괄 재분석
+- 프롬프트(PROMPT_VERSIONS)나 폴백 키워드 사전을 바꾼 뒤 기존 Record의 분석 결과를 다시 채운다
+- id 기준 키셋 페이지네이션으로 청크 단위 스트리밍 (OFFSET 없이 일정한 속도 유지)
+- llm 모드: OpenAI 호출을 동시 실행 수 제한(--concurrency) 안에서 병렬 처리
+  (background 우선순위로 속도 제한을 받아 한도 근처에서는 사용자 요청에 양보)
+  (AI 호출이 실패한 기록은 폴백 결과로 덮어쓰지 않고 체크포인트의 failed_ids에 남김)
+  (AI 결과 캐시는 메모리 계층만 사용 - 재분석 결과로 ai_analysis_cache 테이블이 불어나지 않도록)
+  (프롬프트/모델을 바꾼 뒤 PROMPT_VERSIONS를 올리지 않았다면 --no-cache로 캐시된 이전 결과를 쓰지 않음)
+  (응답에 항목이 비어 있거나 주감정이 없으면 폴백으로 채우지 않고 실패로 집계)
+- fallback 모드: 키워드 기반 분석을 프로세스 풀에서 병렬 처리
+- 청크마다 executemany 일괄 UPDATE 후 체크포인트 저장 → 중단 후 같은 명령으로 이어서 실행
+- 처리량(건/초)과 예상 남은 시간(ETA) 출력
+
+사용 예:
+    python reanalyze_records.py --mode llm --concurrency 16
+    python reanalyze_records.py --mode llm --no-cache --reset
+    python reanalyze_records.py --mode fallback --fields emotion,keywords --processes 8
+    python reanalyze_records.py --mode llm --retry-failed
+"""
+import os
+import json
+import time
+import asyncio
+import logging
+import argparse
+import contextvars
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, func, update
+
+from database import SessionLocal
+from models.record import Record, emotion_columns, keywords_text
+from services.ai_analysis_service import AIAnalysisService, AI_COMBINED_ANALYSIS
+from services.ai_cache import ai_cache_options
+from services.circuit_breaker import get_breaker, OPEN
+from services.daily_rollup_service import DailyRollupService
+from services.openai_client import run_coroutine_sync
+from services.rate_limiter import llm_priority, BACKGROUND
+
+ALL_FIELDS = ("keywords", "summary", "emotion")
+# 분석 항목 → Record 컬럼
+FIELD_COLUMNS = {
+    "keywords": "ai_keywords",
+    "summary": "ai_summary",
+    "emotion": "emotion_analysis",
+}
+# emotion_analysis와 함께 갱신하는 감정 컬럼
+EMOTION_COLUMNS = tuple(emotion_columns(None).keys())
+# 체크포인트에 보관할 실패 id 최대 개수
+MAX_FAILED_IDS = 10000
+
+
+# ----- 체크포인트 -----
+def load_checkpoint(path: str) -> Dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_checkpoint(path: str, checkpoint: Dict) -> None:
+    """임시 파일에 쓴 뒤 교체 (중간에 죽어도 이전 체크포인트 유지)"""
+    checkpoint["updated_at"] = datetime.now().isoformat(timespec="seconds")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+# ----- 분석 -----
+def analyze_with_fallback(args: Tuple[str, Sequence[str]]) -> Dict:
+    """키워드 기반 분석 (프로세스 풀에서 실행되므로 모듈 최상위 함수)"""
+    content, fields = args
+    return AIAnalysisService._apply_fallbacks(content, {}, fields=fields)
+
+
+def is_complete_llm_result(result: Dict) -> bool:
+    """AI 결과의 모든 항목이 폴백 없이 쓸 수 있는지 (키워드 1개 이상, 요약 문자열, 주감정이 있는 감정 분석)"""
+    checks = {
+        "keywords": lambda value: bool(AIAnalysisService._clean_keywords(value)),
+        "summary": lambda value: isinstance(value, str) and bool(value.strip()),
+        "emotion": lambda value: isinstance(value, dict) and bool(value.get("primary_emotion")),
+    }
+    return all(checks[name](value) for name, value in result.items())
+
+
+async def analyze_with_llm(
+    content: str,
+    fields: Sequence[str],
+    semaphore: asyncio.Semaphore,
+    executor: ThreadPoolExecutor,
+) -> Optional[Dict]:
+    """AI 분석 (하나라도 실패하거나 비어 있으면 None → 기존 값 유지, failed_ids에 남김)"""
+    async with semaphore:
+        if AI_COMBINED_ANALYSIS and set(fields) == set(ALL_FIELDS):
+            # 통합 호출 1회 (동기 클라이언트이므로 전용 스레드 풀에서 실행)
+            loop = asyncio.get_running_loop()
+            # run_in_executor는 contextvars를 넘기지 않으므로 우선순위가 담긴 컨텍스트로 실행
+            data = await loop.run_in_executor(executor, contextvars.copy_context().run,
+                                              AIAnalysisService.analyze_record_with_gpt4o, content)
+            if not data:
+                return None
+            result = {name: data.get(name) for name in fields}
+        else:
+            calls = {
+                "keywords": AIAnalysisService.extract_keywords_with_gpt_async,
+                "summary": AIAnalysisService.generate_summary_with_gpt4o_async,
+                "emotion": AIAnalysisService.analyze_emotion_with_gpt4o_async,
+            }
+            values = await asyncio.gather(*(calls[name](content) for name in fields))
+            result = dict(zip(fields, values))
+
+        if not is_complete_llm_result(result):
+            return None
+        return AIAnalysisService._apply_fallbacks(content, result, fields=fields)
+
+
+async def analyze_chunk_with_llm(rows: List[Tuple[int, str]], fields: Sequence[str], concurrency: int,
+                                 executor: ThreadPoolExecutor) -> List[Optional[Dict]]:
+    semaphore = asyncio.Semaphore(concurrency)
+    return await asyncio.gather(*(analyze_with_llm(content, fields, semaphore, executor) for _, content in rows))
+
+
+def wait_for_breaker() -> None:
+    """OpenAI 브레이커가 열려 있으면 닫힐(half_open) 때까지 대기 - 폴백 결과로 덮어쓰는 것 방지"""
+    breaker = get_breaker("openai")
+    while breaker.state == OPEN:
+        logging.warning("OpenAI 서킷 브레이커가 열려 있어 대기합니다...")
+        time.sleep(min(5.0, breaker.open_seconds))
+
+
+# ----- DB -----
+def fetch_chunk(db, last_id: int, chunk_size: int, user_id: Optional[int], end_id: Optional[int]) -> List[Tuple[int, str]]:
+    query = db.query(Record.id, Record.content).filter(Record.id > last_id)
+    if user_id is not None:
+        query = query.filter(Record.user_id == user_id)
+    if end_id is not None:
+        query = query.filter(Record.id <= end_id)
+    return query.order_by(Record.id).limit(chunk_size).all()
+
+
+def fetch_by_ids(db, record_ids: List[int]) -> List[Tuple[int, str]]:
+    return db.query(Record.id, Record.content).filter(Record.id.in_(record_ids)).order_by(Record.id).all()
+
+
+def count_remaining(db, last_id: int, user_id: Optional[int], end_id: Optional[int]) -> int:
+    query = db.query(func.count(Record.id)).filter(Record.id > last_id)
+    if user_id is not None:
+        query = query.filter(Record.user_id == user_id)
+    if end_id is not None:
+        query = query.filter(Record.id <= end_id)
+    return query.scalar() or 0
+
+
+def write_results(db, rows: List[Tuple[int, str]], results: List[Optional[Dict]], fields: Sequence[str]) -> int:
+    """executemany 일괄 UPDATE (읽은 뒤 본문이 수정된 기록은 건너뜀)"""
+    columns = [FIELD_COLUMNS[name] for name in fields]
+    params = []
+    for (record_id, content), analysis in zip(rows, results):
+        if analysis is None:
+            continue
+        param = {"b_id": record_id, "b_content": content, "analysis_status": "completed"}
+        for column in columns:
+            param[column] = analysis[column]
+        # 일괄 UPDATE는 ORM 이벤트를 거치지 않으므로 파생 컬럼도 직접 채움
+        if "emotion" in fields:
+            param.update(emotion_columns(analysis["emotion_analysis"]))
+        if "keywords" in fields:
+            param["keywords_text"] = keywords_text(analysis["ai_keywords"])
+        params.append(param)
+    if not params:
+        return 0
+
+    extra_columns = ["analysis_status"] + (list(EMOTION_COLUMNS) if "emotion" in fields else []) \
+        + (["keywords_text"] if "keywords" in fields else [])
+    stmt = (
+        update(Record.__table__)
+        .where(Record.__table__.c.id == bindparam("b_id"))
+        .where(Record.__table__.c.content == bindparam("b_content"))
+        .values({column: bindparam(column) for column in columns + extra_columns})
+    )
+    result = db.execute(stmt, params)
+    if "emotion" in fields:
+        # 주감정/색이 바뀌었을 수 있으므로 해당 날짜의 일별 롤업도 같은 트랜잭션에서 갱신
+        DailyRollupService.refresh_records(db, [param["b_id"] for param in params])
+    db.commit()
+    return result.rowcount if result.rowcount is not None and result.rowcount >= 0 else len(params)
+
+
+# ----- 실행 -----
+def process_rows(rows, args, fields, pool, executor) -> List[Optional[Dict]]:
+    if args.mode == "fallback":
+        return list(pool.map(analyze_with_fallback, [(content, fields) for _, content in rows],
+                             chunksize=max(1, len(rows) // (args.processes * 4))))
+    wait_for_breaker()
+    # 공용 백그라운드 루프에서 실행 → 청크 간 비동기 커넥션 풀 재사용
+    # background 우선순위: OpenAI 한도 근처에서는 사용자 요청에 양보하고 대기
+    # 캐시 DB 계층은 건너뜀 (기록마다 조회/저장 왕복과 캐시 행이 쌓이는 것 방지)
+    # --no-cache: 캐시를 조회하지 않고 항상 새로 호출
+    with llm_priority(BACKGROUND), ai_cache_options(read=not args.no_cache, persist=False):
+        return run_coroutine_sync(analyze_chunk_with_llm(rows, fields, args.concurrency, executor))
+
+
+def run(args) -> None:
+    fields = tuple(name for name in ALL_FIELDS if name in args.fields.split(","))
+    if not fields:
+        raise SystemExit(f"--fields는 {','.join(ALL_FIELDS)} 중에서 선택해주세요.")
+
+    checkpoint = {} if args.reset else load_checkpoint(args.checkpoint)
+    if checkpoint and (checkpoint.get("mode") != args.mode or tuple(checkpoint.get("fields", ())) != fields):
+        raise SystemExit("체크포인트의 mode/fields가 다릅니다. --reset으로 새로 시작하거나 같은 옵션으로 실행해주세요.")
+    checkpoint.setdefault("mode", args.mode)
+    checkpoint.setdefault("fields", list(fields))
+    checkpoint.setdefault("last_id", args.start_id)
+    checkpoint.setdefault("processed", 0)
+    checkpoint.setdefault("updated", 0)
+    checkpoint.setdefault("failed_ids", [])
+
+    pool = ProcessPoolExecutor(max_workers=args.processes) if args.mode == "fallback" else None
+    executor = ThreadPoolExecutor(max_workers=args.concurrency, thread_name_prefix="reanalyze") if args.mode == "llm" else None
+
+    db = SessionLocal()
+    try:
+        if args.retry_failed:
+            retry_ids = list(checkpoint["failed_ids"])
+            checkpoint["failed_ids"] = []
+            chunks = (retry_ids[i:i + args.chunk_size] for i in range(0, len(retry_ids), args.chunk_size))
+            total = len(retry_ids)
+        else:
+            chunks = None
+            total = count_remaining(db, checkpoint["last_id"], args.user_id, args.end_id)
+        if args.limit:
+            total = min(total, args.limit)
+        logging.info(f"재분석 시작: mode={args.mode}, fields={','.join(fields)}, 대상 {total}건")
+
+        started = time.monotonic()
+        done = 0
+        while done < total:
+            size = min(args.chunk_size, total - done)
+            if chunks is not None:
+                ids = next(chunks, None)
+                if not ids:
+                    break
+                rows = fetch_by_ids(db, ids[:size])
+            else:
+                rows = fetch_chunk(db, checkpoint["last_id"], size, args.user_id, args.end_id)
+            if not rows:
+                break
+            db.rollback()  # 분석 중 읽기 트랜잭션을 열어두지 않음
+
+            results = process_rows(rows, args, fields, pool, executor)
+            failed = [record_id for (record_id, _), analysis in zip(rows, results) if analysis is None]
+            updated = 0 if args.dry_run else write_results(db, rows, results, fields)
+
+            done += len(rows)
+            checkpoint["processed"] += len(rows)
+            checkpoint["updated"] += updated
+            checkpoint["failed_ids"] = (checkpoint["failed_ids"] + failed)[-MAX_FAILED_IDS:]
+            if chunks is None:
+                checkpoint["last_id"] = rows[-1][0]
+            if not args.dry_run:
+                save_checkpoint(args.checkpoint, checkpoint)
+
+            elapsed = time.monotonic() - started
+            rate = done / elapsed if elapsed > 0 else 0.0
+            eta = (total - done) / rate if rate > 0 else 0.0
+            logging.info(
+                f"{done}/{total}건 ({done / total * 100:.1f}%) | 갱신 {updated} 실패 {len(failed)} | "
+                f"{rate:.1f}건/초 | ETA {eta / 60:.1f}분 | last_id={rows[-1][0]}"
+            )
+
+        logging.info(
+            f"재분석 완료: 처리 {checkpoint['processed']}건, 갱신 {checkpoint['updated']}건, "
+            f"재시도 대기 {len(checkpoint['failed_ids'])}건"
+        )
+    finally:
+        db.close()
+        if pool:
+            pool.shutdown()
+        if executor:
+            executor.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="과거 감정 기록 AI 분석 결과 일괄 재생성")
+    parser.add_argument("--mode", choices=["llm", "fallback"], default="llm",
+                        help="llm: OpenAI 재분석, fallback: 키워드 기반 재분석")
+    parser.add_argument("--fields", default=",".join(ALL_FIELDS), help="재분석 항목 (keywords,summary,emotion)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="한 번에 읽고 쓰는 기록 수")
+    parser.add_argument("--concurrency", type=int, default=8, help="llm 모드 동시 AI 호출 수")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 2, help="fallback 모드 프로세스 수")
+    parser.add_argument("--checkpoint", default="reanalyze_checkpoint.json", help="체크포인트 파일 경로")
+    parser.add_argument("--reset", action="store_true", help="체크포인트를 무시하고 처음부터 실행")
+    parser.add_argument("--retry-failed", action="store_true", help="체크포인트의 실패 기록만 다시 처리")
+    parser.add_argument("--user-id", type=int, default=None, help="특정 사용자 기록만 처리")
+    parser.add_argument("--start-id", type=int, default=0, help="이 id 이후부터 처리 (체크포인트가 없을 때)")
+    parser.add_argument("--end-id", type=int, default=None, help="이 id까지 처리")
+    parser.add_argument("--limit", type=int, default=None, help="이번 실행에서 처리할 최대 기록 수")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="llm 모드에서 AI 결과 캐시를 쓰지 않고 모두 다시 호출 (프롬프트/모델 변경 후)")
+    parser.add_argument("--dry-run", action="store_true", help="분석만 하고 DB/체크포인트는 갱신하지 않음")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,36 +7,209 @@
 import os
 import json
 import base64
-from typing import Dict, Optional
-import requests
-from openai import OpenAI
+import time
+import asyncio
+from typing import Dict, Optional, Sequence
 from dotenv import load_dotenv
+from openai import APIStatusError
+from services.openai_client import get_openai_client, get_async_openai_client, run_coroutine_sync, OPENAI_READ_TIMEOUT
+from services.ai_cache import ai_result_cache
+from services.ai_metrics import ai_metrics
+from services.single_flight import ai_single_flight
+from services import emotion_lexicon
+from services.circuit_breaker import get_breaker
+from services.deadline import call_timeout, has_deadline, remaining_time
+from services.rate_limiter import openai_rate_limiter, llm_priority, COSMETIC
+from services.text_chunker import estimate_tokens, split_into_chunks, truncate_to_tokens
+from services.clova_client import clova_post, CLOVA_STT_URL
 
 # 환경 변수 로딩
 load_dotenv(dotenv_path=".env")
 
+# 분석에 사용하는 모델 (캐시 키에 포함)
+AI_MODEL = "gpt-4o-mini"
+
+# 개별 AI 호출(키워드/요약/감정)을 동시에 실행할 때의 전체 마감 시간(초)
+AI_ANALYSIS_DEADLINE = float(os.getenv("AI_ANALYSIS_DEADLINE", "20"))
+# 1: 기록 생성 시 통합 호출 1회 사용, 0: 개별 호출을 동시에 실행
+AI_COMBINED_ANALYSIS = os.getenv("AI_COMBINED_ANALYSIS", "1") == "1"
+# max_tokens를 지정하지 않은 호출의 응답 토큰 추정치 (속도 제한 TPM 계산용)
+AI_DEFAULT_COMPLETION_TOKENS = int(os.getenv("AI_DEFAULT_COMPLETION_TOKENS", "500"))
+# 기록 1건을 프롬프트에 넣을 수 있는 최대 토큰 수 - 넘으면 조각별 요약(map) 후 축약본으로 분석(reduce)
+AI_RECORD_TOKEN_BUDGET = int(os.getenv("AI_RECORD_TOKEN_BUDGET", "3000"))
+# 조각 하나의 최대 토큰 수 / 조각 요약 최대 응답 토큰 수 / 최대 조각 수 (넘으면 앞뒤 조각만 사용)
+AI_CHUNK_TOKENS = int(os.getenv("AI_CHUNK_TOKENS", "1500"))
+AI_CHUNK_SUMMARY_TOKENS = int(os.getenv("AI_CHUNK_SUMMARY_TOKENS", "150"))
+AI_MAX_CHUNKS = int(os.getenv("AI_MAX_CHUNKS", "8"))
+
+def _is_openai_upstream_failure(error: Exception) -> bool:
+    """브레이커에 실패로 집계할 오류 (요청 자체가 잘못된 4xx는 제외)"""
+    if isinstance(error, APIStatusError):
+        return error.status_code >= 500 or error.status_code == 429
+    return True
+
 class AIAnalysisService:
     """통합 AI 분석 서비스"""
     
+    # 항목별 프롬프트/응답 형식 버전 - 프롬프트를 바꾸면 올려서 기존 캐시를 무효화
+    # (통합 호출 결과도 항목별로 저장하여 미리보기 결과와 공유)
+    PROMPT_VERSIONS = {
+        "emotion": "v1",
+        "summary": "v1",
+        "keywords": "v1",
+        "condensed": "v1",
+    }
+    
     @staticmethod
-    def analyze_emotion_with_gpt4o(content: str) -> Optional[Dict]:
-        """GPT-4o mini를 사용한 감정 분석"""
+    def _cache_get(kind: str, content: str):
+        return ai_result_cache.get(kind, content, AI_MODEL, AIAnalysisService.PROMPT_VERSIONS[kind])
+    
+    @staticmethod
+    def _cache_get_many(kinds: Sequence[str], content: str) -> Dict:
+        """여러 항목을 한 번에 조회 (DB 계층은 쿼리 1회)"""
+        versions = {kind: AIAnalysisService.PROMPT_VERSIONS[kind] for kind in kinds}
+        return ai_result_cache.get_many(versions, content, AI_MODEL)
+    
+    @staticmethod
+    def _cache_set(kind: str, content: str, value) -> None:
+        ai_result_cache.set(kind, content, AI_MODEL, AIAnalysisService.PROMPT_VERSIONS[kind], value)
+    
+    @staticmethod
+    def _openai_call_options(client):
+        """요청 마감 시간에 맞춘 타임아웃과 클라이언트 (예산이 있으면 재시도 없이 남은 시간만 대기)"""
+        timeout = call_timeout(OPENAI_READ_TIMEOUT)
+        if has_deadline():
+            client = client.with_options(max_retries=0)
+        return client, timeout
+    
+    @staticmethod
+    def _estimate_request_tokens(kwargs: Dict) -> int:
+        """요청 1건의 예상 토큰 수 (프롬프트 + 최대 응답 길이)"""
+        prompt_tokens = sum(estimate_tokens(str(m.get("content", ""))) for m in kwargs.get("messages", []))
+        return prompt_tokens + (kwargs.get("max_tokens") or AI_DEFAULT_COMPLETION_TOKENS)
+    
+    @staticmethod
+    def _chat_completion(client, method: str, **kwargs):
+        """OpenAI 호출 공통 경로: 속도 제한 + 서킷 브레이커 + 요청 마감 시간 + 메서드별 계측
+        (open이면 CircuitOpenError, 속도 제한으로 포기하면 RateLimitShed)"""
+        start = time.monotonic()
+        estimated = AIAnalysisService._estimate_request_tokens(kwargs)
         try:
-            api_key = os.getenv("OPENAI_API_KEY")
-            if not api_key:
-                return None
+            openai_rate_limiter.acquire(estimated)
+            client, timeout = AIAnalysisService._openai_call_options(client)
+            response = get_breaker("openai").call(
+                client.chat.completions.create,
+                is_failure=_is_openai_upstream_failure,
+                timeout=timeout,
+                **kwargs
+            )
+        except Exception as e:
+            ai_metrics.observe("openai", method, time.monotonic() - start, error=e, model=kwargs.get("model"))
+            raise
+        usage = getattr(response, "usage", None)
+        openai_rate_limiter.settle(estimated, getattr(usage, "total_tokens", None))
+        ai_metrics.observe("openai", method, time.monotonic() - start, usage=usage, model=kwargs.get("model"))
+        return response
+    
+    @staticmethod
+    async def _chat_completion_async(client, method: str, **kwargs):
+        """_chat_completion의 비동기 버전"""
+        start = time.monotonic()
+        estimated = AIAnalysisService._estimate_request_tokens(kwargs)
+        try:
+            await openai_rate_limiter.acquire_async(estimated)
+            client, timeout = AIAnalysisService._openai_call_options(client)
+            response = await get_breaker("openai").acall(
+                client.chat.completions.create,
+                is_failure=_is_openai_upstream_failure,
+                timeout=timeout,
+                **kwargs
+            )
+        except (Exception, asyncio.CancelledError) as e:
+            ai_metrics.observe("openai", method, time.monotonic() - start, error=e, model=kwargs.get("model"))
+            raise
+        usage = getattr(response, "usage", None)
+        openai_rate_limiter.settle(estimated, getattr(usage, "total_tokens", None))
+        ai_metrics.observe("openai", method, time.monotonic() - start, usage=usage, model=kwargs.get("model"))
+        return response
+    
+    @staticmethod
+    def _chunk_summary_prompt(chunk: str, index: int, total: int) -> str:
+        return f"""
+            다음은 긴 감정 기록을 나눈 {total}개 부분 중 {index}번째입니다.
+            주요 사건과 감정 표현(감정 단어, 강도)을 살려 2~3문장으로 요약해주세요.
             
-            # 최신 openai 패키지와 호환되도록 수정
-            try:
-                client = OpenAI(api_key=api_key)
-            except TypeError as e:
-                if "proxies" in str(e):
-                    # proxies 인자 문제가 있는 경우 기본 설정으로 생성
-                    client = OpenAI(api_key=api_key, base_url="https://api.openai.com/v1")
-                else:
-                    raise e
+            텍스트: {chunk}
             
-            prompt = f"""
+            요약:
+            """
+    
+    @staticmethod
+    def _select_chunks(chunks: list) -> list:
+        """조각이 너무 많으면 앞/뒤 조각만 사용 (가운데 생략)"""
+        if len(chunks) <= AI_MAX_CHUNKS:
+            return chunks
+        head = (AI_MAX_CHUNKS + 1) // 2
+        return chunks[:head] + chunks[len(chunks) - (AI_MAX_CHUNKS - head):]
+    
+    @staticmethod
+    async def _summarize_chunk_async(client, chunk: str, index: int, total: int) -> str:
+        response = await AIAnalysisService._chat_completion_async(
+            client,
+            "summarize_chunk_async",
+            model=AI_MODEL,
+            messages=[{"role": "user", "content": AIAnalysisService._chunk_summary_prompt(chunk, index, total)}],
+            temperature=0.3,
+            max_tokens=AI_CHUNK_SUMMARY_TOKENS
+        )
+        summary = (response.choices[0].message.content or "").strip()
+        if not summary:
+            raise ValueError("empty chunk summary")
+        return summary
+    
+    @staticmethod
+    async def _condense_async(content: str) -> str:
+        """프롬프트에 넣을 본문 (토큰 예산 이하면 그대로, 넘으면 조각별 요약을 이어 붙인 축약본)
+        
+        조각 요약은 동시에 실행하고 결과는 캐시에 저장하여 요약/감정/통합 분석이 공유.
+        조각 요약이 하나라도 실패하면 예산에 맞게 자른 본문 사용.
+        """
+        if estimate_tokens(content) <= AI_RECORD_TOKEN_BUDGET:
+            return content
+        cached = await asyncio.to_thread(AIAnalysisService._cache_get, "condensed", content)
+        if cached:
+            return cached
+        
+        client = get_async_openai_client()
+        if client is None:
+            return truncate_to_tokens(content, AI_RECORD_TOKEN_BUDGET)
+        
+        chunks = AIAnalysisService._select_chunks(split_into_chunks(content, AI_CHUNK_TOKENS))
+        summaries = await asyncio.gather(
+            *(AIAnalysisService._summarize_chunk_async(client, chunk, i + 1, len(chunks))
+              for i, chunk in enumerate(chunks)),
+            return_exceptions=True
+        )
+        if any(isinstance(s, BaseException) for s in summaries):
+            return truncate_to_tokens(content, AI_RECORD_TOKEN_BUDGET)
+        
+        condensed = truncate_to_tokens("\n".join(summaries), AI_RECORD_TOKEN_BUDGET)
+        await asyncio.to_thread(AIAnalysisService._cache_set, "condensed", content, condensed)
+        return condensed
+    
+    @staticmethod
+    def _condense(content: str) -> str:
+        """_condense_async의 동기 버전 (예산 이하면 호출 없이 그대로)"""
+        if estimate_tokens(content) <= AI_RECORD_TOKEN_BUDGET:
+            return content
+        # 같은 본문의 요약/감정 미리보기가 동시에 들어와도 조각 요약은 한 번만
+        return ai_single_flight.do(
+            "condensed", content, lambda: run_coroutine_sync(AIAnalysisService._condense_async(content))
+        )
+    
+    @staticmethod
+    def _emotion_prompt(content: str) -> str:
+        return f"""
             다음 텍스트의 감정을 로버트 플루치크의 감정의 바퀴 8가지 중에서 분석해주세요:
             감정: 기쁨, 신뢰, 두려움, 놀람, 슬픔, 혐오, 분노, 기대
             
@@ -51,69 +224,293 @@ class AIAnalysisService:
                 "color_name": "이 감정을 나타내는 색상의 이름 (예: 선명한 빨강, 밝은 노랑, 깊은 파랑 등)"
             }}
             """
+    
+    @staticmethod
+    def _summary_prompt(content: str) -> str:
+        return f"""
+            다음 감정 기록을 한 줄로 요약해주세요. 
+            감정의 핵심과 주요 내용을 간결하게 표현해주세요.
             
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
+            텍스트: {content}
+            
+            요약:
+            """
+    
+    @staticmethod
+    def _keywords_prompt(content: str) -> str:
+        # 키워드는 본문 앞뒤만으로 충분하므로 조각 요약 없이 예산에 맞게 자름
+        content = truncate_to_tokens(content, AI_RECORD_TOKEN_BUDGET)
+        return f"""
+            다음 텍스트에서 감정과 관련된 핵심 키워드 3~5개만 뽑아주세요.
+            반드시 아래 JSON 형식으로만, 추가 설명 없이 반환하세요.
+            {{
+              "keywords": ["키워드1", "키워드2", "키워드3"]
+            }}
+
+            텍스트: {content}
+            """
+    
+    @staticmethod
+    def _parse_emotion_response(raw: Optional[str]) -> Optional[Dict]:
+        try:
+            return json.loads(raw)
+        except (TypeError, json.JSONDecodeError):
+            return None
+    
+    @staticmethod
+    def _parse_keywords_response(raw: Optional[str]) -> list:
+        """키워드 응답 파싱 (JSON → 본문 내 JSON → 쉼표 분리 순으로 시도)"""
+        raw = (raw or "").strip()
+        # 1) JSON 파싱 시도
+        try:
+            data = json.loads(raw)
+            kws = data.get("keywords", []) if isinstance(data, dict) else []
+        except Exception:
+            # 2) 본문에서 JSON 객체 추출 시도
+            import re
+            match = re.search(r"\{[\s\S]*\}", raw)
+            if match:
+                try:
+                    data = json.loads(match.group(0))
+                    kws = data.get("keywords", []) if isinstance(data, dict) else []
+                except Exception:
+                    kws = []
+            else:
+                kws = []
+        # 3) 문자열로만 온 경우 대비: 쉼표 분리 폴백
+        if not kws and raw:
+            kws = [k.strip() for k in raw.split(',') if k.strip()]
+        # 정제: 중복 제거, 길이 제한
+        return AIAnalysisService._clean_keywords(kws)
+    
+    @staticmethod
+    def analyze_emotion_with_gpt4o(content: str) -> Optional[Dict]:
+        """GPT-4o mini를 사용한 감정 분석 (같은 본문의 동시 요청은 호출 하나를 공유)"""
+        try:
+            return ai_single_flight.do(
+                "emotion", content, lambda: AIAnalysisService._analyze_emotion_with_gpt4o_call(content)
+            )
+        except Exception as e:
+            return None
+    
+    @staticmethod
+    def _analyze_emotion_with_gpt4o_call(content: str) -> Optional[Dict]:
+        try:
+            cached = AIAnalysisService._cache_get("emotion", content)
+            if cached:
+                return cached
+            
+            # 프로세스 공용 클라이언트 재사용 (keep-alive 커넥션 풀)
+            client = get_openai_client()
+            if client is None:
+                return None
+            
+            # 긴 본문은 조각별 요약(map) 후 축약본으로 분석(reduce)
+            prompt_content = AIAnalysisService._condense(content)
+            response = AIAnalysisService._chat_completion(
+                client,
+                "analyze_emotion_with_gpt4o",
+                model=AI_MODEL,
+                messages=[{"role": "user", "content": AIAnalysisService._emotion_prompt(prompt_content)}],
                 temperature=0.3
             )
             
-            content = response.choices[0].message.content
+            result = AIAnalysisService._parse_emotion_response(response.choices[0].message.content)
+            if result:
+                AIAnalysisService._cache_set("emotion", content, result)
+            return result
+            
+        except Exception as e:
+            return None
+    
+    @staticmethod
+    def generate_summary_with_gpt4o(content: str) -> Optional[str]:
+        """GPT-4o mini를 사용한 텍스트 요약 (같은 본문의 동시 요청은 호출 하나를 공유)"""
+        try:
+            return ai_single_flight.do(
+                "summary", content, lambda: AIAnalysisService._generate_summary_with_gpt4o_call(content)
+            )
+        except Exception as e:
+            return None
+    
+    @staticmethod
+    def _generate_summary_with_gpt4o_call(content: str) -> Optional[str]:
+        try:
+            cached = AIAnalysisService._cache_get("summary", content)
+            if cached:
+                return cached
             
-            try:
-                result = json.loads(content)
-                return result
-            except json.JSONDecodeError as e:
+            # 프로세스 공용 클라이언트 재사용 (keep-alive 커넥션 풀)
+            client = get_openai_client()
+            if client is None:
                 return None
             
+            # 긴 본문은 조각별 요약(map) 후 축약본으로 분석(reduce)
+            prompt_content = AIAnalysisService._condense(content)
+            response = AIAnalysisService._chat_completion(
+                client,
+                "generate_summary_with_gpt4o",
+                model=AI_MODEL,
+                messages=[{"role": "user", "content": AIAnalysisService._summary_prompt(prompt_content)}],
+                temperature=0.3,
+                max_tokens=100
+            )
+            
+            summary = response.choices[0].message.content.strip()
+            if summary:
+                AIAnalysisService._cache_set("summary", content, summary)
+            return summary
+            
         except Exception as e:
             return None
     
     @staticmethod
-    def generate_summary_with_gpt4o(content: str) -> Optional[str]:
-        """GPT-4o mini를 사용한 텍스트 요약"""
+    async def analyze_emotion_with_gpt4o_async(content: str) -> Optional[Dict]:
+        """GPT-4o mini를 사용한 감정 분석 (비동기)"""
         try:
-            api_key = os.getenv("OPENAI_API_KEY")
-            if not api_key:
+            cached = await asyncio.to_thread(AIAnalysisService._cache_get, "emotion", content)
+            if cached:
+                return cached
+            
+            client = get_async_openai_client()
+            if client is None:
                 return None
             
-            # 최신 openai 패키지와 호환되도록 수정
-            try:
-                client = OpenAI(api_key=api_key)
-            except TypeError as e:
-                if "proxies" in str(e):
-                    # proxies 인자 문제가 있는 경우 기본 설정으로 생성
-                    client = OpenAI(api_key=api_key, base_url="https://api.openai.com/v1")
-                else:
-                    raise e
+            prompt_content = await AIAnalysisService._condense_async(content)
+            response = await AIAnalysisService._chat_completion_async(
+                client,
+                "analyze_emotion_with_gpt4o_async",
+                model=AI_MODEL,
+                messages=[{"role": "user", "content": AIAnalysisService._emotion_prompt(prompt_content)}],
+                temperature=0.3
+            )
             
-            prompt = f"""
-            다음 감정 기록을 한 줄로 요약해주세요. 
-            감정의 핵심과 주요 내용을 간결하게 표현해주세요.
+            result = AIAnalysisService._parse_emotion_response(response.choices[0].message.content)
+            if result:
+                await asyncio.to_thread(AIAnalysisService._cache_set, "emotion", content, result)
+            return result
             
-            텍스트: {content}
+        except Exception as e:
+            return None
+    
+    @staticmethod
+    async def generate_summary_with_gpt4o_async(content: str) -> Optional[str]:
+        """GPT-4o mini를 사용한 텍스트 요약 (비동기)"""
+        try:
+            cached = await asyncio.to_thread(AIAnalysisService._cache_get, "summary", content)
+            if cached:
+                return cached
             
-            요약:
-            """
+            client = get_async_openai_client()
+            if client is None:
+                return None
             
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
+            prompt_content = await AIAnalysisService._condense_async(content)
+            response = await AIAnalysisService._chat_completion_async(
+                client,
+                "generate_summary_with_gpt4o_async",
+                model=AI_MODEL,
+                messages=[{"role": "user", "content": AIAnalysisService._summary_prompt(prompt_content)}],
                 temperature=0.3,
                 max_tokens=100
             )
             
-            return response.choices[0].message.content.strip()
+            summary = response.choices[0].message.content.strip()
+            if summary:
+                await asyncio.to_thread(AIAnalysisService._cache_set, "summary", content, summary)
+            return summary
             
         except Exception as e:
             return None
     
+    @staticmethod
+    async def extract_keywords_with_gpt_async(content: str) -> list:
+        """GPT-4o mini를 사용한 감정 키워드 추출 (비동기, 실패 시 빈 리스트)"""
+        try:
+            cached = await asyncio.to_thread(AIAnalysisService._cache_get, "keywords", content)
+            if cached:
+                return cached
+            
+            client = get_async_openai_client()
+            if client is None:
+                return []
+            
+            response = await AIAnalysisService._chat_completion_async(
+                client,
+                "extract_keywords_with_gpt_async",
+                model=AI_MODEL,
+                messages=[{"role": "user", "content": AIAnalysisService._keywords_prompt(content)}],
+                temperature=0.2,
+                max_tokens=120
+            )
+            
+            keywords = AIAnalysisService._parse_keywords_response(response.choices[0].message.content)
+            if keywords:
+                await asyncio.to_thread(AIAnalysisService._cache_set, "keywords", content, keywords)
+            return keywords
+            
+        except Exception as e:
+            return []
+    
+    @staticmethod
+    async def analyze_text_concurrently_async(
+        content: str,
+        fields: Sequence[str] = ("keywords", "summary", "emotion"),
+        deadline: Optional[float] = None
+    ) -> Dict:
+        """키워드/요약/감정 AI 호출을 동시에 실행 (하나의 마감 시간 공유, 호출별 폴백 유지)
+        
+        반환: 요청한 항목만 포함한 {"ai_keywords", "ai_summary", "emotion_analysis"}
+        """
+        deadline = AI_ANALYSIS_DEADLINE if deadline is None else deadline
+        # 요청 마감 시간이 더 짧으면 그 안에서 끝내고 폴백
+        deadline = max(0.0, remaining_time(deadline))
+        calls = {
+            "keywords": AIAnalysisService.extract_keywords_with_gpt_async,
+            "summary": AIAnalysisService.generate_summary_with_gpt4o_async,
+            "emotion": AIAnalysisService.analyze_emotion_with_gpt4o_async,
+        }
+        tasks = {
+            name: asyncio.ensure_future(calls[name](content))
+            for name in fields if name in calls
+        }
+        
+        done = set()
+        if tasks:
+            done, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+            # 마감 시간을 넘긴 호출은 취소하고 폴백 사용
+            for task in pending:
+                task.cancel()
+        
+        def _result(name: str):
+            task = tasks.get(name)
+            if task is None or task not in done or task.cancelled() or task.exception():
+                return None
+            return task.result()
+        
+        return AIAnalysisService._apply_fallbacks(
+            content,
+            {"keywords": _result("keywords"), "summary": _result("summary"), "emotion": _result("emotion")},
+            fields=tuple(tasks.keys())
+        )
+    
+    @staticmethod
+    def analyze_text_concurrently(
+        content: str,
+        fields: Sequence[str] = ("keywords", "summary", "emotion"),
+        deadline: Optional[float] = None
+    ) -> Dict:
+        """analyze_text_concurrently_async의 동기 래퍼"""
+        return run_coroutine_sync(
+            AIAnalysisService.analyze_text_concurrently_async(content, fields=fields, deadline=deadline)
+        )
+    
     @staticmethod
     def speech_to_text_with_clova(audio_file_path: str) -> Optional[str]:
         """NAVER CLOVA Speech Recognition을 사용한 음성 인식"""
         try:
             # CLOVA API 설정
-            api_url = "https://naveropenapi.apigw.ntruss.com/recog/v1/stt"
+            api_url = CLOVA_STT_URL
             client_id = os.getenv("CLOVA_CLIENT_ID")
             client_secret = os.getenv("CLOVA_CLIENT_SECRET")
             
@@ -129,9 +526,10 @@ class AIAnalysisService:
             with open(audio_file_path, "rb") as audio_file:
                 audio_data = audio_file.read()
             
-            # API 호출
-            response = requests.post(
+            # API 호출 (브레이커가 열려 있으면 즉시 실패 → None)
+            response = clova_post(
                 api_url,
+                method="speech_to_text_with_clova",
                 headers=headers,
                 data=audio_data
             )
@@ -146,45 +544,16 @@ class AIAnalysisService:
             return None
     
     @staticmethod
-    def analyze_emotion_fallback(content: str) -> Dict:
-        """AI API 실패 시 더 정확한 기본 감정 분석"""
-
-        
-        # 부정적 키워드 기반 분석
-        negative_keywords = {
-            '힘들', '어렵', '스트레스', '피곤', '지치', '불안', '걱정', '우울', '슬픔', 
-            '화나', '짜증', '답답', '절망', '무기력', '의미없', '싫', '혐오', '두려움',
-            '무섭', '놀람', '충격', '실망', '후회', '미안', '죄송', '부끄러', '창피',
-            '죽고싶', '자살', '끝내', '그만', '싫어', '힘들어', '지쳐', '피곤해'
-        }
-        
-        positive_keywords = {
-            '기쁘', '행복', '즐겁', '신나', '좋', '만족', '감사', '희망', '기대', 
-            '설렘', '신뢰', '안전', '편안', '평온', '차분', '여유', '성취', '성공',
-            '자랑', '뿌듯', '감동', '감탄', '놀라', '신기', '재미', '웃음'
-        }
-        
-        content_lower = content.lower()
-        
-        # 키워드 점수 계산
-        negative_score = sum(1 for keyword in negative_keywords if keyword in content_lower)
-        positive_score = sum(1 for keyword in positive_keywords if keyword in content_lower)
-        
-
+    def _fallback_emotion(match: emotion_lexicon.LexiconMatch):
+        """키워드 매칭 결과 → (주감정, 강도, 부정 점수, 긍정 점수)"""
+        polarity = match.counts("polarity")
+        negative_score = polarity["negative"]
+        positive_score = polarity["positive"]
         
         # 감정 결정 (수정된 로직)
         if negative_score > positive_score:
-            # 부정적 감정 중에서 세분화
-            if any(k in content_lower for k in ['힘들', '지치', '피곤', '무기력', '절망', '죽고싶']):
-                primary_emotion = "슬픔"
-            elif any(k in content_lower for k in ['화나', '짜증', '답답']):
-                primary_emotion = "분노"
-            elif any(k in content_lower for k in ['불안', '걱정', '두려움', '무섭']):
-                primary_emotion = "두려움"
-            elif any(k in content_lower for k in ['놀람', '충격', '신기']):
-                primary_emotion = "놀람"
-            else:
-                primary_emotion = "슬픔"
+            # 부정적 감정 중에서 세분화 (매칭된 첫 세부 감정, 없으면 슬픔)
+            primary_emotion = match.first_label("negative_subtypes", "슬픔")
             intensity = min(10, max(1, negative_score * 2))
         elif positive_score > negative_score:
             primary_emotion = "기쁨"
@@ -197,8 +566,14 @@ class AIAnalysisService:
                 # 혼재된 경우 부정적 감정 우선
                 primary_emotion = "슬픔"
             intensity = 5
-        
-
+        return primary_emotion, intensity, negative_score, positive_score
+    
+    @staticmethod
+    def analyze_emotion_fallback(content: str) -> Dict:
+        """AI API 실패 시 더 정확한 기본 감정 분석"""
+        primary_emotion, intensity, negative_score, positive_score = AIAnalysisService._fallback_emotion(
+            emotion_lexicon.match(content)
+        )
         
         # 색상 정보 생성
         from services.emotion_color_service import EmotionColorService
@@ -219,9 +594,8 @@ class AIAnalysisService:
         """AI API 실패 시 더 정확한 기본 요약 생성"""
 
         
-        # 감정 분석 결과를 기반으로 요약
-        emotion_analysis = AIAnalysisService.analyze_emotion_fallback(content)
-        primary_emotion = emotion_analysis["primary_emotion"]
+        # 감정 분석 결과를 기반으로 요약 (색상 계산 없이 주감정만)
+        primary_emotion = AIAnalysisService._fallback_emotion(emotion_lexicon.match(content))[0]
         
         # 감정별 요약 템플릿 (더 정확한 매칭)
         emotion_summaries = {
@@ -253,6 +627,7 @@ class AIAnalysisService:
             return AIAnalysisService._convert_ai_result_to_color(result)
         
         # 기본 분석 사용
+        ai_metrics.record_fallback("emotion")
         fallback_result = AIAnalysisService.analyze_emotion_fallback(content)
         fallback_result["ai_failed"] = True
         fallback_result["error_message"] = "AI API 호출에 실패하여 키워드 기반 분석을 사용했습니다."
@@ -268,102 +643,217 @@ class AIAnalysisService:
             return summary
         
         # 기본 요약 사용
+        ai_metrics.record_fallback("summary")
         return AIAnalysisService.generate_summary_fallback(content)
     
+    # 통합 분석(키워드/요약/감정) 응답 스키마 - Structured Outputs
+    RECORD_ANALYSIS_SCHEMA = {
+        "name": "record_analysis",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "keywords": {
+                    "type": "array",
+                    "items": {"type": "string"}
+                },
+                "summary": {"type": "string"},
+                "emotion": {
+                    "type": "object",
+                    "properties": {
+                        "primary_emotion": {
+                            "type": "string",
+                            "enum": ["기쁨", "신뢰", "두려움", "놀람", "슬픔", "혐오", "분노", "기대"]
+                        },
+                        "intensity": {"type": "integer"},
+                        "confidence": {"type": "number"},
+                        "reasoning": {"type": "string"},
+                        "color_name": {"type": "string"}
+                    },
+                    "required": ["primary_emotion", "intensity", "confidence", "reasoning", "color_name"],
+                    "additionalProperties": False
+                }
+            },
+            "required": ["keywords", "summary", "emotion"],
+            "additionalProperties": False
+        }
+    }
+    
     @staticmethod
-    def extract_keywords_with_gpt(content: str) -> list:
-        """GPT-4o mini를 사용한 감정 키워드 추출 (JSON 배열 파싱, 견고한 폴백 포함)"""
+    def analyze_record_with_gpt4o(content: str) -> Optional[Dict]:
+        """GPT-4o mini 한 번의 호출로 키워드, 한 줄 요약, 감정 분석을 함께 수행"""
         try:
-            api_key = os.getenv("OPENAI_API_KEY")
-            if not api_key:
-                return AIAnalysisService._extract_keywords_fallback(content)
-            client = OpenAI(api_key=api_key)
+            # 미리보기 등으로 세 항목이 모두 캐시되어 있으면 호출 생략
+            cached = AIAnalysisService._cache_get_many(("keywords", "summary", "emotion"), content)
+            if len(cached) == 3 and all(cached.values()):
+                return cached
+            
+            client = get_openai_client()
+            if client is None:
+                return None
+            
+            # 긴 본문은 조각별 요약(map) 후 축약본으로 분석(reduce)
+            prompt_content = AIAnalysisService._condense(content)
             prompt = f"""
-            다음 텍스트에서 감정과 관련된 핵심 키워드 3~5개만 뽑아주세요.
-            반드시 아래 JSON 형식으로만, 추가 설명 없이 반환하세요.
-            {{
-              "keywords": ["키워드1", "키워드2", "키워드3"]
-            }}
-
-            텍스트: {content}
+            다음 감정 기록을 분석해서 세 가지를 한 번에 알려주세요.
+            1. keywords: 감정과 관련된 핵심 키워드 3~5개
+            2. summary: 감정의 핵심과 주요 내용을 간결하게 표현한 한 줄 요약
+            3. emotion: 로버트 플루치크의 감정의 바퀴 8가지(기쁨, 신뢰, 두려움, 놀람, 슬픔, 혐오, 분노, 기대) 중 주감정 분석
+               - primary_emotion: 감정명
+               - intensity: 1-10 사이의 감정 강도 (1: 매우 약함, 10: 매우 강함)
+               - confidence: 0.0-1.0 사이의 분석 확신도 (0.0: 매우 불확실, 1.0: 매우 확실)
+               - reasoning: 분석 근거
+               - color_name: 이 감정을 나타내는 색상의 이름 (예: 선명한 빨강, 밝은 노랑, 깊은 파랑 등)
+            
+            텍스트: {prompt_content}
             """
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
+            
+            response = AIAnalysisService._chat_completion(
+                client,
+                "analyze_record_with_gpt4o",
+                model=AI_MODEL,
                 messages=[{"role": "user", "content": prompt}],
+                temperature=0.3,
+                max_tokens=400,
+                response_format={
+                    "type": "json_schema",
+                    "json_schema": AIAnalysisService.RECORD_ANALYSIS_SCHEMA
+                }
+            )
+            
+            raw = (response.choices[0].message.content or "").strip()
+            data = json.loads(raw)
+            if not isinstance(data, dict):
+                return None
+            
+            # 항목별로 캐시에 저장 (이후 미리보기/수정 시 재사용)
+            keywords = AIAnalysisService._clean_keywords(data.get("keywords"))
+            if keywords:
+                AIAnalysisService._cache_set("keywords", content, keywords)
+            summary = data.get("summary")
+            if isinstance(summary, str) and summary.strip():
+                AIAnalysisService._cache_set("summary", content, summary.strip())
+            emotion = data.get("emotion")
+            if isinstance(emotion, dict) and emotion.get("primary_emotion"):
+                AIAnalysisService._cache_set("emotion", content, emotion)
+            return data
+            
+        except Exception as e:
+            return None
+    
+    @staticmethod
+    def analyze_record_with_ai(content: str) -> Dict:
+        """통합 분석을 우선 사용하고, 비어 있는 항목에만 항목별 폴백 적용
+        
+        반환: {"ai_keywords": list, "ai_summary": str, "emotion_analysis": dict}
+        """
+        result = AIAnalysisService.analyze_record_with_gpt4o(content) or {}
+        return AIAnalysisService._apply_fallbacks(content, result)
+    
+    @staticmethod
+    def _apply_fallbacks(
+        content: str,
+        result: Dict,
+        fields: Sequence[str] = ("keywords", "summary", "emotion")
+    ) -> Dict:
+        """AI 결과(keywords/summary/emotion)에서 비어 있는 항목에만 항목별 폴백 적용"""
+        analysis = {}
+        
+        # 키워드: 정제 후 비어 있으면 키워드 폴백
+        if "keywords" in fields:
+            ai_keywords = AIAnalysisService._clean_keywords(result.get("keywords"))
+            if not ai_keywords:
+                ai_metrics.record_fallback("keywords")
+                ai_keywords = AIAnalysisService._extract_keywords_fallback(content)
+            analysis["ai_keywords"] = ai_keywords
+        
+        # 요약: 비어 있으면 기본 요약
+        if "summary" in fields:
+            ai_summary = result.get("summary")
+            ai_summary = ai_summary.strip() if isinstance(ai_summary, str) else ""
+            if not ai_summary:
+                ai_metrics.record_fallback("summary")
+                ai_summary = AIAnalysisService.generate_summary_fallback(content)
+            analysis["ai_summary"] = ai_summary
+        
+        # 감정: 주감정이 없으면 키워드 기반 분석
+        if "emotion" in fields:
+            emotion = result.get("emotion")
+            if isinstance(emotion, dict) and emotion.get("primary_emotion"):
+                emotion_analysis = AIAnalysisService._convert_ai_result_to_color(emotion)
+            else:
+                ai_metrics.record_fallback("emotion")
+                emotion_analysis = AIAnalysisService.analyze_emotion_fallback(content)
+                emotion_analysis["ai_failed"] = True
+                emotion_analysis["error_message"] = "AI API 호출에 실패하여 키워드 기반 분석을 사용했습니다."
+            analysis["emotion_analysis"] = emotion_analysis
+        
+        return analysis
+    
+    @staticmethod
+    def extract_keywords_with_gpt(content: str) -> list:
+        """GPT-4o mini를 사용한 감정 키워드 추출 (JSON 배열 파싱, 견고한 폴백 포함)"""
+        try:
+            cached = AIAnalysisService._cache_get("keywords", content)
+            if cached:
+                return cached
+            
+            client = get_openai_client()
+            if client is None:
+                ai_metrics.record_fallback("keywords")
+                return AIAnalysisService._extract_keywords_fallback(content)
+            response = AIAnalysisService._chat_completion(
+                client,
+                "extract_keywords_with_gpt",
+                model=AI_MODEL,
+                messages=[{"role": "user", "content": AIAnalysisService._keywords_prompt(content)}],
                 temperature=0.2,
                 max_tokens=120
             )
-            raw = (response.choices[0].message.content or "").strip()
-            # 1) JSON 파싱 시도
-            try:
-                data = json.loads(raw)
-                kws = data.get("keywords", []) if isinstance(data, dict) else []
-            except Exception:
-                # 2) 본문에서 JSON 객체 추출 시도
-                import re
-                match = re.search(r"\{[\s\S]*\}", raw)
-                if match:
-                    try:
-                        data = json.loads(match.group(0))
-                        kws = data.get("keywords", []) if isinstance(data, dict) else []
-                    except Exception:
-                        kws = []
-                else:
-                    kws = []
-            # 3) 문자열로만 온 경우 대비: 쉼표 분리 폴백
-            if not kws and raw:
-                kws = [k.strip() for k in raw.split(',') if k.strip()]
-            # 정제: 중복 제거, 길이 제한
-            dedup = []
-            seen = set()
-            for k in kws:
-                if not isinstance(k, str):
-                    continue
-                k = k.strip()
-                if not k or k in seen:
-                    continue
-                seen.add(k)
-                dedup.append(k)
+            dedup = AIAnalysisService._parse_keywords_response(response.choices[0].message.content)
             
             # 결과가 있으면 반환, 없으면 폴백 사용
             if dedup:
+                AIAnalysisService._cache_set("keywords", content, dedup[:5])
                 return dedup[:5]
             else:
+                ai_metrics.record_fallback("keywords")
                 return AIAnalysisService._extract_keywords_fallback(content)
                 
         except Exception as e:
+            ai_metrics.record_fallback("keywords")
             return AIAnalysisService._extract_keywords_fallback(content)
     
+    @staticmethod
+    def _clean_keywords(kws) -> list:
+        """키워드 정제: 문자열만 남기고 공백/중복 제거 (최대 5개)"""
+        if not isinstance(kws, list):
+            return []
+        dedup = []
+        seen = set()
+        for k in kws:
+            if not isinstance(k, str):
+                continue
+            k = k.strip()
+            if not k or k in seen:
+                continue
+            seen.add(k)
+            dedup.append(k)
+        return dedup[:5]
+    
     @staticmethod
     def _extract_keywords_fallback(content: str) -> list:
         """키워드 추출 실패 시 감정 관련 키워드 추출"""
 
         
-        # 감정 관련 키워드 사전
-        emotion_keywords = {
-            '기쁨': ['기쁨', '행복', '즐거움', '신남', '좋음', '만족', '감사', '희망', '기대'],
-            '슬픔': ['슬픔', '우울', '힘듦', '지침', '피곤', '무기력', '절망', '실망'],
-            '분노': ['분노', '화남', '짜증', '답답', '열받음', '화가남'],
-            '두려움': ['두려움', '불안', '걱정', '무섭', '긴장', '스트레스'],
-            '놀람': ['놀람', '충격', '예상외', '신기', '놀라움'],
-            '신뢰': ['신뢰', '안전', '편안', '평온', '차분', '여유'],
-            '혐오': ['혐오', '싫음', '불쾌', '역겨움'],
-            '기대': ['기대', '설렘', '희망', '미래', '꿈']
-        }
-        
-        content_lower = content.lower()
-        found_keywords = []
+        # 공용 사전 매칭 한 번으로 키워드와 주감정을 함께 계산
+        match = emotion_lexicon.match(content)
         
-        # 각 감정 카테고리에서 매칭되는 키워드 찾기
-        for emotion, keywords in emotion_keywords.items():
-            for keyword in keywords:
-                if keyword in content_lower:
-                    found_keywords.append(keyword)
-                    break  # 각 감정당 하나씩만
+        # 각 감정 카테고리에서 매칭되는 키워드 찾기 (각 감정당 하나씩만)
+        found_keywords = [hits[0] for hits in match.hits("fallback_keywords").values() if hits]
         
         # 감정 분석 결과에서 primary_emotion을 키워드로 사용 (우선순위 높음)
-        emotion_analysis = AIAnalysisService.analyze_emotion_fallback(content)
-        primary_emotion = emotion_analysis["primary_emotion"]
+        primary_emotion = AIAnalysisService._fallback_emotion(match)[0]
         
         # primary_emotion이 이미 있으면 추가하지 않음
         if primary_emotion not in found_keywords:
@@ -379,12 +869,10 @@ class AIAnalysisService:
     def generate_average_color_name_with_gpt(emotion_records: list) -> str:
         """GPT-4o mini를 사용한 평균 색상 이름 생성"""
         try:
-            api_key = os.getenv("OPENAI_API_KEY")
-            if not api_key:
+            client = get_openai_client()
+            if client is None:
                 return "평균 감정색"
             
-            client = OpenAI(api_key=api_key)
-            
             # 감정 기록 요약
             emotions_summary = []
             for record in emotion_records:
@@ -404,16 +892,21 @@ class AIAnalysisService:
             색상 이름만 반환해주세요. 다른 설명은 포함하지 마세요.
             """
             
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
-                max_tokens=30
-            )
+            # 부가 기능이므로 한도 근처에서는 먼저 포기하고 기본 이름 사용
+            with llm_priority(COSMETIC):
+                response = AIAnalysisService._chat_completion(
+                    client,
+                    "generate_average_color_name_with_gpt",
+                    model=AI_MODEL,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=0.7,
+                    max_tokens=30
+                )
             
             return response.choices[0].message.content.strip()
             
         except Exception as e:
+            ai_metrics.record_fallback("average_color_name")
             return "평균 감정색"
     
     @staticmethod
@@ -0,0 +1,320 @@
+"""
+AI 분석 결과 캐시
+- 키: 정규화된 본문 해시 + 항목(kind) + 모델 + 프롬프트 버전
+- 1차: 프로세스 내 LRU (TTL, 항목 수/바이트 상한)
+- 2차: DB 테이블(ai_analysis_cache) - 프로세스 재시작/다중 워커 간 공유
+- 미리보기(/emotions/analyze 등) 후 저장(POST /records) 시 같은 본문이면 LLM을 다시 호출하지 않음
+- DB에 없던 키는 잠시(AI_CACHE_NEGATIVE_TTL_SECONDS) 메모리에 기억하여 같은 본문의 반복 조회를 DB로 보내지 않음
+- 일괄 작업은 ai_cache_options(persist=False)로 DB 계층을 건너뜀 (재분석 결과로 캐시 테이블이 불어나지 않도록)
+- DB 계층은 만료 행 삭제 + 최대 행 수(AI_CACHE_MAX_ROWS) 유지: 저장 N회마다, 그리고
+  python maintenance_jobs.py ai-cache (cron 등으로 주기 실행)
+"""
+import os
+import copy
+import json
+import time
+import hashlib
+import logging
+import threading
+import unicodedata
+import contextvars
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+
+# 환경 변수 로딩
+load_dotenv(dotenv_path=".env")
+
+AI_CACHE_MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX_ENTRIES", "2000"))
+AI_CACHE_MAX_BYTES = int(os.getenv("AI_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+AI_CACHE_TTL_SECONDS = int(os.getenv("AI_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+AI_CACHE_PERSIST = os.getenv("AI_CACHE_PERSIST", "1") == "1"
+# 영구 저장 N회마다 만료된 행 정리
+AI_CACHE_PURGE_EVERY = int(os.getenv("AI_CACHE_PURGE_EVERY", "500"))
+# DB 계층 최대 행 수 (넘으면 만료가 가까운 행부터 삭제, 0이면 제한 없음)
+AI_CACHE_MAX_ROWS = int(os.getenv("AI_CACHE_MAX_ROWS", "200000"))
+# DB에도 없던 키를 다시 조회하지 않는 시간(초)
+AI_CACHE_NEGATIVE_TTL_SECONDS = float(os.getenv("AI_CACHE_NEGATIVE_TTL_SECONDS", "60"))
+# 한 번에 삭제할 행 수
+AI_CACHE_PURGE_BATCH = 1000
+
+# (캐시 조회 여부, DB 계층 사용 여부)
+_options: contextvars.ContextVar[tuple] = contextvars.ContextVar("simlog_ai_cache_options", default=(True, True))
+
+
+@contextmanager
+def ai_cache_options(read: bool = True, persist: bool = True):
+    """with 블록 안의 캐시 사용 방식 지정
+    read=False: 캐시를 조회하지 않음 (프롬프트를 바꾼 뒤 재분석 등, 결과는 새로 저장)
+    persist=False: DB 계층을 조회/저장하지 않고 메모리 계층만 사용 (일괄 작업)"""
+    token = _options.set((read, persist))
+    try:
+        yield
+    finally:
+        _options.reset(token)
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키용 본문 정규화 (유니코드 NFC + 공백 정리)"""
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def make_cache_key(kind: str, text: str, model: str, prompt_version: str) -> str:
+    raw = "\x00".join([kind, model, prompt_version, normalize_text(text)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class AIResultCache:
+    """LRU + TTL 메모리 캐시와 DB 영구 캐시를 묶은 2단 캐시"""
+
+    def __init__(
+        self,
+        max_entries: int = AI_CACHE_MAX_ENTRIES,
+        max_bytes: int = AI_CACHE_MAX_BYTES,
+        ttl_seconds: int = AI_CACHE_TTL_SECONDS,
+        persist: bool = AI_CACHE_PERSIST,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.persist = persist
+        self._lock = threading.Lock()
+        # key -> (expires_at(monotonic), size_bytes, value)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        # DB에도 없던 key -> 다시 조회할 시각(monotonic)
+        self._misses: "OrderedDict[str, float]" = OrderedDict()
+        self._persist_writes = 0
+        self._stats = {
+            "hits": 0,
+            "memory_hits": 0,
+            "persistent_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "negative_hits": 0,
+            "persist_errors": 0,
+            "purged_rows": 0,
+        }
+
+    # ----- 메모리 계층 -----
+    def _memory_get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, size, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                self._stats["expirations"] += 1
+                return None
+            self._entries.move_to_end(key)
+        # 호출 측에서 결과를 수정해도 캐시 원본은 유지
+        return copy.deepcopy(value)
+
+    def _memory_set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        size = len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (time.monotonic() + ttl, size, value)
+            self._bytes += size
+            # 상한 초과 시 가장 오래 사용하지 않은 항목부터 제거
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._stats["evictions"] += 1
+
+    def _known_miss(self, key: str) -> bool:
+        with self._lock:
+            retry_at = self._misses.get(key)
+            if retry_at is None:
+                return False
+            if retry_at < time.monotonic():
+                del self._misses[key]
+                return False
+            self._stats["negative_hits"] += 1
+            return True
+
+    def _remember_miss(self, key: str) -> None:
+        if AI_CACHE_NEGATIVE_TTL_SECONDS <= 0:
+            return
+        with self._lock:
+            self._misses.pop(key, None)
+            self._misses[key] = time.monotonic() + AI_CACHE_NEGATIVE_TTL_SECONDS
+            while len(self._misses) > self.max_entries:
+                self._misses.popitem(last=False)
+
+    # ----- DB 계층 -----
+    def _persistent_get_many(self, keys) -> Dict[str, tuple]:
+        """key 목록을 한 번의 쿼리로 조회 → {key: (payload, 남은 초)} (만료/없는 키 제외)"""
+        from database import SessionLocal
+        from models.ai_analysis_cache import AIAnalysisCache
+
+        db = SessionLocal()
+        try:
+            rows = db.query(
+                AIAnalysisCache.cache_key, AIAnalysisCache.payload, AIAnalysisCache.expires_at
+            ).filter(AIAnalysisCache.cache_key.in_(list(keys))).all()
+        finally:
+            db.close()
+        now = datetime.utcnow()
+        found = {}
+        for key, payload, expires_at in rows:
+            remaining = (expires_at.replace(tzinfo=None) - now).total_seconds() if expires_at else 0
+            if remaining > 0:
+                found[key] = (payload, remaining)
+        return found
+
+    def _persistent_set(self, key: str, kind: str, model: str, prompt_version: str, value: Any) -> None:
+        from database import SessionLocal
+        from models.ai_analysis_cache import AIAnalysisCache
+
+        # MySQL은 timezone-aware datetime을 직접 저장하지 못할 수 있으므로 naive UTC 사용
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.ttl_seconds)
+        db = SessionLocal()
+        try:
+            row = db.query(AIAnalysisCache).filter(AIAnalysisCache.cache_key == key).first()
+            if row:
+                row.payload = value
+                row.expires_at = expires_at
+            else:
+                db.add(AIAnalysisCache(
+                    cache_key=key,
+                    kind=kind,
+                    model=model,
+                    prompt_version=prompt_version,
+                    payload=value,
+                    expires_at=expires_at,
+                ))
+            db.commit()
+
+            self._persist_writes += 1
+            if AI_CACHE_PURGE_EVERY > 0 and self._persist_writes % AI_CACHE_PURGE_EVERY == 0:
+                self.purge_persistent(db)
+        except Exception:
+            # 동시 저장으로 인한 중복 키 등: 롤백 후 상위에서 경고만 남김 (캐시이므로 치명적이지 않음)
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def purge_persistent(self, db, max_rows: int = AI_CACHE_MAX_ROWS) -> int:
+        """DB 계층 정리: 만료된 행 삭제 후 max_rows를 넘는 만큼 만료가 가까운 행부터 삭제 (커밋 포함)"""
+        from models.ai_analysis_cache import AIAnalysisCache
+
+        deleted = db.query(AIAnalysisCache).filter(
+            AIAnalysisCache.expires_at < datetime.utcnow()
+        ).delete(synchronize_session=False)
+        db.commit()
+        if max_rows > 0:
+            excess = (db.query(AIAnalysisCache.id).count()) - max_rows
+            while excess > 0:
+                ids = [row_id for (row_id,) in db.query(AIAnalysisCache.id).order_by(
+                    AIAnalysisCache.expires_at, AIAnalysisCache.id
+                ).limit(min(excess, AI_CACHE_PURGE_BATCH))]
+                if not ids:
+                    break
+                db.query(AIAnalysisCache).filter(AIAnalysisCache.id.in_(ids)).delete(synchronize_session=False)
+                db.commit()
+                deleted += len(ids)
+                excess -= len(ids)
+        with self._lock:
+            self._stats["purged_rows"] += deleted
+        return deleted
+
+    # ----- 공개 API -----
+    def get(self, kind: str, text: str, model: str, prompt_version: str) -> Optional[Any]:
+        return self.get_many({kind: prompt_version}, text, model).get(kind)
+
+    def get_many(self, versions: Dict[str, str], text: str, model: str) -> Dict[str, Any]:
+        """같은 본문의 여러 항목 조회 {kind: prompt_version} → {kind: 값} (없는 항목은 빠짐)
+        메모리 계층에 없는 항목만 DB 계층에서 한 번의 쿼리로 조회"""
+        read, persist = _options.get()
+        if not read:
+            return {}
+        keys = {kind: make_cache_key(kind, text, model, version) for kind, version in versions.items()}
+        found: Dict[str, Any] = {}
+        for kind, key in keys.items():
+            value = self._memory_get(key)
+            if value is not None:
+                found[kind] = value
+        with self._lock:
+            self._stats["hits"] += len(found)
+            self._stats["memory_hits"] += len(found)
+
+        missing = {key: kind for kind, key in keys.items() if kind not in found and not self._known_miss(key)}
+        if self.persist and persist and missing:
+            try:
+                rows = self._persistent_get_many(missing)
+            except Exception as e:
+                rows = {}
+                with self._lock:
+                    self._stats["persist_errors"] += 1
+                logging.warning(f"AI 캐시 조회 실패: {e}")
+            for key, kind in missing.items():
+                if key in rows:
+                    value, remaining = rows[key]
+                    self._memory_set(key, value, ttl_seconds=remaining)
+                    found[kind] = value
+                else:
+                    self._remember_miss(key)
+            with self._lock:
+                self._stats["hits"] += len(rows)
+                self._stats["persistent_hits"] += len(rows)
+
+        with self._lock:
+            self._stats["misses"] += len(keys) - len(found)
+        return found
+
+    def set(self, kind: str, text: str, model: str, prompt_version: str, value: Any) -> None:
+        if value is None:
+            return
+        key = make_cache_key(kind, text, model, prompt_version)
+        self._memory_set(key, value)
+        with self._lock:
+            self._misses.pop(key, None)
+        if self.persist and _options.get()[1]:
+            try:
+                self._persistent_set(key, kind, model, prompt_version, value)
+            except Exception as e:
+                with self._lock:
+                    self._stats["persist_errors"] += 1
+                logging.warning(f"AI 캐시 저장 실패: {e}")
+
+    def clear(self) -> None:
+        """메모리 계층 비우기 (DB 계층은 TTL로 만료)"""
+        with self._lock:
+            self._entries.clear()
+            self._misses.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        stats["config"] = {
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "persist": self.persist,
+            "max_rows": AI_CACHE_MAX_ROWS,
+            "negative_ttl_seconds": AI_CACHE_NEGATIVE_TTL_SECONDS,
+        }
+        return stats
+
+
+# 프로세스 공용 캐시
+ai_result_cache = AIResultCache()
@@ -0,0 +1,211 @@
+"""
+외부 AI 호출(OpenAI, CLOVA) 계측
+- 메서드별 호출 수, 지연 히스토그램/분위수, 토큰 사용량(usage), 예상 비용, 오류 분류, 폴백 횟수 집계
+- /emotions/debug/ai-metrics 에서 조회
+- 호출마다 JSON 한 줄 로그(logger "simlog.ai") 남김 (AI_METRICS_LOG=0이면 끔)
+"""
+import os
+import json
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Any, Dict, Optional
+
+import httpx
+import requests
+from dotenv import load_dotenv
+
+# 환경 변수 로딩
+load_dotenv(dotenv_path=".env")
+
+AI_METRICS_LOG = os.getenv("AI_METRICS_LOG", "1") == "1"
+# 분위수 계산용으로 보관할 최근 지연 샘플 수 (메서드별)
+AI_METRICS_SAMPLES = int(os.getenv("AI_METRICS_SAMPLES", "1000"))
+
+# 모델별 100만 토큰당 가격(USD): (입력, 출력)
+MODEL_PRICES = {
+    "gpt-4o-mini": (
+        float(os.getenv("AI_PRICE_GPT4O_MINI_INPUT", "0.15")),
+        float(os.getenv("AI_PRICE_GPT4O_MINI_OUTPUT", "0.60")),
+    ),
+}
+
+# 지연 히스토그램 구간 상한(ms)
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 20000, 30000)
+
+logger = logging.getLogger("simlog.ai")
+
+
+def classify_error(error: Optional[BaseException] = None, status_code: Optional[int] = None) -> str:
+    """오류를 집계용 분류로 변환"""
+    from openai import APIConnectionError, APIStatusError, APITimeoutError
+    from services.circuit_breaker import CircuitOpenError
+    from services.deadline import DeadlineExceeded
+    from services.rate_limiter import RateLimitShed
+
+    if isinstance(error, APIStatusError):
+        status_code = error.status_code
+    if status_code is not None:
+        if status_code == 429:
+            return "rate_limit"
+        if status_code >= 500:
+            return "server_error"
+        return "client_error"
+    if isinstance(error, CircuitOpenError):
+        return "circuit_open"
+    if isinstance(error, DeadlineExceeded):
+        return "deadline"
+    if isinstance(error, RateLimitShed):
+        return "shed"
+    if isinstance(error, asyncio.CancelledError):
+        return "cancelled"
+    if isinstance(error, (APITimeoutError, httpx.TimeoutException, requests.Timeout)):
+        return "timeout"
+    if isinstance(error, (APIConnectionError, httpx.TransportError, requests.ConnectionError)):
+        return "connection"
+    if isinstance(error, (json.JSONDecodeError, ValueError, KeyError)):
+        return "parse_error"
+    return "other"
+
+
+def _new_method_stats() -> Dict:
+    return {
+        "calls": 0,
+        "errors": {},
+        "fallbacks": 0,
+        "latency_ms_sum": 0.0,
+        "latency_ms_max": 0.0,
+        "buckets": [0] * (len(LATENCY_BUCKETS_MS) + 1),
+        "samples": deque(maxlen=AI_METRICS_SAMPLES),
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "cost_usd": 0.0,
+    }
+
+
+class AIMetrics:
+    """메서드별 AI 호출 지표 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._methods: Dict[str, Dict] = {}
+
+    def _get(self, key: str) -> Dict:
+        stats = self._methods.get(key)
+        if stats is None:
+            stats = self._methods[key] = _new_method_stats()
+        return stats
+
+    def observe(
+        self,
+        upstream: str,
+        method: str,
+        duration: float,
+        error: Optional[BaseException] = None,
+        status_code: Optional[int] = None,
+        usage: Any = None,
+        model: Optional[str] = None,
+    ) -> None:
+        """외부 호출 1건 기록 (오류면 error 또는 4xx/5xx status_code 전달)"""
+        latency_ms = duration * 1000
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        prices = MODEL_PRICES.get(model or "")
+        cost = (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1_000_000 if prices else 0.0
+        failed = error is not None or (status_code is not None and status_code >= 400)
+        error_class = classify_error(error, status_code) if failed else None
+
+        with self._lock:
+            stats = self._get(f"{upstream}.{method}")
+            stats["calls"] += 1
+            if error_class:
+                stats["errors"][error_class] = stats["errors"].get(error_class, 0) + 1
+            # 호출 전에 거절된 경우(브레이커/예산/속도 제한)는 지연 분포에서 제외
+            if error_class not in ("circuit_open", "deadline", "shed"):
+                stats["latency_ms_sum"] += latency_ms
+                stats["latency_ms_max"] = max(stats["latency_ms_max"], latency_ms)
+                bucket = next((i for i, upper in enumerate(LATENCY_BUCKETS_MS) if latency_ms <= upper), len(LATENCY_BUCKETS_MS))
+                stats["buckets"][bucket] += 1
+                stats["samples"].append(latency_ms)
+            stats["prompt_tokens"] += prompt_tokens
+            stats["completion_tokens"] += completion_tokens
+            stats["cost_usd"] += cost
+
+        if AI_METRICS_LOG:
+            logger.info(json.dumps({
+                "event": "ai_call",
+                "upstream": upstream,
+                "method": method,
+                "latency_ms": round(latency_ms, 1),
+                "ok": not failed,
+                "error": error_class,
+                "status_code": status_code,
+                "model": model,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "cost_usd": round(cost, 6),
+            }, ensure_ascii=False))
+
+    def record_fallback(self, method: str) -> None:
+        """AI 결과 대신 키워드 기반 폴백을 사용한 횟수"""
+        with self._lock:
+            self._get(f"fallback.{method}")["fallbacks"] += 1
+        if AI_METRICS_LOG:
+            logger.info(json.dumps({"event": "ai_fallback", "method": method}, ensure_ascii=False))
+
+    @staticmethod
+    def _quantile(samples, q: float) -> float:
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 1)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            methods = {
+                key: dict(stats, errors=dict(stats["errors"]), buckets=list(stats["buckets"]), samples=list(stats["samples"]))
+                for key, stats in self._methods.items()
+            }
+
+        result = {}
+        totals = {"calls": 0, "errors": 0, "fallbacks": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0}
+        for key, stats in sorted(methods.items()):
+            samples = stats.pop("samples")
+            timed = sum(stats["buckets"])
+            error_count = sum(stats["errors"].values())
+            labels = [f"<={upper}" for upper in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}"]
+            result[key] = {
+                "calls": stats["calls"],
+                "errors": error_count,
+                "errors_by_class": stats["errors"],
+                "fallbacks": stats["fallbacks"],
+                "latency_ms": {
+                    "avg": round(stats["latency_ms_sum"] / timed, 1) if timed else 0.0,
+                    "p50": self._quantile(samples, 0.50),
+                    "p95": self._quantile(samples, 0.95),
+                    "p99": self._quantile(samples, 0.99),
+                    "max": round(stats["latency_ms_max"], 1),
+                    "total": round(stats["latency_ms_sum"], 1),
+                    "histogram": dict(zip(labels, stats["buckets"])),
+                },
+                "prompt_tokens": stats["prompt_tokens"],
+                "completion_tokens": stats["completion_tokens"],
+                "cost_usd": round(stats["cost_usd"], 6),
+            }
+            totals["calls"] += stats["calls"]
+            totals["errors"] += error_count
+            totals["fallbacks"] += stats["fallbacks"]
+            totals["prompt_tokens"] += stats["prompt_tokens"]
+            totals["completion_tokens"] += stats["completion_tokens"]
+            totals["cost_usd"] += stats["cost_usd"]
+        totals["cost_usd"] = round(totals["cost_usd"], 6)
+        return {"totals": totals, "methods": result}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._methods.clear()
+
+
+# 프로세스 공용 지표
+ai_metrics = AIMetrics()
@@ -0,0 +1,88 @@
+"""
+기록 AI 분석 백그라운드 워커 (ANALYSIS_ASYNC=1일 때만, 기본은 꺼짐)
+- POST /records는 기록을 analysis_status="pending"으로 즉시 저장하고 분석 작업만 큐에 넣는다
+  (응답의 분석 결과는 키워드 기반 임시 값 - 클라이언트가 GET /records/{id}/analysis로 완료를 확인해야 하므로
+  클라이언트가 폴링을 지원할 때 켬)
+- 워커가 키워드/요약/감정 분석을 채우고 주간 요약 캐시를 갱신한다
+- 완료 대기(wait)를 지원하여 클라이언트가 폴링 또는 롱폴링으로 완료를 구독할 수 있다
+- AI 호출은 background 우선순위로 속도 제한을 받아 한도 근처에서는 사용자 요청(interactive)에 양보한다
+"""
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+from dotenv import load_dotenv
+
+from services.rate_limiter import llm_priority, BACKGROUND
+
+# 환경 변수 로딩
+load_dotenv(dotenv_path=".env")
+
+# 1이면 기록 생성 시 AI 분석을 백그라운드에서 수행 (0이면 기존처럼 분석을 마친 기록을 응답)
+ANALYSIS_ASYNC = os.getenv("ANALYSIS_ASYNC", "0") == "1"
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "4"))
+# 선점한 분석이 이 시간(초) 안에 끝나지 않으면 다른 프로세스가 다시 선점할 수 있음 (프로세스 종료 대비)
+ANALYSIS_CLAIM_TIMEOUT = int(os.getenv("ANALYSIS_CLAIM_TIMEOUT", "300"))
+# 분석 상태 롱폴링 최대 대기 시간(초) - 대기 중에는 요청 스레드풀 워커 하나를 점유하므로 짧게 유지
+ANALYSIS_MAX_WAIT = float(os.getenv("ANALYSIS_MAX_WAIT", "5"))
+
+
+class RecordAnalysisWorker:
+    """기록 분석 작업을 스레드 풀에서 실행하고 완료 이벤트를 관리"""
+
+    def __init__(self, max_workers: int = ANALYSIS_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="record-analysis")
+        self._lock = threading.Lock()
+        # record_id -> 완료 이벤트 (진행 중인 작업만 보관)
+        self._events: Dict[int, threading.Event] = {}
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0}
+
+    def submit(self, record_id: int, claimed: bool = False) -> None:
+        """분석 작업 등록 (claimed=True면 호출 측이 이미 선점한 기록)"""
+        with self._lock:
+            if record_id in self._events:
+                return  # 이미 큐에 있음
+            self._events[record_id] = threading.Event()
+            self._stats["submitted"] += 1
+        self._executor.submit(self._run, record_id, claimed)
+
+    def _run(self, record_id: int, claimed: bool = False) -> None:
+        from services.record_service import RecordService
+
+        ok = False
+        try:
+            # 스레드 풀은 호출 측 contextvars를 넘기지 않으므로 작업 안에서 우선순위 지정
+            with llm_priority(BACKGROUND):
+                ok = RecordService.complete_record_analysis(record_id, claimed=claimed)
+        except Exception as e:
+            logging.error(f"기록 분석 작업 실패 (record_id={record_id}): {e}")
+        finally:
+            with self._lock:
+                self._stats["completed" if ok else "failed"] += 1
+                event = self._events.pop(record_id, None)
+            if event:
+                event.set()
+
+    def is_pending(self, record_id: int) -> bool:
+        with self._lock:
+            return record_id in self._events
+
+    def wait(self, record_id: int, timeout: float) -> bool:
+        """분석 완료까지 최대 timeout초 대기 (진행 중인 작업이 없으면 즉시 True)"""
+        with self._lock:
+            event = self._events.get(record_id)
+        if event is None:
+            return True
+        return event.wait(timeout)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._events)
+        return stats
+
+
+# 프로세스 공용 워커
+record_analysis_worker = RecordAnalysisWorker()
@@ -0,0 +1,238 @@
+"""
+외부 API(OpenAI, CLOVA) 서킷 브레이커
+- 업스트림별로 하나의 브레이커를 프로세스 전체에서 공유
+- 최근 window초 동안의 오류율 또는 느린 호출 비율이 임계값을 넘으면 open → 호출 없이 즉시 폴백
+- open_seconds가 지나면 half_open 상태에서 제한된 수의 시험 호출을 허용하고,
+  성공하면 closed, 실패하면 다시 open
+"""
+import os
+import time
+import logging
+import threading
+from collections import deque
+from typing import Callable, Dict, Optional
+
+from dotenv import load_dotenv
+
+# 환경 변수 로딩
+load_dotenv(dotenv_path=".env")
+
+BREAKER_WINDOW_SECONDS = float(os.getenv("BREAKER_WINDOW_SECONDS", "60"))
+# 판단에 필요한 최소 호출 수 (호출이 적을 때 한두 번 실패로 열리지 않도록)
+BREAKER_MIN_CALLS = int(os.getenv("BREAKER_MIN_CALLS", "10"))
+BREAKER_ERROR_RATE = float(os.getenv("BREAKER_ERROR_RATE", "0.5"))
+# 이 시간(초)보다 오래 걸린 호출은 느린 호출로 집계
+BREAKER_SLOW_CALL_SECONDS = float(os.getenv("BREAKER_SLOW_CALL_SECONDS", "8"))
+BREAKER_SLOW_CALL_RATE = float(os.getenv("BREAKER_SLOW_CALL_RATE", "0.5"))
+BREAKER_OPEN_SECONDS = float(os.getenv("BREAKER_OPEN_SECONDS", "30"))
+BREAKER_HALF_OPEN_PROBES = int(os.getenv("BREAKER_HALF_OPEN_PROBES", "1"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """브레이커가 열려 있어 호출하지 않음"""
+
+
+class CircuitBreaker:
+    """오류율/지연 기반 서킷 브레이커 (스레드 안전)"""
+
+    def __init__(
+        self,
+        name: str,
+        window_seconds: float = BREAKER_WINDOW_SECONDS,
+        min_calls: int = BREAKER_MIN_CALLS,
+        error_rate: float = BREAKER_ERROR_RATE,
+        slow_call_seconds: float = BREAKER_SLOW_CALL_SECONDS,
+        slow_call_rate: float = BREAKER_SLOW_CALL_RATE,
+        open_seconds: float = BREAKER_OPEN_SECONDS,
+        half_open_probes: int = BREAKER_HALF_OPEN_PROBES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        # (시각, 실패 여부, 느린 호출 여부)
+        self._calls: deque = deque()
+        self._stats = {"calls": 0, "failures": 0, "slow_calls": 0, "rejected": 0, "opened": 0}
+
+    # ----- 상태 전이 (lock 안에서 호출) -----
+    def _trim(self, now: float) -> None:
+        while self._calls and self._calls[0][0] < now - self.window_seconds:
+            self._calls.popleft()
+
+    def _refresh_state(self, now: float) -> None:
+        if self._state == OPEN and now - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes_in_flight = 0
+
+    def _open(self, now: float) -> None:
+        if self._state != OPEN:
+            self._stats["opened"] += 1
+            logging.warning(f"서킷 브레이커 open: {self.name}")
+        self._state = OPEN
+        self._opened_at = now
+        self._probes_in_flight = 0
+
+    def _rates(self):
+        total = len(self._calls)
+        if not total:
+            return 0, 0.0, 0.0
+        failures = sum(1 for _, failed, _ in self._calls if failed)
+        slow = sum(1 for _, _, is_slow in self._calls if is_slow)
+        return total, failures / total, slow / total
+
+    # ----- 공개 API -----
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh_state(self._clock())
+            return self._state
+
+    def allow_request(self) -> bool:
+        """호출 가능 여부 (half_open이면 시험 호출 슬롯을 하나 차지)"""
+        with self._lock:
+            now = self._clock()
+            self._refresh_state(now)
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._probes_in_flight < self.half_open_probes:
+                self._probes_in_flight += 1
+                return True
+            self._stats["rejected"] += 1
+            return False
+
+    def record(self, duration: float, failed: bool) -> None:
+        """호출 결과 기록 후 상태 전이"""
+        is_slow = duration >= self.slow_call_seconds
+        with self._lock:
+            now = self._clock()
+            self._stats["calls"] += 1
+            self._stats["failures"] += int(failed)
+            self._stats["slow_calls"] += int(is_slow)
+
+            if self._state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if failed or is_slow:
+                    self._open(now)
+                else:
+                    # 시험 호출 성공 → 이전 기록을 버리고 정상 상태로 복귀
+                    self._state = CLOSED
+                    self._calls.clear()
+                    logging.info(f"서킷 브레이커 closed: {self.name}")
+                return
+            if self._state == OPEN:
+                return  # open 직전에 시작된 호출의 결과는 무시
+
+            self._calls.append((now, failed, is_slow))
+            self._trim(now)
+            total, error_rate, slow_rate = self._rates()
+            if total >= self.min_calls and (error_rate >= self.error_rate or slow_rate >= self.slow_call_rate):
+                self._open(now)
+
+    def release(self) -> None:
+        """결과 없이 끝난 호출(취소 등)의 시험 호출 슬롯 반환"""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def call(self, func: Callable, *args, is_failure: Optional[Callable[[Exception], bool]] = None, **kwargs):
+        """브레이커를 거쳐 func 실행 (open이면 CircuitOpenError)"""
+        if not self.allow_request():
+            raise CircuitOpenError(self.name)
+        start = self._clock()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self.record(self._clock() - start, failed=is_failure(e) if is_failure else True)
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.record(self._clock() - start, failed=False)
+        return result
+
+    async def acall(self, func: Callable, *args, is_failure: Optional[Callable[[Exception], bool]] = None, **kwargs):
+        """call의 비동기 버전 (마감 시간 초과로 취소된 호출은 느린 호출 기준을 넘었을 때만 기록)"""
+        if not self.allow_request():
+            raise CircuitOpenError(self.name)
+        start = self._clock()
+        try:
+            result = await func(*args, **kwargs)
+        except Exception as e:
+            self.record(self._clock() - start, failed=is_failure(e) if is_failure else True)
+            raise
+        except BaseException:
+            elapsed = self._clock() - start
+            if elapsed >= self.slow_call_seconds:
+                self.record(elapsed, failed=False)
+            else:
+                self.release()
+            raise
+        self.record(self._clock() - start, failed=False)
+        return result
+
+    def stats(self) -> Dict:
+        with self._lock:
+            now = self._clock()
+            self._refresh_state(now)
+            self._trim(now)
+            total, error_rate, slow_rate = self._rates()
+            stats = dict(self._stats)
+            stats.update({
+                "state": self._state,
+                "window_calls": total,
+                "window_error_rate": round(error_rate, 3),
+                "window_slow_rate": round(slow_rate, 3),
+                "open_remaining_seconds": (
+                    round(max(0.0, self.open_seconds - (now - self._opened_at)), 1)
+                    if self._state == OPEN else 0.0
+                ),
+            })
+        stats["config"] = {
+            "window_seconds": self.window_seconds,
+            "min_calls": self.min_calls,
+            "error_rate": self.error_rate,
+            "slow_call_seconds": self.slow_call_seconds,
+            "slow_call_rate": self.slow_call_rate,
+            "open_seconds": self.open_seconds,
+            "half_open_probes": self.half_open_probes,
+        }
+        return stats
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """업스트림 이름별 공용 브레이커 ("openai", "clova")"""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(name, CircuitBreaker(name))
+    return breaker
+
+
+# 디버그 화면에 항상 표시할 업스트림
+UPSTREAMS = ("openai", "clova")
+
+
+def get_breaker_stats() -> Dict:
+    for name in UPSTREAMS:
+        get_breaker(name)
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {name: breaker.stats() for name, breaker in breakers.items()}
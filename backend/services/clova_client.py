@@ -0,0 +1,50 @@
+"""
+NAVER CLOVA STT 호출 공통 경로
+- VoiceService와 AIAnalysisService가 같은 서킷 브레이커("clova")와 타임아웃을 사용
+- 읽기 타임아웃은 요청 마감 시간(deadline budget) 안으로 줄어듦
+"""
+import os
+import time
+
+import requests
+from dotenv import load_dotenv
+
+from services.circuit_breaker import get_breaker, CircuitOpenError
+from services.deadline import call_timeout
+from services.ai_metrics import ai_metrics
+
+# 환경 변수 로딩
+load_dotenv(dotenv_path=".env")
+
+# CLOVA STT 주소 (로컬 모의 서버 등으로 바꿀 때 설정)
+CLOVA_STT_URL = os.getenv("CLOVA_STT_URL", "https://naveropenapi.apigw.ntruss.com/recog/v1/stt")
+
+# CLOVA STT 타임아웃(초)
+CLOVA_CONNECT_TIMEOUT = float(os.getenv("CLOVA_CONNECT_TIMEOUT", "3"))
+CLOVA_READ_TIMEOUT = float(os.getenv("CLOVA_READ_TIMEOUT", "30"))
+
+
+def clova_post(url: str, method: str = "clova_stt", **kwargs) -> requests.Response:
+    """CLOVA 호출 공통 경로: 서킷 브레이커 + 타임아웃 + 계측 (5xx/429 응답은 실패로 집계)"""
+    start = time.monotonic()
+    try:
+        timeout = (CLOVA_CONNECT_TIMEOUT, call_timeout(CLOVA_READ_TIMEOUT))
+        breaker = get_breaker("clova")
+        if not breaker.allow_request():
+            raise CircuitOpenError("clova")
+    except Exception as e:
+        ai_metrics.observe("clova", method, time.monotonic() - start, error=e)
+        raise
+    try:
+        response = requests.post(url, timeout=timeout, **kwargs)
+    except Exception as e:
+        breaker.record(time.monotonic() - start, failed=True)
+        ai_metrics.observe("clova", method, time.monotonic() - start, error=e)
+        raise
+    except BaseException:
+        breaker.release()
+        raise
+    duration = time.monotonic() - start
+    breaker.record(duration, failed=response.status_code >= 500 or response.status_code == 429)
+    ai_metrics.observe("clova", method, duration, status_code=response.status_code)
+    return response
@@ -0,0 +1,99 @@
+"""
+팔레트 최근접 색 검색용 양자화 RGB 룩업 테이블
+- RGB 공간을 채널당 2^bits 구간으로 나눈 셀마다, 셀 안의 어떤 점에 대해서도 최근접이 될 수 있는
+  팔레트 후보(exact candidate set)를 미리 계산
+  (셀까지의 최소 거리 <= 모든 후보 중 셀까지의 최대 거리의 최솟값 인 항목만 후보)
+- 대부분의 셀은 후보가 1개 → O(1), 경계 셀만 후보 몇 개를 팔레트 순서대로 비교
+- 결과는 팔레트 전체를 순서대로 훑는 선형 탐색과 같다 (거리가 같으면 팔레트 앞쪽 항목)
+- 테이블은 첫 검색 때 만든다 (팔레트당 수십 ms, import 시간에 영향 없음)
+"""
+import threading
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class PaletteLUT:
+    """팔레트 색 목록에 대한 최근접 색 인덱스 검색"""
+
+    def __init__(self, colors: Sequence[Tuple[int, int, int]], bits: int = 5):
+        self.colors: List[Tuple[int, int, int]] = [tuple(c) for c in colors]
+        self.bits = bits
+        self._shift = 8 - bits
+        self._palette = np.array(self.colors, dtype=np.int64)  # (k, 3)
+        self._candidates: Optional[List[Tuple[int, ...]]] = None
+        self._single: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    def _build(self) -> None:
+        with self._lock:
+            if self._candidates is not None:
+                return
+            self._single, self._candidates = self._compute_tables()
+
+    def _compute_tables(self):
+        bits = self.bits
+        bins = 1 << bits
+        size = 256 >> bits
+
+        palette = self._palette
+        lo = np.arange(bins, dtype=np.int64) * size
+        hi = lo + size
+        # 채널별 (구간, 팔레트 항목) 최소/최대 제곱 거리 - 축별로 분리 가능하므로 나중에 더함
+        c = palette.T[:, None, :]                          # (3, 1, k)
+        lo_d = (lo[None, :, None] - c) ** 2                # (3, bins, k)
+        hi_d = (hi[None, :, None] - c) ** 2
+        inside = (lo[None, :, None] <= c) & (c <= hi[None, :, None])
+        min_d = np.where(inside, 0, np.minimum(lo_d, hi_d))
+        max_d = np.maximum(lo_d, hi_d)
+
+        # 셀 (r, g, b) → r * bins^2 + g * bins + b
+        cell_min = (min_d[0][:, None, None, :] + min_d[1][None, :, None, :] + min_d[2][None, None, :, :]).reshape(-1, len(self.colors))
+        cell_max = (max_d[0][:, None, None, :] + max_d[1][None, :, None, :] + max_d[2][None, None, :, :]).reshape(-1, len(self.colors))
+        candidates = cell_min <= cell_max.min(axis=1, keepdims=True)
+
+        # 후보가 하나뿐인 셀은 그 인덱스, 아니면 -1
+        single = np.where(candidates.sum(axis=1) == 1, candidates.argmax(axis=1), -1)
+        return single, [tuple(np.flatnonzero(row).tolist()) for row in candidates]
+
+    def _cell(self, rgb) -> int:
+        shift, bits = self._shift, self.bits
+        r, g, b = (min(255, int(v)) >> shift for v in rgb)
+        return (r << (2 * bits)) | (g << bits) | b
+
+    def _scan(self, rgb, indices) -> int:
+        best_index, best_dist = -1, float("inf")
+        for i in indices:
+            color = self.colors[i]
+            dist = (rgb[0] - color[0]) ** 2 + (rgb[1] - color[1]) ** 2 + (rgb[2] - color[2]) ** 2
+            if dist < best_dist:
+                best_index, best_dist = i, dist
+        return best_index
+
+    def nearest(self, rgb) -> int:
+        """rgb(길이 3)와 가장 가까운 팔레트 항목 인덱스 (0~255 범위 밖이면 전체 선형 탐색)"""
+        if not all(0 <= v <= 255 for v in rgb):
+            return self._scan(rgb, range(len(self.colors)))
+        if self._candidates is None:
+            self._build()
+        candidates = self._candidates[self._cell(rgb)]
+        if len(candidates) == 1:
+            return candidates[0]
+        return self._scan(rgb, candidates)
+
+    def nearest_many(self, rgbs: np.ndarray) -> np.ndarray:
+        """(n, 3) RGB 배열 → (n,) 최근접 팔레트 인덱스 (범위 밖 값은 0~255로 자르지 않고 직접 비교)"""
+        if self._single is None:
+            self._build()
+        rgbs = np.asarray(rgbs, dtype=np.float64).reshape(-1, 3)
+        in_range = ((rgbs >= 0) & (rgbs <= 255)).all(axis=1)
+        quantized = np.minimum(np.where(in_range[:, None], rgbs, 0).astype(np.int64), 255) >> self._shift
+        cells = (quantized[:, 0] << (2 * self.bits)) | (quantized[:, 1] << self.bits) | quantized[:, 2]
+        result = np.where(in_range, self._single[cells], -1)
+
+        # 경계 셀/범위 밖만 팔레트 전체와 비교 (argmin은 같은 거리면 앞쪽 항목 → 선형 탐색과 같은 규칙)
+        unresolved = np.flatnonzero(result < 0)
+        if len(unresolved):
+            diff = rgbs[unresolved, None, :] - self._palette[None, :, :]
+            result[unresolved] = (diff ** 2).sum(axis=2).argmin(axis=1)
+        return result
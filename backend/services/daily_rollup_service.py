@@ -0,0 +1,169 @@
+"""
+일별 감정 롤업 (daily_emotion_rollup)
+- (user_id, 날짜)마다 그날 마지막 기록의 주감정/강도/RGB/수면·스트레스 점수와 기록 참조를 보관
+- 기록 생성/수정/삭제, 백그라운드 분석 완료, 일괄 재분석 시 같은 트랜잭션 안에서 갱신 (커밋은 호출 측)
+- 주간 요약/알림은 records 본문·JSON 대신 이 테이블의 (user_id, date) 범위 스캔 사용
+  (감정 통계는 하루 마지막 기록만이 아니라 기간 내 모든 기록을 세므로 records 집계를 유지)
+- 날짜는 records.record_date(서비스 시간대 작성일) 기준 - 하루 한 번 제한/연속 작성 일수와 같은 날짜
+- 기존 데이터 채우기/재계산: python maintenance_jobs.py rollup (record-dates로 작성일을 먼저 채운 뒤)
+"""
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from local_date import local_date
+from models.record import Record
+from models.daily_emotion_rollup import DailyEmotionRollup
+
+
+class DailyRollupService:
+
+    @staticmethod
+    def record_day(record_date: Optional[date], created_at: Optional[datetime] = None) -> date:
+        """기록이 속한 날짜 (record_date, 없으면 작성 시각(없으면 현재)의 서비스 시간대 날짜)"""
+        return record_date if record_date is not None else local_date(created_at)
+
+    @staticmethod
+    def rollup_values(record_id: int, emotion_analysis: Optional[Dict], sleep_score: Optional[int],
+                      stress_score: Optional[int], record_count: int = 1) -> Dict:
+        """대표 기록 → 롤업 컬럼 값"""
+        analysis = emotion_analysis if isinstance(emotion_analysis, dict) else {}
+        color = analysis.get("color") if isinstance(analysis.get("color"), dict) else {}
+        rgb = color.get("rgb")
+        if not (isinstance(rgb, (list, tuple)) and len(rgb) == 3):
+            rgb = (None, None, None)
+        intensity = color.get("intensity", analysis.get("intensity"))
+        try:
+            intensity = int(intensity) if intensity is not None else None
+        except (TypeError, ValueError):
+            intensity = None
+        return {
+            "record_id": record_id,
+            "record_count": record_count,
+            "primary_emotion": analysis.get("primary_emotion") or None,
+            "intensity": intensity,
+            "color_r": rgb[0],
+            "color_g": rgb[1],
+            "color_b": rgb[2],
+            "sleep_score": sleep_score,
+            "stress_score": stress_score,
+        }
+
+    @staticmethod
+    def _upsert(db: Session, user_id: int, day: date, values: Optional[Dict]) -> Optional[DailyEmotionRollup]:
+        rollup = db.query(DailyEmotionRollup).filter(
+            DailyEmotionRollup.user_id == user_id,
+            DailyEmotionRollup.date == day
+        ).first()
+        if values is None:
+            if rollup is not None:
+                db.delete(rollup)
+            return None
+
+        if rollup is None:
+            rollup = DailyEmotionRollup(user_id=user_id, date=day, **values)
+            try:
+                # 같은 날 롤업이 동시에 만들어지면 유니크 제약 위반 → 세이브포인트만 되돌리고 그 행을 갱신
+                with db.begin_nested():
+                    db.add(rollup)
+                return rollup
+            except IntegrityError:
+                rollup = db.query(DailyEmotionRollup).filter(
+                    DailyEmotionRollup.user_id == user_id,
+                    DailyEmotionRollup.date == day
+                ).one()
+        for field, value in values.items():
+            setattr(rollup, field, value)
+        return rollup
+
+    @staticmethod
+    def refresh_day(db: Session, user_id: int, day: date) -> Optional[DailyEmotionRollup]:
+        """(user_id, day) 롤업을 그날 기록으로 다시 계산 (커밋하지 않음 - 호출 측 트랜잭션에 포함)"""
+        db.flush()
+        rows = db.query(
+            Record.id, Record.emotion_analysis, Record.sleep_score, Record.stress_score
+        ).filter(
+            Record.user_id == user_id,
+            Record.record_date == day
+        ).order_by(Record.created_at.desc(), Record.id.desc()).all()
+
+        values = DailyRollupService.rollup_values(*rows[0], record_count=len(rows)) if rows else None
+        return DailyRollupService._upsert(db, user_id, day, values)
+
+    @staticmethod
+    def refresh_record(db: Session, record: Record) -> Optional[DailyEmotionRollup]:
+        """기록이 속한 날의 롤업 갱신 (생성/수정/분석 완료 후, 커밋 전에 호출)"""
+        db.flush()
+        return DailyRollupService.refresh_day(db, record.user_id, DailyRollupService.record_day(record.record_date, record.created_at))
+
+    @staticmethod
+    def refresh_records(db: Session, record_ids: Sequence[int]) -> int:
+        """여러 기록이 속한 날들의 롤업 갱신 (일괄 재분석용), 갱신한 날 수 반환"""
+        if not record_ids:
+            return 0
+        db.flush()
+        days = {
+            (user_id, DailyRollupService.record_day(record_date, created_at))
+            for user_id, record_date, created_at in db.query(
+                Record.user_id, Record.record_date, Record.created_at
+            ).filter(Record.id.in_(record_ids))
+        }
+        for user_id, day in days:
+            DailyRollupService.refresh_day(db, user_id, day)
+        return len(days)
+
+    @staticmethod
+    def rebuild_user(db: Session, user_id: int, start_day: Optional[date] = None) -> int:
+        """사용자 롤업 전체(또는 start_day 이후) 재계산 (커밋하지 않음), 만든 날 수 반환"""
+        query = db.query(
+            Record.id, Record.record_date, Record.created_at, Record.emotion_analysis, Record.sleep_score, Record.stress_score
+        ).filter(Record.user_id == user_id)
+        stale = db.query(DailyEmotionRollup).filter(DailyEmotionRollup.user_id == user_id)
+        if start_day is not None:
+            query = query.filter(Record.record_date >= start_day)
+            stale = stale.filter(DailyEmotionRollup.date >= start_day)
+
+        # 날짜별 마지막 기록과 기록 수 (작성 순으로 훑으며 덮어씀)
+        latest: Dict[date, Tuple] = {}
+        counts: Dict[date, int] = {}
+        for record_id, record_date, created_at, emotion_analysis, sleep_score, stress_score in query.order_by(Record.created_at, Record.id):
+            day = DailyRollupService.record_day(record_date, created_at)
+            latest[day] = (record_id, emotion_analysis, sleep_score, stress_score)
+            counts[day] = counts.get(day, 0) + 1
+
+        stale.delete(synchronize_session=False)
+        db.add_all(
+            DailyEmotionRollup(user_id=user_id, date=day,
+                               **DailyRollupService.rollup_values(*row, record_count=counts[day]))
+            for day, row in latest.items()
+        )
+        return len(latest)
+
+    @staticmethod
+    def get_range(db: Session, user_id: int, start_day: date, end_day: Optional[date] = None) -> List[DailyEmotionRollup]:
+        """기간 내 롤업 (날짜 오름차순)"""
+        query = db.query(DailyEmotionRollup).filter(
+            DailyEmotionRollup.user_id == user_id,
+            DailyEmotionRollup.date >= start_day
+        )
+        if end_day is not None:
+            query = query.filter(DailyEmotionRollup.date <= end_day)
+        return query.order_by(DailyEmotionRollup.date.asc()).all()
+
+    @staticmethod
+    def get_recent(db: Session, user_id: int, limit: int = 7) -> List[DailyEmotionRollup]:
+        """기록이 있는 최근 limit일의 롤업 (날짜 오름차순)"""
+        rows = db.query(DailyEmotionRollup).filter(
+            DailyEmotionRollup.user_id == user_id
+        ).order_by(DailyEmotionRollup.date.desc()).limit(limit).all()
+        return list(reversed(rows))
+
+    @staticmethod
+    def summaries_for(db: Session, rollups: Iterable[DailyEmotionRollup]) -> Dict[int, str]:
+        """롤업이 참조하는 기록의 한 줄 요약 {record_id: ai_summary} (요약 컬럼만 조회)"""
+        record_ids = [r.record_id for r in rollups if r.record_id is not None]
+        if not record_ids:
+            return {}
+        return dict(db.query(Record.id, Record.ai_summary).filter(Record.id.in_(record_ids)).all())
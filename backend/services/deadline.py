@@ -0,0 +1,63 @@
+"""
+요청 단위 마감 시간(deadline budget)
+- 요청 시작 시 전체 예산을 정하면, 그 안에서 호출되는 외부 API는 남은 시간만큼만 기다린다
+- contextvar로 전달되므로 asyncio 태스크, asyncio.to_thread, FastAPI 스레드풀에도 이어진다
+- 예산이 설정되지 않은 곳(백그라운드 작업 등)은 각 클라이언트의 기본 타임아웃을 그대로 사용
+"""
+import os
+import time
+import contextvars
+from contextlib import contextmanager
+from typing import Optional
+
+from dotenv import load_dotenv
+
+# 환경 변수 로딩
+load_dotenv(dotenv_path=".env")
+
+# HTTP 요청 하나에 허용하는 외부 API 대기 시간 합계(초)
+REQUEST_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", "25"))
+
+# 절대 마감 시각 (time.monotonic 기준), 없으면 None
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("simlog_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """요청 예산을 모두 사용함"""
+
+
+@contextmanager
+def deadline_budget(seconds: float):
+    """with 블록 안의 외부 호출 마감 시간 설정 (바깥 예산이 더 짧으면 바깥 예산 유지)"""
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def has_deadline() -> bool:
+    return _deadline.get() is not None
+
+
+def remaining_time(default: Optional[float] = None) -> Optional[float]:
+    """남은 예산(초)과 default 중 작은 값 (예산이 없으면 default)"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return default
+    remaining = deadline - time.monotonic()
+    return remaining if default is None else min(default, remaining)
+
+
+def call_timeout(default: float) -> float:
+    """외부 호출에 넘길 타임아웃 (예산을 다 썼으면 DeadlineExceeded)"""
+    timeout = remaining_time(default)
+    if timeout is None:
+        return default
+    if timeout <= 0:
+        raise DeadlineExceeded()
+    return timeout
@@ -0,0 +1,205 @@
+"""
+키워드 기반 감정 분석 일괄 처리 (NumPy)
+- EmotionColorService.analyze_emotion_from_text를 여러 본문에 한 번에 적용
+- 본문별 키워드 매칭(emotion_lexicon의 컴파일된 매처)만 파이썬 루프이고,
+  이후 점수 행렬(본문 × 8감정), 주감정, 강도, 색상 선택은 모두 배열 연산
+- 결과는 단건 경로와 완전히 같다 (점수는 같은 누적 테이블, 색상은 단건 함수로 미리 만든 테이블 사용)
+- 평균 RGB → 최근접 팔레트 색도 양자화 룩업 테이블(color_lut)로 한 번에 검색
+- 여러 사용자(또는 사용자×기간)의 대표 감정색을 열 배열에서 그룹 집계로 한 번에 계산
+"""
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from services import emotion_lexicon
+from services.emotion_color_service import (
+    EmotionColorService, _KEYWORD_SCORES, _INTENSITY_COLORS, _INTENSITY_LUTS, _EMOTION_NAMES, _EMOTION_LUT
+)
+
+# 점수 행렬의 열 순서 (단건 경로의 감정 순서와 동일)
+EMOTIONS: List[str] = list(emotion_lexicon.LEXICON["color_scores"].keys())
+
+# 패턴 id × 감정 소속 행렬 (한 키워드가 여러 감정에 속할 수 있음)
+_MEMBERSHIP = np.zeros((len(emotion_lexicon.MATCHER.patterns), len(EMOTIONS)), dtype=np.int32)
+_PATTERN_INDEX = {pattern: i for i, pattern in enumerate(emotion_lexicon.MATCHER.patterns)}
+for _col, _emotion in enumerate(EMOTIONS):
+    for _keyword in emotion_lexicon.LEXICON["color_scores"][_emotion]:
+        _MEMBERSHIP[_PATTERN_INDEX[_keyword], _col] = 1
+# color_scores 그룹 키워드만 열로 사용 (다른 그룹 키워드는 점수와 무관)
+_SCORE_PATTERN_IDS = np.flatnonzero(_MEMBERSHIP.any(axis=1))
+_SCORE_MEMBERSHIP = _MEMBERSHIP[_SCORE_PATTERN_IDS]
+_COLUMN_OF_PATTERN = {int(pid): col for col, pid in enumerate(_SCORE_PATTERN_IDS)}
+
+# 매칭 수 → 점수 (단건 경로와 같은 누적 테이블)
+_SCORE_TABLE = np.array(_KEYWORD_SCORES, dtype=np.float64)
+_DEFAULT_EMOTION_COL = EMOTIONS.index("기쁨")
+
+# (감정 열, 강도 1~10) → 색상 정보 (단건 경로와 같은 미리 계산된 테이블)
+_COLOR_TABLE = [
+    [_INTENSITY_COLORS[(emotion, intensity)] for intensity in range(1, 11)]
+    for emotion in EMOTIONS
+]
+
+
+class EmotionBatchService:
+    """여러 본문의 키워드 기반 감정 분석을 한 번에 수행"""
+
+    @staticmethod
+    def keyword_count_matrix(texts: Sequence[str]) -> np.ndarray:
+        """본문별 감정 키워드 매칭 수 행렬 (len(texts) × 8)"""
+        rows, cols = [], []
+        find_ids = emotion_lexicon.MATCHER.find_ids
+        column_of = _COLUMN_OF_PATTERN
+        for row, text in enumerate(texts):
+            for pattern_id in find_ids(text):
+                col = column_of.get(pattern_id)
+                if col is not None:
+                    rows.append(row)
+                    cols.append(col)
+        hits = np.zeros((len(texts), len(_SCORE_PATTERN_IDS)), dtype=np.int32)
+        hits[rows, cols] = 1
+        return hits @ _SCORE_MEMBERSHIP
+
+    @staticmethod
+    def score_matrix(texts: Sequence[str]) -> np.ndarray:
+        """_analyze_emotion_keywords와 같은 점수 행렬 (len(texts) × 8, 열 순서는 EMOTIONS)"""
+        scores = _SCORE_TABLE[EmotionBatchService.keyword_count_matrix(texts)]
+        # 매칭이 하나도 없으면 기쁨 0.1 (최소 점수 보장)
+        empty = ~scores.any(axis=1)
+        scores[empty, _DEFAULT_EMOTION_COL] = 0.1
+        return scores
+
+    @staticmethod
+    def analyze_texts(texts: Sequence[str]) -> Dict:
+        """analyze_emotion_from_text의 일괄 버전
+
+        반환: {"emotions": 열 이름, "scores": (n×8) 점수, "primary_index": (n,) 주감정 열,
+               "primary_emotion": 주감정 목록, "intensity": (n,) 강도, "colors": 색상 정보 목록}
+        """
+        scores = EmotionBatchService.score_matrix(texts)
+        # 동점이면 앞 열(단건 경로의 max와 같은 규칙)
+        primary_index = scores.argmax(axis=1) if len(texts) else np.zeros(0, dtype=np.int64)
+        primary_scores = scores[np.arange(len(texts)), primary_index]
+        intensity = np.clip((primary_scores * 10).astype(np.int64), 1, 10)
+        return {
+            "emotions": EMOTIONS,
+            "scores": scores,
+            "primary_index": primary_index,
+            "primary_emotion": [EMOTIONS[i] for i in primary_index.tolist()],
+            "intensity": intensity,
+            "colors": [dict(_COLOR_TABLE[e][i - 1]) for e, i in zip(primary_index.tolist(), intensity.tolist())],
+        }
+
+    @staticmethod
+    def to_results(batch: Dict) -> List[Dict]:
+        """analyze_texts 결과를 단건 analyze_emotion_from_text와 같은 형식의 목록으로 변환"""
+        results = []
+        for row, (emotion, intensity, color) in enumerate(
+            zip(batch["primary_emotion"], batch["intensity"].tolist(), batch["colors"])
+        ):
+            results.append({
+                "primary_emotion": emotion,
+                "emotion_scores": dict(zip(batch["emotions"], batch["scores"][row].tolist())),
+                "intensity": intensity,
+                "color": color,
+                "message": f"오늘의 감정색은 {color['name']}입니다~"
+            })
+        return results
+
+    @staticmethod
+    def closest_palette_names(avg_rgbs: np.ndarray, intensities: np.ndarray) -> List[str]:
+        """평균 RGB (n×3)와 평균 강도 (n,) → 강도별 확장 팔레트에서 가장 가까운 색 이름 목록
+        
+        _find_closest_from_palette(avg_rgb, _build_extended_palette(intensity))의 일괄 버전
+        (강도는 1~10으로 보정, 강도가 같은 행끼리 양자화 룩업 테이블로 한 번에 검색)
+        """
+        avg_rgbs = np.asarray(avg_rgbs).reshape(-1, 3)
+        intensities = np.clip(np.asarray(intensities, dtype=np.int64).reshape(-1), 1, 10)
+        names: List[str] = [""] * len(avg_rgbs)
+        for intensity in np.unique(intensities).tolist():
+            rows = np.flatnonzero(intensities == intensity)
+            palette_names, lut = _INTENSITY_LUTS[intensity]
+            for row, index in zip(rows.tolist(), lut.nearest_many(avg_rgbs[rows]).tolist()):
+                names[row] = palette_names[index]
+        return names
+
+    @staticmethod
+    def closest_emotions(rgbs: np.ndarray) -> List[str]:
+        """RGB (n×3) → 가장 가까운 기본 감정 목록 (_find_closest_emotion의 일괄 버전)"""
+        return [_EMOTION_NAMES[i] for i in _EMOTION_LUT.nearest_many(rgbs).tolist()]
+
+    @staticmethod
+    def columns_from_records(records_by_key: Dict[Any, List[Dict]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """{그룹 키: get_average_emotion_color 입력 형식의 기록 목록} → average_colors 입력 열 배열
+        
+        반환: (group_keys (n,), rgbs (n×3, 색 정보가 없으면 NaN), intensities (n,))
+        """
+        keys, rgbs, intensities = [], [], []
+        missing = (np.nan, np.nan, np.nan)
+        for key, records in records_by_key.items():
+            for record in records:
+                keys.append(key)
+                rgb = EmotionColorService._record_rgb(record)
+                rgbs.append(missing if rgb is None else rgb)
+                intensities.append(EmotionColorService._record_intensity(record))
+        return (
+            np.array(keys),
+            np.array(rgbs, dtype=np.float64).reshape(-1, 3),
+            np.array(intensities, dtype=np.int64),
+        )
+
+    @staticmethod
+    def average_colors(group_keys: Iterable, rgbs: np.ndarray, intensities: np.ndarray) -> Dict[Any, Dict]:
+        """그룹(사용자, 사용자×기간 등)별 대표 감정색 (get_average_emotion_color의 일괄 버전)
+        
+        - group_keys: (n,) 그룹 키, 또는 (n×k) 복합 키(예: user_id, 주 번호) → 결과 키는 튜플
+        - rgbs: (n×3) 기록별 RGB, 색 정보가 없는 기록은 NaN 행 (강도 평균에는 포함)
+        - intensities: (n,) 기록별 정수 강도
+        평균 RGB(채널별 합/개수를 버림), 평균 강도(반올림, 짝수 규칙), 팔레트 선택까지 단건과 같은 규칙
+        """
+        group_keys = np.asarray(group_keys)
+        rgbs = np.asarray(rgbs, dtype=np.float64).reshape(-1, 3)
+        intensities = np.asarray(intensities, dtype=np.float64).reshape(-1)
+        if not len(group_keys):
+            return {}
+
+        if group_keys.ndim > 1:
+            unique_keys, groups = np.unique(group_keys, axis=0, return_inverse=True)
+            keys = [tuple(k) for k in unique_keys.tolist()]
+        else:
+            unique_keys, groups = np.unique(group_keys, return_inverse=True)
+            keys = unique_keys.tolist()
+        groups = groups.reshape(-1)
+        n_groups = len(keys)
+
+        # 그룹별 합계 (bincount 가중합)
+        has_rgb = ~np.isnan(rgbs).any(axis=1)
+        rgb_counts = np.bincount(groups, weights=has_rgb, minlength=n_groups)
+        rgb_sums = np.stack([
+            np.bincount(groups[has_rgb], weights=rgbs[has_rgb, channel], minlength=n_groups)
+            for channel in range(3)
+        ], axis=1)
+        record_counts = np.bincount(groups, minlength=n_groups)
+        intensity_sums = np.bincount(groups, weights=intensities, minlength=n_groups)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            avg_rgbs = np.trunc(rgb_sums / rgb_counts[:, None])
+        avg_intensities = np.clip(np.round(intensity_sums / record_counts), 1, 10).astype(np.int64)
+
+        valid = rgb_counts > 0
+        names = [""] * n_groups
+        valid_rows = np.flatnonzero(valid)
+        for row, name in zip(valid_rows.tolist(),
+                             EmotionBatchService.closest_palette_names(avg_rgbs[valid_rows], avg_intensities[valid_rows])):
+            names[row] = name
+
+        results = {}
+        for row, key in enumerate(keys):
+            if not valid[row]:
+                # 색 정보가 없으면 기본 로직으로 폴백 (단건과 동일)
+                results[key] = EmotionColorService._get_color_with_intensity("기쁨", 5)
+                continue
+            results[key] = EmotionColorService._representative_color(
+                tuple(int(v) for v in avg_rgbs[row]), int(avg_intensities[row]), int(rgb_counts[row]), names[row]
+            )
+        return results
@@ -1,5 +1,13 @@
-from typing import Dict, List, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Tuple
 import json
+from services import emotion_lexicon
+from services.color_lut import PaletteLUT
+
+# 키워드 매칭 수 → 감정 점수 (키워드당 0.3점을 차례로 더한 값과 같도록 미리 누적)
+_KEYWORD_SCORES = [0.0]
+for _ in range(max(len(keywords) for keywords in emotion_lexicon.LEXICON["color_scores"].values())):
+    _KEYWORD_SCORES.append(_KEYWORD_SCORES[-1] + 0.3)
 
 class EmotionColorService:
     """
@@ -97,11 +105,10 @@ class EmotionColorService:
         )
 
     @staticmethod
-    def _build_extended_palette(intensity: int) -> Dict[str, Dict]:
-        """플루치크 팔레트 확장: 8가지 기본 + 8가지 2차 감정(이웃 혼합)."""
-        intensity = max(1, min(10, intensity))
+    def _compute_extended_palette(intensity: int) -> Dict[str, Dict]:
+        """플루치크 팔레트 확장: 8가지 기본 + 8가지 2차 감정(이웃 혼합). (import 시 테이블 생성용)"""
         base = {
-            emotion: EmotionColorService._get_color_with_intensity(emotion, intensity)
+            emotion: EmotionColorService._compute_color_with_intensity(emotion, intensity)
             for emotion in EmotionColorService.WHEEL_ORDER
         }
 
@@ -126,8 +133,19 @@ class EmotionColorService:
 
         return palette
 
+    @staticmethod
+    def _build_extended_palette(intensity: int) -> Mapping[str, Mapping]:
+        """강도별 확장 팔레트 (미리 계산한 읽기 전용 테이블, 강도는 1~10으로 보정)"""
+        return _EXTENDED_PALETTES[max(1, min(10, intensity))]
+
     @staticmethod
     def _find_closest_from_palette(rgb: tuple, palette: Dict[str, Dict]) -> str:
+        # 미리 계산한 확장 팔레트면 양자화 룩업 테이블 사용
+        lut_entry = _PALETTE_LUTS.get(id(palette))
+        if lut_entry is not None and lut_entry[0] is palette and len(rgb) == 3:
+            names, lut = lut_entry[1], lut_entry[2]
+            return names[lut.nearest(rgb)]
+
         best_name = None
         best_dist = float("inf")
         for name, info in palette.items():
@@ -180,24 +198,9 @@ class EmotionColorService:
         텍스트에서 감정 키워드를 분석하여 점수 반환
         (실제로는 AI API로 대체 예정)
         """
-        emotion_keywords = {
-            "기쁨": ["기쁘", "행복", "즐거", "웃", "신나", "좋", "만족", "감사"],
-            "신뢰": ["믿", "안전", "안정", "확신", "신뢰", "의지"],
-            "두려움": ["무서", "겁", "불안", "걱정", "두려", "떨", "긴장"],
-            "놀람": ["놀라", "깜짝", "예상", "갑작", "충격", "놀람"],
-            "슬픔": ["슬프", "우울", "속상", "서럽", "눈물", "비통", "허전"],
-            "혐오": ["싫", "역겨", "불쾌", "짜증", "화나", "분노", "열받"],
-            "분노": ["화나", "열받", "짜증", "분노", "화", "열", "폭발"],
-            "기대": ["기대", "희망", "꿈", "미래", "계획", "준비", "새로운"]
-        }
-        
-        scores = {emotion: 0.0 for emotion in emotion_keywords.keys()}
-        
-        # 각 감정별 키워드 검색
-        for emotion, keywords in emotion_keywords.items():
-            for keyword in keywords:
-                if keyword in content:
-                    scores[emotion] += 0.3  # 키워드당 0.3점 추가
+        # 공용 사전(emotion_lexicon)의 컴파일된 매처로 본문을 한 번만 훑음
+        counts = emotion_lexicon.match(content).counts("color_scores")
+        scores = {emotion: _KEYWORD_SCORES[count] for emotion, count in counts.items()}
         
         # 최소 점수 보장
         if max(scores.values()) == 0:
@@ -206,8 +209,8 @@ class EmotionColorService:
         return scores
     
     @staticmethod
-    def _get_color_with_intensity(emotion: str, intensity: int) -> dict:
-        """감정과 강도에 따른 색상 정보 반환 (더 선명한 색상)"""
+    def _compute_color_with_intensity(emotion: str, intensity: int) -> dict:
+        """감정과 강도에 따른 색상 계산 (import 시 테이블 생성용)"""
         if emotion not in EmotionColorService.EMOTION_COLORS:
             emotion = "기쁨"  # 기본값
         base_color = EmotionColorService.EMOTION_COLORS[emotion]
@@ -242,6 +245,51 @@ class EmotionColorService:
             "intensity": intensity
         }
     
+    @staticmethod
+    def _get_color_with_intensity(emotion: str, intensity: int) -> dict:
+        """감정과 강도에 따른 색상 정보 반환 (미리 계산한 테이블의 복사본)
+        
+        1~10이 아닌 강도는 강도 5의 색을 쓰고 intensity 값은 받은 그대로 유지
+        """
+        if emotion not in EmotionColorService.EMOTION_COLORS:
+            emotion = "기쁨"  # 기본값
+        color = _INTENSITY_COLORS.get((emotion, intensity)) or _INTENSITY_COLORS[(emotion, 5)]
+        # 호출 측에서 name 등을 덮어쓰므로 복사본 반환 (5.0, True 같은 값도 그대로 기록)
+        return dict(color, intensity=intensity)
+    
+    @staticmethod
+    def _record_rgb(record: Dict):
+        """기록의 RGB (없거나 형식이 다르면 None)"""
+        rgb = tuple(record.get("color", {}).get("rgb", ()))
+        return rgb if len(rgb) == 3 else None
+
+    @staticmethod
+    def _record_intensity(record: Dict) -> int:
+        """기록의 강도 (색상 정보 → 기록 → 5 순, 정수로 바꿀 수 없으면 5)"""
+        intensity = record.get("color", {}).get("intensity", record.get("intensity", 5))
+        try:
+            return int(intensity)
+        except Exception:
+            return 5
+
+    @staticmethod
+    def _representative_color(avg_rgb: tuple, avg_intensity: int, count: int, closest_name: str = None) -> Dict:
+        """평균 RGB/강도 → 대표 감정색 (closest_name을 이미 구했으면 검색 생략)"""
+        avg_intensity = max(1, min(10, avg_intensity))
+        palette = EmotionColorService._build_extended_palette(avg_intensity)
+        chosen_name = closest_name or EmotionColorService._find_closest_from_palette(avg_rgb, palette)
+        chosen = palette[chosen_name]
+
+        return {
+            "name": chosen["name"],
+            "hex": chosen["hex"],
+            "rgb": chosen["rgb"],
+            "description": f"지난 {count}일간의 대표 감정색입니다.",
+            "period": count,
+            "closest_emotion": chosen_name,
+            "average_intensity": float(avg_intensity),
+        }
+
     @staticmethod
     def get_average_emotion_color(emotion_records: List[Dict]) -> Dict:
         """
@@ -249,13 +297,13 @@ class EmotionColorService:
         - 기록들의 평균 RGB를 계산
         - 평균 강도를 계산
         - 평균 강도로 생성한 확장 팔레트에서 평균 RGB와 가장 가까운 색을 선택
+        (여러 사용자를 한 번에 계산할 때는 EmotionBatchService.average_colors)
         """
         if not emotion_records:
             return EmotionColorService._get_color_with_intensity("기쁨", 5)
 
         # 평균 RGB
-        rgbs = [tuple(rec.get("color", {}).get("rgb", ())) for rec in emotion_records]
-        rgbs = [rgb for rgb in rgbs if isinstance(rgb, (list, tuple)) and len(rgb) == 3]
+        rgbs = [rgb for rgb in map(EmotionColorService._record_rgb, emotion_records) if rgb is not None]
         if not rgbs:
             # 색 정보가 없으면 기본 로직으로 폴백
             return EmotionColorService._get_color_with_intensity("기쁨", 5)
@@ -265,32 +313,12 @@ class EmotionColorService:
         count = len(rgbs)
         avg_rgb = (int(total_r / count), int(total_g / count), int(total_b / count))
 
-        # 평균 강도
-        intensities = []
-        for rec in emotion_records:
-            color = rec.get("color", {})
-            intensity = color.get("intensity", rec.get("intensity", 5))
-            try:
-                intensities.append(int(intensity))
-            except Exception:
-                intensities.append(5)
-        avg_intensity = int(round(sum(intensities) / len(intensities))) if intensities else 5
-        avg_intensity = max(1, min(10, avg_intensity))
+        # 평균 강도 (색 정보가 없는 기록도 포함)
+        intensities = [EmotionColorService._record_intensity(rec) for rec in emotion_records]
+        avg_intensity = int(round(sum(intensities) / len(intensities)))
 
         # 확장 팔레트에서 가장 가까운 색 선택
-        palette = EmotionColorService._build_extended_palette(avg_intensity)
-        chosen_name = EmotionColorService._find_closest_from_palette(avg_rgb, palette)
-        chosen = palette[chosen_name]
-
-        return {
-            "name": chosen["name"],
-            "hex": chosen["hex"],
-            "rgb": chosen["rgb"],
-            "description": f"지난 {count}일간의 대표 감정색입니다.",
-            "period": count,
-            "closest_emotion": chosen_name,
-            "average_intensity": float(avg_intensity),
-        }
+        return EmotionColorService._representative_color(avg_rgb, avg_intensity, count)
     
     @staticmethod
     def _generate_average_color_name(rgb: Tuple[int, int, int], emotion: str, intensity: float) -> str:
@@ -336,6 +364,9 @@ class EmotionColorService:
     @staticmethod
     def _find_closest_emotion(rgb: Tuple[int, int, int]) -> str:
         """RGB 값과 가장 가까운 감정 찾기"""
+        if len(rgb) == 3:
+            return _EMOTION_NAMES[_EMOTION_LUT.nearest(rgb)]
+        
         min_distance = float('inf')
         closest_emotion = "기쁨"
         
@@ -345,4 +376,34 @@ class EmotionColorService:
                 min_distance = distance
                 closest_emotion = emotion
         
-        return closest_emotion 
\ No newline at end of file
+        return closest_emotion
+
+
+# ----- import 시 한 번만 계산하는 색상 테이블 (읽기 전용) -----
+# (감정, 강도 1~10) → 색상 정보
+_INTENSITY_COLORS: Mapping[Tuple[str, int], Mapping] = MappingProxyType({
+    (emotion, intensity): MappingProxyType(EmotionColorService._compute_color_with_intensity(emotion, intensity))
+    for emotion in EmotionColorService.EMOTION_COLORS
+    for intensity in EmotionColorService.INTENSITY_MODIFIERS
+})
+
+# 강도 1~10 → 확장 팔레트(기본 8 + 2차 감정 8)
+_EXTENDED_PALETTES: Mapping[int, Mapping[str, Mapping]] = MappingProxyType({
+    intensity: MappingProxyType({
+        name: MappingProxyType(info)
+        for name, info in EmotionColorService._compute_extended_palette(intensity).items()
+    })
+    for intensity in EmotionColorService.INTENSITY_MODIFIERS
+})
+
+# 최근접 색 검색용 룩업 테이블: 강도 → (항목 이름 목록, LUT), id(팔레트) → (팔레트, 이름 목록, LUT)
+_INTENSITY_LUTS = {
+    intensity: (list(palette.keys()), PaletteLUT([info["rgb"] for info in palette.values()]))
+    for intensity, palette in _EXTENDED_PALETTES.items()
+}
+_PALETTE_LUTS = {
+    id(palette): (palette,) + _INTENSITY_LUTS[intensity]
+    for intensity, palette in _EXTENDED_PALETTES.items()
+}
+_EMOTION_NAMES = list(EmotionColorService.EMOTION_COLORS.keys())
+_EMOTION_LUT = PaletteLUT([info["rgb"] for info in EmotionColorService.EMOTION_COLORS.values()])
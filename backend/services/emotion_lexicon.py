@@ -0,0 +1,163 @@
+"""
+키워드 기반 감정 분석 공용 사전 + 다중 패턴 매처
+- AI 호출이 실패했을 때 쓰는 폴백 분석들이 같은 사전을 공유
+  (EmotionColorService._analyze_emotion_keywords, AIAnalysisService.analyze_emotion_fallback,
+   AIAnalysisService._extract_keywords_fallback, RecordService._extract_keywords)
+- 모든 키워드를 모듈 import 시 Aho-Corasick 오토마톤 하나로 컴파일하여
+  본문을 한 번만 훑고 매칭된 키워드 집합을 얻는다
+- 그룹별 결과(감정별 매칭 수/키워드)는 사전에 적힌 순서를 그대로 유지
+"""
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+# 그룹 이름 → {분류: 키워드 목록} (분류 순서와 키워드 순서가 결과 순서)
+LEXICON: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    # EmotionColorService._analyze_emotion_keywords: 감정별 점수 (키워드당 0.3점)
+    "color_scores": {
+        "기쁨": ("기쁘", "행복", "즐거", "웃", "신나", "좋", "만족", "감사"),
+        "신뢰": ("믿", "안전", "안정", "확신", "신뢰", "의지"),
+        "두려움": ("무서", "겁", "불안", "걱정", "두려", "떨", "긴장"),
+        "놀람": ("놀라", "깜짝", "예상", "갑작", "충격", "놀람"),
+        "슬픔": ("슬프", "우울", "속상", "서럽", "눈물", "비통", "허전"),
+        "혐오": ("싫", "역겨", "불쾌", "짜증", "화나", "분노", "열받"),
+        "분노": ("화나", "열받", "짜증", "분노", "화", "열", "폭발"),
+        "기대": ("기대", "희망", "꿈", "미래", "계획", "준비", "새로운"),
+    },
+    # AIAnalysisService.analyze_emotion_fallback: 부정/긍정 점수
+    "polarity": {
+        "negative": (
+            '힘들', '어렵', '스트레스', '피곤', '지치', '불안', '걱정', '우울', '슬픔',
+            '화나', '짜증', '답답', '절망', '무기력', '의미없', '싫', '혐오', '두려움',
+            '무섭', '놀람', '충격', '실망', '후회', '미안', '죄송', '부끄러', '창피',
+            '죽고싶', '자살', '끝내', '그만', '싫어', '힘들어', '지쳐', '피곤해'
+        ),
+        "positive": (
+            '기쁘', '행복', '즐겁', '신나', '좋', '만족', '감사', '희망', '기대',
+            '설렘', '신뢰', '안전', '편안', '평온', '차분', '여유', '성취', '성공',
+            '자랑', '뿌듯', '감동', '감탄', '놀라', '신기', '재미', '웃음'
+        ),
+    },
+    # 부정 우세일 때 세부 감정 (위에서부터 먼저 매칭되는 감정, 없으면 슬픔)
+    "negative_subtypes": {
+        "슬픔": ('힘들', '지치', '피곤', '무기력', '절망', '죽고싶'),
+        "분노": ('화나', '짜증', '답답'),
+        "두려움": ('불안', '걱정', '두려움', '무섭'),
+        "놀람": ('놀람', '충격', '신기'),
+    },
+    # AIAnalysisService._extract_keywords_fallback: 감정별 대표 키워드 (감정당 첫 매칭 1개)
+    "fallback_keywords": {
+        '기쁨': ('기쁨', '행복', '즐거움', '신남', '좋음', '만족', '감사', '희망', '기대'),
+        '슬픔': ('슬픔', '우울', '힘듦', '지침', '피곤', '무기력', '절망', '실망'),
+        '분노': ('분노', '화남', '짜증', '답답', '열받음', '화가남'),
+        '두려움': ('두려움', '불안', '걱정', '무섭', '긴장', '스트레스'),
+        '놀람': ('놀람', '충격', '예상외', '신기', '놀라움'),
+        '신뢰': ('신뢰', '안전', '편안', '평온', '차분', '여유'),
+        '혐오': ('혐오', '싫음', '불쾌', '역겨움'),
+        '기대': ('기대', '설렘', '희망', '미래', '꿈'),
+    },
+    # RecordService._extract_keywords: 본문에 그대로 나온 감정 단어
+    "record_keywords": {
+        "all": (
+            '기쁨', '신뢰', '두려움', '놀람', '슬픔', '혐오', '분노', '기대',
+            '행복', '안전', '불안', '예상', '우울', '짜증', '화남', '희망'
+        ),
+    },
+}
+
+
+class KeywordMatcher:
+    """Aho-Corasick 다중 패턴 매처 (본문을 한 번 훑어 등장한 패턴 집합 반환)"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = sorted({p for p in patterns if p})
+        # 상태별 전이, 실패 링크, 해당 상태에서 끝나는 패턴 id
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        outputs: List[Set[int]] = [set()]
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append(set())
+                state = nxt
+            outputs[state].add(pattern_id)
+
+        # BFS로 실패 링크 계산, 실패 상태의 출력도 합침
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(char, 0)
+                outputs[nxt] |= outputs[self._fail[nxt]]
+        self._out = [tuple(sorted(o)) for o in outputs]
+
+    def find(self, text: str) -> Set[str]:
+        """text에 부분 문자열로 등장하는 패턴 집합"""
+        return {self.patterns[i] for i in self.find_ids(text)}
+
+    def find_ids(self, text: str) -> Set[int]:
+        """text에 등장하는 패턴 id(self.patterns 인덱스) 집합"""
+        goto, fail, out = self._goto, self._fail, self._out
+        found_ids: Set[int] = set()
+        state = 0
+        for char in text or "":
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found_ids.update(out[state])
+        return found_ids
+
+
+class LexiconMatch:
+    """한 본문에 대한 매칭 결과 (그룹별 조회)"""
+
+    __slots__ = ("found",)
+
+    def __init__(self, found: Set[str]):
+        self.found = found
+
+    def hits(self, group: str) -> Dict[str, List[str]]:
+        """분류별 매칭 키워드 (사전 순서 유지)"""
+        return {
+            label: [k for k in keywords if k in self.found]
+            for label, keywords in LEXICON[group].items()
+        }
+
+    def counts(self, group: str) -> Dict[str, int]:
+        """분류별 매칭 키워드 수"""
+        return {
+            label: sum(1 for k in keywords if k in self.found)
+            for label, keywords in LEXICON[group].items()
+        }
+
+    def first_label(self, group: str, default: str) -> str:
+        """키워드가 하나라도 매칭된 첫 분류 (없으면 default)"""
+        for label, keywords in LEXICON[group].items():
+            if any(k in self.found for k in keywords):
+                return label
+        return default
+
+
+# import 시 한 번만 컴파일
+MATCHER = KeywordMatcher(
+    keyword
+    for groups in LEXICON.values()
+    for keywords in groups.values()
+    for keyword in keywords
+)
+
+
+def match(text: str) -> LexiconMatch:
+    return LexiconMatch(MATCHER.find(text))
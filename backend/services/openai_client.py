@@ -0,0 +1,215 @@
+"""
+공유 OpenAI 클라이언트
+- 프로세스당 하나의 클라이언트를 지연 생성하여 모든 호출에서 재사용 (keep-alive 커넥션 풀)
+- 비동기 클라이언트는 이벤트 루프별로 하나씩 생성하여 재사용
+- 연결/읽기 타임아웃, 최대 커넥션 수, 재시도 횟수는 환경 변수로 설정
+- 커넥션 재사용 여부를 확인할 수 있는 카운터 제공
+"""
+import os
+import asyncio
+import threading
+import contextvars
+import concurrent.futures
+import weakref
+from typing import Dict, Optional
+
+import httpx
+from openai import OpenAI, AsyncOpenAI
+from dotenv import load_dotenv
+
+# 환경 변수 로딩
+load_dotenv(dotenv_path=".env")
+
+# 클라이언트 설정 (환경 변수로 조정 가능)
+OPENAI_CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5"))
+OPENAI_READ_TIMEOUT = float(os.getenv("OPENAI_READ_TIMEOUT", "30"))
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "10"))
+OPENAI_KEEPALIVE_EXPIRY = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "60"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+# 로컬 모의 서버(mock_ai_server.py) 등으로 보낼 때 설정, 비어 있으면 OpenAI 기본 주소
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+
+_client: Optional[OpenAI] = None
+_client_lock = threading.Lock()
+
+# 이벤트 루프별 비동기 클라이언트 (httpx.AsyncClient 커넥션은 루프에 묶임)
+_async_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+# 동기 코드에서 코루틴을 실행할 때 쓰는 공용 백그라운드 이벤트 루프
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+_stats_lock = threading.Lock()
+_stats = {
+    "clients_created": 0,
+    "requests": 0,
+    "connections_opened": 0,
+    "tls_handshakes": 0,
+}
+
+
+def _count(key: str) -> None:
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def _trace_connection(event_name: str, info: Dict) -> None:
+    """httpcore trace 콜백: 새 TCP 연결/TLS 핸드셰이크 발생 시 카운트"""
+    if event_name == "connection.connect_tcp.complete":
+        _count("connections_opened")
+    elif event_name == "connection.start_tls.complete":
+        _count("tls_handshakes")
+
+
+async def _atrace_connection(event_name: str, info: Dict) -> None:
+    _trace_connection(event_name, info)
+
+
+def _on_request(request: httpx.Request) -> None:
+    _count("requests")
+    request.extensions["trace"] = _trace_connection
+
+
+async def _on_async_request(request: httpx.Request) -> None:
+    _count("requests")
+    request.extensions["trace"] = _atrace_connection
+
+
+def _build_timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        OPENAI_READ_TIMEOUT,
+        connect=OPENAI_CONNECT_TIMEOUT,
+        read=OPENAI_READ_TIMEOUT,
+    )
+
+
+def _build_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY,
+    )
+
+
+def get_openai_client() -> Optional[OpenAI]:
+    """프로세스 공용 OpenAI 클라이언트 반환 (API 키가 없으면 None)"""
+    global _client
+    if _client is not None:
+        return _client
+
+    with _client_lock:
+        if _client is None:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                return None
+            http_client = httpx.Client(
+                timeout=_build_timeout(),
+                limits=_build_limits(),
+                event_hooks={"request": [_on_request]},
+            )
+            _client = OpenAI(
+                api_key=api_key,
+                base_url=OPENAI_BASE_URL,
+                http_client=http_client,
+                timeout=_build_timeout(),
+                max_retries=OPENAI_MAX_RETRIES,
+            )
+            _count("clients_created")
+    return _client
+
+
+def get_async_openai_client() -> Optional[AsyncOpenAI]:
+    """현재 이벤트 루프 공용 AsyncOpenAI 클라이언트 반환 (API 키가 없으면 None)"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is not None:
+        return client
+
+    with _client_lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                return None
+            http_client = httpx.AsyncClient(
+                timeout=_build_timeout(),
+                limits=_build_limits(),
+                event_hooks={"request": [_on_async_request]},
+            )
+            client = AsyncOpenAI(
+                api_key=api_key,
+                base_url=OPENAI_BASE_URL,
+                http_client=http_client,
+                timeout=_build_timeout(),
+                max_retries=OPENAI_MAX_RETRIES,
+            )
+            _async_clients[loop] = client
+            _count("clients_created")
+    return client
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            _background_loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=_background_loop.run_forever,
+                name="openai-async-loop",
+                daemon=True,
+            )
+            thread.start()
+    return _background_loop
+
+
+def run_coroutine_sync(coro, timeout: Optional[float] = None):
+    """동기 코드에서 코루틴 실행
+    
+    매번 새 루프를 만들면 비동기 커넥션 풀을 재사용할 수 없으므로
+    공용 백그라운드 루프에 제출하고 결과를 기다린다.
+    호출 스레드의 contextvars(요청 마감 시간 등)를 태스크에 그대로 넘긴다.
+    """
+    loop = _get_background_loop()
+    context = contextvars.copy_context()
+    future: concurrent.futures.Future = concurrent.futures.Future()
+    task_holder = []
+    
+    def _copy_result(task: asyncio.Task) -> None:
+        if task.cancelled():
+            future.cancel()
+        elif task.exception() is not None:
+            future.set_exception(task.exception())
+        else:
+            future.set_result(task.result())
+    
+    def _start() -> None:
+        task = context.run(loop.create_task, coro)
+        task.add_done_callback(_copy_result)
+        task_holder.append(task)
+    
+    loop.call_soon_threadsafe(_start)
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+        loop.call_soon_threadsafe(lambda: task_holder and task_holder[0].cancel())
+        raise
+
+
+def get_connection_stats() -> Dict:
+    """커넥션 재사용 카운터 (requests - connections_opened = 재사용된 요청 수)"""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["connections_reused"] = max(0, stats["requests"] - stats["connections_opened"])
+    stats["reuse_ratio"] = (
+        round(stats["connections_reused"] / stats["requests"], 3) if stats["requests"] else 0.0
+    )
+    stats["config"] = {
+        "connect_timeout": OPENAI_CONNECT_TIMEOUT,
+        "read_timeout": OPENAI_READ_TIMEOUT,
+        "max_connections": OPENAI_MAX_CONNECTIONS,
+        "max_keepalive_connections": OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+        "max_retries": OPENAI_MAX_RETRIES,
+        "base_url": OPENAI_BASE_URL,
+    }
+    return stats
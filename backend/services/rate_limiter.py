@@ -0,0 +1,242 @@
+"""
+OpenAI 호출 속도 제한 (분당 요청 수 RPM / 분당 토큰 수 TPM 토큰 버킷 + 우선순위 대기열)
+- 우선순위: interactive(기록 작성/미리보기) > background(일괄 재분석 등) > cosmetic(평균 색 이름 등 부가 기능)
+- 낮은 우선순위는 버킷에 일정 비율(reserve) 이상 여유가 있을 때만 사용 → 한도 근처에서는 먼저 밀려남
+- 대기열은 우선순위 → 도착 순으로 처리하고, 가득 차면 가장 낮은 우선순위 대기자부터 포기(shed)
+- cosmetic은 기다리지 않고 바로 포기, background는 길게 대기(지연 처리), interactive는 요청 마감 시간까지 대기
+- 한도는 프로세스 단위이므로 워커가 여러 개면 계정 한도를 워커 수로 나눠 설정
+"""
+import os
+import time
+import asyncio
+import heapq
+import itertools
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+from dotenv import load_dotenv
+
+from services.deadline import remaining_time
+
+# 환경 변수 로딩
+load_dotenv(dotenv_path=".env")
+
+OPENAI_RPM_LIMIT = float(os.getenv("OPENAI_RPM_LIMIT", "500"))
+OPENAI_TPM_LIMIT = float(os.getenv("OPENAI_TPM_LIMIT", "200000"))
+RATE_LIMIT_QUEUE_SIZE = int(os.getenv("RATE_LIMIT_QUEUE_SIZE", "100"))
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+COSMETIC = "cosmetic"
+
+# 우선순위별 설정: 순위(작을수록 먼저), 사용 후 남아 있어야 하는 버킷 비율, 최대 대기 시간(초)
+PRIORITIES = {
+    INTERACTIVE: {"rank": 0, "reserve": 0.0, "max_wait": float(os.getenv("RATE_LIMIT_INTERACTIVE_MAX_WAIT", "10"))},
+    BACKGROUND: {"rank": 1, "reserve": 0.2, "max_wait": float(os.getenv("RATE_LIMIT_BACKGROUND_MAX_WAIT", "60"))},
+    COSMETIC: {"rank": 2, "reserve": 0.5, "max_wait": float(os.getenv("RATE_LIMIT_COSMETIC_MAX_WAIT", "0"))},
+}
+
+_priority: contextvars.ContextVar[str] = contextvars.ContextVar("simlog_llm_priority", default=INTERACTIVE)
+
+
+class RateLimitShed(Exception):
+    """속도 제한으로 호출을 포기함 (호출 측은 폴백 사용)"""
+
+
+@contextmanager
+def llm_priority(priority: str):
+    """with 블록 안의 OpenAI 호출 우선순위 지정"""
+    if priority not in PRIORITIES:
+        raise ValueError(f"unknown priority: {priority}")
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+class _Ticket:
+    __slots__ = ("rank", "seq", "priority", "tokens", "shed")
+
+    def __init__(self, rank: int, seq: int, priority: str, tokens: int):
+        self.rank = rank
+        self.seq = seq
+        self.priority = priority
+        self.tokens = tokens
+        self.shed = False
+
+    def __lt__(self, other: "_Ticket") -> bool:
+        return (self.rank, self.seq) < (other.rank, other.seq)
+
+
+class RateLimiter:
+    """RPM/TPM 토큰 버킷 + 우선순위 대기열 (스레드/이벤트 루프 공용)"""
+
+    def __init__(self, rpm: float = OPENAI_RPM_LIMIT, tpm: float = OPENAI_TPM_LIMIT,
+                 queue_size: int = RATE_LIMIT_QUEUE_SIZE,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.queue_size = queue_size
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._requests = rpm
+        self._tokens = tpm
+        self._refilled_at = clock()
+        self._waiting: list = []  # _Ticket 힙
+        self._seq = itertools.count()
+        self._stats = {
+            name: {"granted": 0, "waited": 0, "shed": 0, "wait_seconds": 0.0}
+            for name in PRIORITIES
+        }
+
+    # ----- 버킷 (lock 안에서 호출) -----
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    def _wait_needed(self, priority: str, tokens: int) -> float:
+        """지금 사용 가능하면 0, 아니면 여유가 생길 때까지 예상 시간(초)"""
+        reserve = PRIORITIES[priority]["reserve"]
+        need_requests = 1 + reserve * self.rpm
+        need_tokens = min(tokens, self.tpm) + reserve * self.tpm
+        wait = 0.0
+        if self._requests < need_requests:
+            wait = max(wait, (need_requests - self._requests) * 60 / self.rpm)
+        if self._tokens < need_tokens:
+            wait = max(wait, (need_tokens - self._tokens) * 60 / self.tpm)
+        return wait
+
+    def _pop_stale(self) -> None:
+        while self._waiting and self._waiting[0].shed:
+            heapq.heappop(self._waiting)
+
+    def _enqueue(self, ticket: _Ticket) -> None:
+        """대기열에 추가 (가득 차면 가장 낮은 우선순위 대기자를 포기시키거나 자신이 포기)"""
+        active = [t for t in self._waiting if not t.shed]
+        if len(active) >= self.queue_size:
+            worst = max(active)
+            if ticket < worst:
+                worst.shed = True
+            else:
+                raise RateLimitShed(f"{ticket.priority}: 대기열이 가득 찼습니다")
+        heapq.heappush(self._waiting, ticket)
+
+    def _try_acquire(self, ticket: _Ticket) -> float:
+        """획득하면 0, 아니면 다시 시도할 때까지 기다릴 시간"""
+        self._refill()
+        self._pop_stale()
+        if ticket.shed:
+            raise RateLimitShed(f"{ticket.priority}: 더 높은 우선순위 요청에 밀렸습니다")
+        if self._waiting and self._waiting[0] is not ticket:
+            # 앞 순서 대기자가 먼저
+            return 0.05
+        wait = self._wait_needed(ticket.priority, ticket.tokens)
+        if wait > 0:
+            return wait
+        self._requests -= 1
+        self._tokens -= ticket.tokens
+        if self._waiting and self._waiting[0] is ticket:
+            heapq.heappop(self._waiting)
+        return 0.0
+
+    def _start(self, tokens: int, priority: Optional[str]):
+        priority = priority or current_priority()
+        max_wait = PRIORITIES[priority]["max_wait"]
+        if priority == INTERACTIVE:
+            max_wait = remaining_time(max_wait)
+        ticket = _Ticket(PRIORITIES[priority]["rank"], next(self._seq), priority, tokens)
+        with self._lock:
+            wait = self._try_acquire(ticket)
+            if wait == 0:
+                self._stats[priority]["granted"] += 1
+                return ticket, None
+            if max_wait is None or max_wait <= 0 or wait > max_wait:
+                self._stats[priority]["shed"] += 1
+                raise RateLimitShed(f"{priority}: 속도 제한 (예상 대기 {wait:.1f}초)")
+            self._enqueue(ticket)
+        return ticket, self._clock() + max_wait
+
+    def _poll(self, ticket: _Ticket, give_up_at: float, started: float) -> float:
+        with self._lock:
+            try:
+                wait = self._try_acquire(ticket)
+            except RateLimitShed:
+                self._stats[ticket.priority]["shed"] += 1
+                raise
+            if wait == 0:
+                stats = self._stats[ticket.priority]
+                stats["granted"] += 1
+                stats["waited"] += 1
+                stats["wait_seconds"] += self._clock() - started
+                return 0.0
+            if self._clock() + min(wait, 0.25) > give_up_at:
+                ticket.shed = True
+                self._pop_stale()
+                self._stats[ticket.priority]["shed"] += 1
+                raise RateLimitShed(f"{ticket.priority}: 대기 시간 초과")
+        return min(wait, 0.25)
+
+    # ----- 공개 API -----
+    def acquire(self, tokens: int, priority: Optional[str] = None) -> None:
+        """요청 1개 + tokens개를 사용 (필요하면 대기, 포기하면 RateLimitShed)"""
+        ticket, give_up_at = self._start(tokens, priority)
+        if give_up_at is None:
+            return
+        started = self._clock()
+        while True:
+            sleep = self._poll(ticket, give_up_at, started)
+            if sleep == 0:
+                return
+            self._sleep(sleep)
+
+    async def acquire_async(self, tokens: int, priority: Optional[str] = None) -> None:
+        ticket, give_up_at = self._start(tokens, priority)
+        if give_up_at is None:
+            return
+        started = self._clock()
+        try:
+            while True:
+                sleep = self._poll(ticket, give_up_at, started)
+                if sleep == 0:
+                    return
+                await asyncio.sleep(sleep)
+        except asyncio.CancelledError:
+            with self._lock:
+                ticket.shed = True
+                self._pop_stale()
+            raise
+
+    def settle(self, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        """응답의 실제 사용량으로 토큰 버킷 보정 (추정치와의 차이만큼 환급/차감)"""
+        if actual_tokens is None:
+            return
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.tpm, self._tokens + estimated_tokens - actual_tokens)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            self._refill()
+            return {
+                "available_requests": round(self._requests, 1),
+                "available_tokens": round(self._tokens),
+                "waiting": sum(1 for t in self._waiting if not t.shed),
+                "priorities": {name: dict(values, wait_seconds=round(values["wait_seconds"], 3))
+                               for name, values in self._stats.items()},
+                "config": {"rpm": self.rpm, "tpm": self.tpm, "queue_size": self.queue_size},
+            }
+
+
+# 프로세스 공용 OpenAI 속도 제한
+openai_rate_limiter = RateLimiter()
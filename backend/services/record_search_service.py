@@ -0,0 +1,279 @@
+"""
+내 기록 검색 (본문, 한 줄 요약, 키워드)
+- MySQL: records의 FULLTEXT(ngram) 인덱스 ft_records_search로 MATCH ... AGAINST (자연어 모드, 관련도 순)
+- 그 외(SQLite/테스트) 또는 FULLTEXT 인덱스가 없을 때(MySQL 1191): 사용자별 메모리 역색인(문자 bigram, BM25 점수)
+  그 밖의 MATCH 오류는 해당 요청만 메모리 역색인으로 처리
+  역색인은 사용자 단위로 만들어 캐시하고, ORM으로 기록이 저장/삭제되면 그 사용자 캐시를 비움
+  (다른 프로세스의 변경/일괄 UPDATE는 RECORD_SEARCH_INDEX_TTL이 지나면 반영)
+- 결과마다 검색어가 들어간 본문 일부(snippet)와 그 안의 강조 구간(highlights, [시작, 끝) 오프셋)을 돌려줌
+"""
+import os
+import re
+import math
+import time
+import logging
+import threading
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Session
+
+from models.record import Record
+
+# 환경 변수 로딩
+load_dotenv(dotenv_path=".env")
+
+# 메모리 역색인 캐시 유지 시간(초)
+RECORD_SEARCH_INDEX_TTL = float(os.getenv("RECORD_SEARCH_INDEX_TTL", "300"))
+# 캐시할 사용자 역색인 최대 개수
+RECORD_SEARCH_INDEX_MAX_USERS = int(os.getenv("RECORD_SEARCH_INDEX_MAX_USERS", "200"))
+# 스니펫 길이(글자 수)
+RECORD_SEARCH_SNIPPET_CHARS = int(os.getenv("RECORD_SEARCH_SNIPPET_CHARS", "80"))
+
+# MySQL "Can't find FULLTEXT index matching the column list"
+MYSQL_ER_FT_MATCHING_KEY_NOT_FOUND = 1191
+
+# 필드별 가중치 (요약/키워드에 나온 단어가 본문보다 중요)
+FIELD_WEIGHTS = (("content", 1.0), ("ai_summary", 1.5), ("keywords_text", 2.0))
+# BM25 파라미터
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def _words(text: Optional[str]) -> List[str]:
+    return _WORD_PATTERN.findall(text.lower()) if text else []
+
+
+def _tokens(text: Optional[str]) -> List[str]:
+    """MySQL ngram 파서(ngram_token_size=2)와 같은 방식의 토큰: 단어별 글자 bigram (한 글자 단어는 그대로)"""
+    tokens = []
+    for word in _words(text):
+        if len(word) < 2:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class _UserIndex:
+    """한 사용자의 기록 역색인"""
+
+    def __init__(self, rows: Sequence[Tuple]):
+        self.postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self.lengths: Dict[int, float] = {}
+        self.meta: Dict[int, Tuple] = {}
+        for record_id, content, ai_summary, keywords, created_at, record_date, emotion_primary in rows:
+            fields = {"content": content, "ai_summary": ai_summary, "keywords_text": keywords}
+            length = 0.0
+            for name, weight in FIELD_WEIGHTS:
+                for token in _tokens(fields[name]):
+                    postings = self.postings[token]
+                    postings[record_id] = postings.get(record_id, 0.0) + weight
+                    length += weight
+            self.lengths[record_id] = length
+            self.meta[record_id] = (created_at, record_date, emotion_primary)
+        self.average_length = (sum(self.lengths.values()) / len(self.lengths)) if self.lengths else 0.0
+
+    def score(self, query: str) -> Dict[int, float]:
+        """BM25 점수 {record_id: score} (검색어 토큰이 하나라도 있는 기록만)"""
+        count = len(self.lengths)
+        scores: Dict[int, float] = defaultdict(float)
+        for token in set(_tokens(query)):
+            postings = self.postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for record_id, tf in postings.items():
+                norm = 1 - BM25_B + BM25_B * self.lengths[record_id] / (self.average_length or 1.0)
+                scores[record_id] += idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+        return scores
+
+
+# user_id → (만든 시각, 역색인)
+_indexes: Dict[int, Tuple[float, _UserIndex]] = {}
+_indexes_lock = threading.Lock()
+# FULLTEXT 인덱스가 없어(1191) MATCH가 실패한 적이 있으면 False (프로세스 동안 메모리 역색인 사용)
+_fulltext_available = True
+
+
+@event.listens_for(Record, "after_insert")
+@event.listens_for(Record, "after_update")
+@event.listens_for(Record, "after_delete")
+def _invalidate_on_change(mapper, connection, target: Record) -> None:
+    RecordSearchService.invalidate(target.user_id)
+
+
+class RecordSearchService:
+
+    @staticmethod
+    def invalidate(user_id: Optional[int]) -> None:
+        """사용자 역색인 캐시 삭제"""
+        with _indexes_lock:
+            _indexes.pop(user_id, None)
+
+    @staticmethod
+    def _user_index(db: Session, user_id: int) -> _UserIndex:
+        now = time.monotonic()
+        with _indexes_lock:
+            cached = _indexes.get(user_id)
+            if cached and now - cached[0] < RECORD_SEARCH_INDEX_TTL:
+                return cached[1]
+
+        rows = db.query(
+            Record.id, Record.content, Record.ai_summary, Record.keywords_text,
+            Record.created_at, Record.record_date, Record.emotion_primary
+        ).filter(Record.user_id == user_id).all()
+        index = _UserIndex(rows)
+
+        with _indexes_lock:
+            if len(_indexes) >= RECORD_SEARCH_INDEX_MAX_USERS:
+                # 가장 오래된 캐시부터 제거
+                oldest = min(_indexes, key=lambda uid: _indexes[uid][0])
+                _indexes.pop(oldest, None)
+            _indexes[user_id] = (now, index)
+        return index
+
+    @staticmethod
+    def _search_fulltext(db: Session, user_id: int, query: str, emotion: Optional[str],
+                         start_date: Optional[date], end_date: Optional[date], limit: int) -> List[Tuple[int, float]]:
+        """MySQL FULLTEXT 검색 → [(record_id, score)] (관련도 순)"""
+        score = match(Record.content, Record.ai_summary, Record.keywords_text, against=query).in_natural_language_mode()
+        sql = db.query(Record.id, score.label("score")).filter(Record.user_id == user_id, score > 0)
+        if emotion:
+            sql = sql.filter(Record.emotion_primary == emotion)
+        if start_date:
+            sql = sql.filter(Record.record_date >= start_date)
+        if end_date:
+            sql = sql.filter(Record.record_date <= end_date)
+        rows = sql.order_by(score.desc(), Record.created_at.desc()).limit(limit).all()
+        return [(record_id, float(value)) for record_id, value in rows]
+
+    @staticmethod
+    def _is_missing_fulltext_index(error: Exception) -> bool:
+        """MATCH 실패 원인이 FULLTEXT 인덱스 없음(1191)인지"""
+        if not isinstance(error, DBAPIError):
+            return False
+        args = getattr(error.orig, "args", None) or (None,)
+        return args[0] == MYSQL_ER_FT_MATCHING_KEY_NOT_FOUND
+
+    @staticmethod
+    def _search_index(db: Session, user_id: int, query: str, emotion: Optional[str],
+                      start_date: Optional[date], end_date: Optional[date], limit: int) -> List[Tuple[int, float]]:
+        """메모리 역색인 검색 → [(record_id, score)] (점수 순, 같으면 최신순)"""
+        index = RecordSearchService._user_index(db, user_id)
+        results = []
+        for record_id, value in index.score(query).items():
+            created_at, record_date, emotion_primary = index.meta[record_id]
+            if emotion and emotion_primary != emotion:
+                continue
+            if start_date and (record_date is None or record_date < start_date):
+                continue
+            if end_date and (record_date is None or record_date > end_date):
+                continue
+            results.append((record_id, value, created_at))
+        results.sort(key=lambda item: (item[1], item[2].timestamp() if item[2] else 0.0, item[0]), reverse=True)
+        return [(record_id, value) for record_id, value, _ in results[:limit]]
+
+    @staticmethod
+    def snippet(text: Optional[str], query: str, size: int = RECORD_SEARCH_SNIPPET_CHARS) -> Tuple[str, List[List[int]]]:
+        """검색어가 처음 나오는 곳 주변 size 글자와 그 안의 강조 구간 목록"""
+        if not text:
+            return "", []
+        lowered = text.lower()
+        # 단어 전체 일치를 먼저 찾고, 없으면 bigram 일치 (ngram 검색은 단어 일부만 맞아도 결과에 포함)
+        spans = RecordSearchService._find_spans(lowered, sorted(set(_words(query))))
+        if not spans:
+            spans = RecordSearchService._find_spans(lowered, sorted(set(_tokens(query))))
+        if not spans:
+            return (text[:size] + ("…" if len(text) > size else "")), []
+
+        first = spans[0][0]
+        start = max(0, min(first - size // 3, len(text) - size))
+        end = min(len(text), start + size)
+        prefix = "…" if start > 0 else ""
+        suffix = "…" if end < len(text) else ""
+        highlights = [
+            [max(s, start) - start + len(prefix), min(e, end) - start + len(prefix)]
+            for s, e in spans if s < end and e > start
+        ]
+        return prefix + text[start:end] + suffix, highlights
+
+    @staticmethod
+    def _find_spans(lowered: str, terms: Sequence[str]) -> List[List[int]]:
+        """terms가 나오는 [시작, 끝) 구간 (겹치면 합침, 시작 위치 순)"""
+        spans = []
+        for term in terms:
+            position = lowered.find(term)
+            while term and position >= 0:
+                spans.append([position, position + len(term)])
+                position = lowered.find(term, position + 1)
+        spans.sort()
+        merged: List[List[int]] = []
+        for span in spans:
+            if merged and span[0] <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], span[1])
+            else:
+                merged.append(span)
+        return merged
+
+    @staticmethod
+    def search(db: Session, user_id: int, query: str, emotion: Optional[str] = None,
+               start_date: Optional[date] = None, end_date: Optional[date] = None, limit: int = 20) -> List[Dict]:
+        """내 기록 검색 (관련도 순) - 기록 요약 정보 + score, snippet, highlights"""
+        global _fulltext_available
+        query = (query or "").strip()
+        if not _tokens(query):
+            return []
+
+        hits = None
+        if _fulltext_available and db.bind.dialect.name == "mysql":
+            try:
+                # 실패한 MATCH 문만 세이브포인트로 되돌리고 같은 세션에서 메모리 역색인 조회
+                with db.begin_nested():
+                    hits = RecordSearchService._search_fulltext(db, user_id, query, emotion, start_date, end_date, limit)
+            except Exception as e:
+                if RecordSearchService._is_missing_fulltext_index(e):
+                    _fulltext_available = False
+                    logging.warning(f"FULLTEXT 인덱스 없음, 메모리 역색인으로 전환: {e}")
+                else:
+                    logging.warning(f"FULLTEXT 검색 실패, 이번 요청만 메모리 역색인 사용: {e}")
+        if hits is None:
+            hits = RecordSearchService._search_index(db, user_id, query, emotion, start_date, end_date, limit)
+        if not hits:
+            return []
+
+        # 결과 기록만 본문 포함해서 조회
+        rows = {
+            row.id: row for row in db.query(
+                Record.id, Record.content, Record.ai_summary, Record.created_at, Record.record_date,
+                Record.emotion_primary, Record.emotion_color_hex
+            ).filter(Record.id.in_([record_id for record_id, _ in hits]))
+        }
+        results = []
+        for record_id, value in hits:
+            row = rows.get(record_id)
+            if row is None:
+                continue
+            snippet, highlights = RecordSearchService.snippet(row.content, query)
+            if not highlights and row.ai_summary:
+                # 본문에 없고 요약/키워드에서만 맞은 경우 요약을 보여줌
+                snippet, highlights = RecordSearchService.snippet(row.ai_summary, query)
+            results.append({
+                "id": row.id,
+                "created_at": row.created_at,
+                "record_date": row.record_date,
+                "ai_summary": row.ai_summary,
+                "emotion_primary": row.emotion_primary,
+                "emotion_color_hex": row.emotion_color_hex,
+                "score": round(value, 4),
+                "snippet": snippet,
+                "highlights": highlights,
+            })
+        return results
@@ -1,11 +1,37 @@
+from datetime import datetime, timedelta
+from sqlalchemy import Integer, String, and_, case, cast, func, literal, or_, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from models.record import Record
 from models.user import User
 from services.emotion_color_service import EmotionColorService
-from services.ai_analysis_service import AIAnalysisService
-from typing import List, Optional, Dict
+from services.ai_analysis_service import AIAnalysisService, AI_COMBINED_ANALYSIS
+from services.analysis_worker import record_analysis_worker, ANALYSIS_ASYNC, ANALYSIS_CLAIM_TIMEOUT, ANALYSIS_MAX_WAIT
+from services.daily_rollup_service import DailyRollupService
+from services.user_stats_service import UserStatsService
+from services import emotion_lexicon
+from local_date import local_today
+from typing import List, Optional, Dict, Tuple
+import base64
 import json
 
+DAILY_LIMIT_MESSAGE = "오늘 이미 감정 기록을 작성했습니다. 하루에 한 번만 가능합니다."
+
+# 목록 화면(compact)용 컬럼 - 본문(content)과 JSON 컬럼은 읽지 않음
+RECORD_LIST_COLUMNS = (
+    Record.id,
+    Record.created_at,
+    Record.record_date,
+    Record.ai_summary,
+    Record.emotion_primary,
+    Record.emotion_intensity,
+    Record.emotion_color_hex,
+    Record.sleep_score,
+    Record.stress_score,
+    Record.analysis_status,
+    Record.share_with_counselor,
+)
+
 class RecordService:
     
     @staticmethod
@@ -23,30 +49,22 @@ class RecordService:
         user = db.query(User).filter(User.id == user_id).first()
         
         # 개발자 모드가 아닌 경우에만 하루 제한 적용
-        if not user or not user.is_developer:
-            # 오늘 이미 기록이 있는지 확인
+        record_date = local_today()
+        daily_limited = not user or not user.is_developer
+        if daily_limited:
+            # 오늘 이미 기록이 있는지 확인 (AI 분석 전에 빠르게 거절, 동시 요청은 유니크 인덱스가 막음)
             today_record = RecordService._get_today_record(db, user_id)
             if today_record:
-                raise ValueError("오늘 이미 감정 기록을 작성했습니다. 하루에 한 번만 가능합니다.")
-        
-        # AI 키워드 추출 (GPT-4o mini)
-        ai_keywords = AIAnalysisService.extract_keywords_with_gpt(content)
-        
-        # 1차 폴백: GPT 키워드가 비었으면 로컬 키워드 추출 사용
-        if not ai_keywords:
-            ai_keywords = RecordService._extract_keywords(content)
-        
-        # AI 요약 생성 (GPT-4o mini 우선 사용)
-        ai_summary = AIAnalysisService.generate_summary_with_ai(content)
+                raise ValueError(DAILY_LIMIT_MESSAGE)
         
-        # 감정 분석 및 색상 생성 (AI API 우선 사용)
-        emotion_analysis = AIAnalysisService.analyze_emotion_with_ai(content)
-        
-        # 2차 폴백: 여전히 키워드가 비었으면 주감정을 최소 1개 키워드로 포함
-        if (not ai_keywords) and emotion_analysis:
-            primary_kw = emotion_analysis.get("primary_emotion")
-            if primary_kw:
-                ai_keywords = [primary_kw]
+        # AI 분석 (키워드, 요약, 감정)
+        # 비동기 모드: 로컬 분석 결과로 먼저 저장하고 AI 분석은 백그라운드 워커에서 수행
+        if ANALYSIS_ASYNC:
+            ai_keywords, ai_summary, emotion_analysis = RecordService._provisional_analysis(content)
+            analysis_status = "pending"
+        else:
+            ai_keywords, ai_summary, emotion_analysis = RecordService._analyze_content(content)
+            analysis_status = "completed"
 
         # Record 생성
         record = Record(
@@ -57,17 +75,37 @@ class RecordService:
             ai_keywords=ai_keywords,
             ai_summary=ai_summary,
             emotion_analysis=emotion_analysis,
-            share_with_counselor=share_with_counselor
+            analysis_status=analysis_status,
+            share_with_counselor=share_with_counselor,
+            record_date=record_date,
+            daily_record_date=record_date if daily_limited else None
         )
         
         db.add(record)
+        try:
+            db.flush()
+        except IntegrityError:
+            # 같은 날 다른 요청이 먼저 저장함 (ux_records_user_daily_date)
+            db.rollback()
+            if daily_limited:
+                raise ValueError(DAILY_LIMIT_MESSAGE)
+            raise
         
         # 일기 작성 시 씨앗 지급 (기본 2개)
         if user:
             user.seeds += 2
         
+        # 일별 롤업/사용자 카운터도 같은 트랜잭션에서 갱신
+        DailyRollupService.refresh_record(db, record)
+        UserStatsService.on_record_created(db, record)
         db.commit()
         db.refresh(record)
+        
+        # 비동기 모드: 분석 작업을 큐에 넣고 바로 반환 (주간 캐시는 워커가 갱신)
+        if analysis_status == "pending":
+            record_analysis_worker.submit(record.id)
+            return record
+        
         # 주간 요약 캐시 갱신
         try:
             RecordService._update_weekly_cache_after_create(
@@ -81,6 +119,160 @@ class RecordService:
             pass
         return record
 
+    @staticmethod
+    def _provisional_analysis(content: str) -> Tuple[List[str], str, Dict]:
+        """AI 분석 완료 전 임시 결과 (외부 호출 없이 키워드 기반 분석)"""
+        emotion_analysis = AIAnalysisService.analyze_emotion_fallback(content)
+        emotion_analysis["provisional"] = True
+        return (
+            AIAnalysisService._extract_keywords_fallback(content),
+            AIAnalysisService.generate_summary_fallback(content),
+            emotion_analysis
+        )
+
+    @staticmethod
+    def _claim_analysis(db: Session, record_id: int) -> bool:
+        """대기 중인 기록의 분석을 원자적으로 선점 (여러 프로세스가 같은 기록을 중복 분석/과금하지 않도록)
+        선점 후 ANALYSIS_CLAIM_TIMEOUT이 지나도 끝나지 않은 작업(프로세스 종료 등)은 다시 선점할 수 있음"""
+        now = datetime.now()
+        table = Record.__table__
+        result = db.execute(
+            update(table)
+            .where(
+                table.c.id == record_id,
+                table.c.analysis_status == "pending",
+                or_(table.c.analysis_claimed_at.is_(None),
+                    table.c.analysis_claimed_at < now - timedelta(seconds=ANALYSIS_CLAIM_TIMEOUT))
+            )
+            .values(analysis_claimed_at=now)
+        )
+        db.commit()
+        return result.rowcount == 1
+
+    @staticmethod
+    def _release_analysis(record_id: int) -> None:
+        """분석 실패 시 선점 해제 (pending으로 남아 다음 재개 때 다시 시도)"""
+        from database import SessionLocal
+        
+        db = SessionLocal()
+        try:
+            table = Record.__table__
+            db.execute(update(table).where(table.c.id == record_id).values(analysis_claimed_at=None))
+            db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def complete_record_analysis(record_id: int, claimed: bool = False) -> bool:
+        """백그라운드 워커: 대기 중인 기록의 AI 분석을 채우고 주간 캐시 갱신
+        LLM 호출 동안에는 DB 세션을 잡고 있지 않음 (본문 읽기 → 세션 반환 → 분석 → 새 세션으로 저장)"""
+        from database import SessionLocal
+        
+        db = SessionLocal()
+        try:
+            if not claimed and not RecordService._claim_analysis(db, record_id):
+                return True  # 다른 워커가 처리 중이거나 이미 완료됨
+            content = db.query(Record.content).filter(Record.id == record_id).scalar()
+        finally:
+            db.close()
+        if content is None:
+            return False
+        
+        try:
+            ai_keywords, ai_summary, emotion_analysis = RecordService._analyze_content(content)
+        except Exception:
+            RecordService._release_analysis(record_id)
+            raise
+        
+        db = SessionLocal()
+        try:
+            record = db.query(Record).filter(Record.id == record_id).first()
+            if not record:
+                return False
+            # 분석 중 본문이 수정되었으면 이전 본문의 결과는 버림 (수정 시 로컬 분석 결과로 이미 완료 처리됨)
+            if record.content != content or record.analysis_status != "pending":
+                return True
+            
+            record.ai_keywords = ai_keywords
+            record.ai_summary = ai_summary
+            record.emotion_analysis = emotion_analysis
+            record.analysis_status = "completed"
+            DailyRollupService.refresh_record(db, record)
+            db.commit()
+            
+            try:
+                RecordService._update_weekly_cache_after_create(
+                    db=db,
+                    user_id=record.user_id,
+                    ai_summary=ai_summary,
+                    emotion_analysis=emotion_analysis,
+                    period_days=7
+                )
+            except Exception:
+                db.rollback()
+            return True
+        finally:
+            db.close()
+
+    @staticmethod
+    def resume_pending_analyses(db: Session) -> int:
+        """서버 재시작 등으로 남은 대기 중 분석 작업을 선점한 뒤 큐에 넣음 (다른 워커 프로세스가 선점한 기록은 건너뜀)"""
+        stale = datetime.now() - timedelta(seconds=ANALYSIS_CLAIM_TIMEOUT)
+        rows = db.query(Record.id).filter(
+            Record.analysis_status == "pending",
+            or_(Record.analysis_claimed_at.is_(None), Record.analysis_claimed_at < stale)
+        ).all()
+        resumed = 0
+        for (record_id,) in rows:
+            if RecordService._claim_analysis(db, record_id):
+                record_analysis_worker.submit(record_id, claimed=True)
+                resumed += 1
+        return resumed
+
+    @staticmethod
+    def get_record_analysis(db: Session, record_id: int, user_id: int, wait: float = 0) -> Optional[Dict]:
+        """기록의 분석 상태 조회 (최대 ANALYSIS_MAX_WAIT초 동안 완료를 기다리는 롱폴링 지원)"""
+        record = RecordService.get_record(db, record_id, user_id)
+        if not record:
+            return None
+        wait = min(wait, ANALYSIS_MAX_WAIT)
+        if record.analysis_status == "pending" and wait > 0:
+            record_analysis_worker.wait(record_id, wait)
+            db.refresh(record)
+        return {
+            "record_id": record.id,
+            "analysis_status": record.analysis_status,
+            "ai_keywords": record.ai_keywords,
+            "ai_summary": record.ai_summary,
+            "emotion_analysis": record.emotion_analysis
+        }
+
+    @staticmethod
+    def _analyze_content(content: str) -> Tuple[List[str], str, Dict]:
+        """기록 본문 AI 분석 - (키워드, 요약, 감정 분석) 반환"""
+        # 키워드 추출, 요약, 감정 분석을 GPT-4o mini 한 번의 호출로 수행
+        # (비어 있는 항목에만 항목별 폴백 적용, 같은 본문은 분석 캐시 재사용)
+        # 통합 호출을 끈 경우에는 개별 호출을 동시에 실행
+        if AI_COMBINED_ANALYSIS:
+            analysis = AIAnalysisService.analyze_record_with_ai(content)
+        else:
+            analysis = AIAnalysisService.analyze_text_concurrently(content)
+        ai_keywords = analysis["ai_keywords"]
+        ai_summary = analysis["ai_summary"]
+        emotion_analysis = analysis["emotion_analysis"]
+        
+        # 1차 폴백: 키워드가 비었으면 로컬 키워드 추출 사용
+        if not ai_keywords:
+            ai_keywords = RecordService._extract_keywords(content)
+        
+        # 2차 폴백: 여전히 키워드가 비었으면 주감정을 최소 1개 키워드로 포함
+        if (not ai_keywords) and emotion_analysis:
+            primary_kw = emotion_analysis.get("primary_emotion")
+            if primary_kw:
+                ai_keywords = [primary_kw]
+        
+        return ai_keywords, ai_summary, emotion_analysis
+
     @staticmethod
     def _update_weekly_cache_after_create(db: Session, user_id: int, ai_summary: str, emotion_analysis: Dict, period_days: int = 7) -> None:
         from datetime import date
@@ -135,28 +327,91 @@ class RecordService:
         db.commit()
     
     @staticmethod
-    def get_user_records(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[Record]:
-        """사용자의 감정 기록 목록 조회 (최신순)"""
-        return db.query(Record).filter(Record.user_id == user_id).order_by(Record.created_at.desc()).offset(skip).limit(limit).all()
+    def _list_query(db: Session, compact: bool):
+        """목록 조회 쿼리 (compact면 RECORD_LIST_COLUMNS 행, 아니면 Record 객체)"""
+        return db.query(*RECORD_LIST_COLUMNS) if compact else db.query(Record)
+
+    @staticmethod
+    def get_user_records(db: Session, user_id: int, skip: int = 0, limit: int = 100,
+                         emotion: Optional[str] = None, compact: bool = False) -> List[Record]:
+        """사용자의 감정 기록 목록 조회 (최신순, emotion이 있으면 해당 주감정만)"""
+        query = RecordService._list_query(db, compact).filter(Record.user_id == user_id)
+        if emotion:
+            # (user_id, emotion_primary, created_at) 인덱스 사용
+            query = query.filter(Record.emotion_primary == emotion)
+        return query.order_by(Record.created_at.desc(), Record.id.desc()).offset(skip).limit(limit).all()
     
     @staticmethod
-    def get_user_records_by_period(db: Session, user_id: int, days: int = 30) -> List[Record]:
-        """사용자의 특정 기간 감정 기록 조회 (최신순)"""
-        from datetime import datetime, timedelta
-        
+    def encode_cursor(record: Record) -> str:
+        """목록 마지막 기록 → 다음 페이지 커서 (불투명 토큰)"""
+        payload = json.dumps({"c": record.created_at.isoformat(), "i": record.id}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        """커서 → (created_at, id), 형식이 잘못되면 ValueError"""
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            return datetime.fromisoformat(payload["c"]), int(payload["i"])
+        except Exception:
+            raise ValueError("잘못된 페이지 커서입니다.")
+
+    @staticmethod
+    def _cursor_sort_key(db: Session):
+        """커서 비교/정렬에 쓸 created_at 식
+        SQLite는 DATETIME을 문자열로 저장하고 서버 기본값('…:34')과 ORM 저장값('…:34.000000')의 형식이 달라
+        양쪽 모두 마이크로초 6자리 형식으로 맞춰 비교 (MySQL은 컬럼 그대로 비교해 인덱스 사용)"""
+        if db.bind.dialect.name == "sqlite":
+            return lambda value: func.substr(cast(value, String).concat(".000000"), 1, 26)
+        return lambda value: value
+
+    @staticmethod
+    def get_user_records_page(db: Session, user_id: int, limit: int = 100, cursor: Optional[str] = None,
+                              emotion: Optional[str] = None, compact: bool = False) -> Tuple[List[Record], Optional[str]]:
+        """커서 기반 목록 조회 (최신순) → (기록 목록, 다음 페이지 커서 또는 None)
+        (created_at, id) 키셋 조건이라 페이지 깊이와 상관없이 (user_id, created_at, id) 인덱스 범위 스캔 한 번"""
+        query = RecordService._list_query(db, compact).filter(Record.user_id == user_id)
+        if emotion:
+            query = query.filter(Record.emotion_primary == emotion)
+        sort_key = RecordService._cursor_sort_key(db)
+        if cursor:
+            created_at, record_id = RecordService.decode_cursor(cursor)
+            query = query.filter(or_(
+                sort_key(Record.created_at) < sort_key(created_at),
+                and_(sort_key(Record.created_at) == sort_key(created_at), Record.id < record_id)
+            ))
+        # 한 건 더 읽어 다음 페이지 존재 여부 확인
+        records = query.order_by(sort_key(Record.created_at).desc(), Record.id.desc()).limit(limit + 1).all()
+        if len(records) <= limit:
+            return records, None
+        records = records[:limit]
+        return records, RecordService.encode_cursor(records[-1])
+    
+    @staticmethod
+    def get_user_records_by_period(db: Session, user_id: int, days: int = 30,
+                                   emotion: Optional[str] = None, compact: bool = False) -> List[Record]:
+        """사용자의 특정 기간 감정 기록 조회 (최신순, emotion이 있으면 해당 주감정만)"""
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
         
-        return db.query(Record).filter(
+        query = RecordService._list_query(db, compact).filter(
             Record.user_id == user_id,
             Record.created_at >= start_date,
             Record.created_at <= end_date
-        ).order_by(Record.created_at.desc()).all()
+        )
+        if emotion:
+            query = query.filter(Record.emotion_primary == emotion)
+        return query.order_by(Record.created_at.desc()).all()
     
     @staticmethod
     def get_user_records_count(db: Session, user_id: int) -> int:
-        """사용자의 총 감정 기록 수 조회"""
-        return db.query(Record).filter(Record.user_id == user_id).count()
+        """사용자의 총 감정 기록 수 조회 (user_record_stats 기본 키 조회)"""
+        return UserStatsService.get_stats(db, user_id)["total_records"]
+    
+    @staticmethod
+    def get_user_record_stats(db: Session, user_id: int) -> Dict:
+        """사용자 기록 카운터 (총 기록 수, 연속 작성 일수, 이번 달 기록 수)"""
+        return UserStatsService.get_stats(db, user_id)
     
     @staticmethod
     def get_record(db: Session, record_id: int, user_id: int) -> Optional[Record]:
@@ -168,6 +423,14 @@ class RecordService:
         """오늘 작성한 감정 기록 조회"""
         return RecordService._get_today_record(db, user_id)
     
+    @staticmethod
+    def get_today_record_brief(db: Session, user_id: int) -> Optional[Tuple[int, datetime]]:
+        """오늘 작성한 기록의 (id, created_at)만 조회 (작성 상태 확인용)"""
+        return db.query(Record.id, Record.created_at).filter(
+            Record.user_id == user_id,
+            Record.record_date == local_today()
+        ).order_by(Record.id).first()
+    
     @staticmethod
     def update_record(
         db: Session,
@@ -190,6 +453,8 @@ class RecordService:
             record.ai_keywords = RecordService._extract_keywords(content)
             record.ai_summary = RecordService._generate_summary(content)
             record.emotion_analysis = EmotionColorService.analyze_emotion_from_text(content)
+            # 진행 중이던 백그라운드 분석은 본문이 달라져 결과를 버림
+            record.analysis_status = "completed"
         
         if sleep_score is not None:
             record.sleep_score = sleep_score
@@ -200,6 +465,7 @@ class RecordService:
         if share_with_counselor is not None:
             record.share_with_counselor = share_with_counselor
         
+        DailyRollupService.refresh_record(db, record)
         db.commit()
         db.refresh(record)
         # 내용 변경 시 주간 캐시도 업데이트
@@ -222,17 +488,106 @@ class RecordService:
         if not record:
             return False
         
+        user_id, day = record.user_id, DailyRollupService.record_day(record.record_date, record.created_at)
         db.delete(record)
+        # 그날 남은 기록으로 롤업 재계산 (없으면 삭제), 사용자 카운터 재계산
+        DailyRollupService.refresh_day(db, user_id, day)
+        UserStatsService.on_record_deleted(db, user_id)
         db.commit()
         return True
     
+    @staticmethod
+    def _json_type(db: Session, path: str):
+        """emotion_analysis 안 값의 JSON 형식 (소문자, 키가 없으면 NULL)
+        MySQL: 'string'/'integer'/'double'/'null'…, SQLite: 'text'/'integer'/'real'/'null'… (함수 형태가 달라 분기)"""
+        if db.bind.dialect.name == "mysql":
+            return func.lower(func.json_type(func.json_extract(Record.emotion_analysis, path)))
+        return func.json_type(Record.emotion_analysis, path)
+
+    @staticmethod
+    def _json_array_length(db: Session, path: str):
+        """emotion_analysis 안 배열의 길이 (배열이 아니면 MySQL은 1, SQLite는 0)"""
+        if db.bind.dialect.name == "mysql":
+            return func.json_length(Record.emotion_analysis, path)
+        return func.json_array_length(Record.emotion_analysis, path)
+
+    @staticmethod
+    def _is_integer_text(db: Session, value):
+        """int()로 바꿀 수 있는 정수 문자열인지 (앞뒤 공백, 부호 한 개 허용)"""
+        value = func.trim(value)
+        if db.bind.dialect.name == "mysql":
+            return value.op("REGEXP")("^[-+]?[0-9]+$")
+        digits = case((func.substr(value, 1, 1).in_(("+", "-")), func.substr(value, 2)), else_=value)
+        return and_(digits != "", digits.op("NOT GLOB")("*[^0-9]*"))
+
+    @staticmethod
+    def _aggregate_emotion_statistics(db: Session, user_id: int, start_date, end_date) -> List:
+        """기간 내 기록을 주감정별로 집계 (SQL GROUP BY, 본문/JSON 전체는 가져오지 않음)
+        이전 Python 집계와 같은 규칙:
+        - 분석 결과가 비어 있지 않은 기록만 분포/평균에 포함 (if record.emotion_analysis)
+        - 주감정: primary_emotion 키가 없으면 '기쁨', 값이 null이면 None, 목록에 없는 이름은 그대로
+        - 강도: color.intensity를 int()로 바꾼 값, 없거나 바꿀 수 없으면 5 (EmotionColorService._record_intensity)
+        - RGB: color.rgb가 길이 3인 배열인 기록만 (EmotionColorService._record_rgb)
+        
+        반환 행: (주감정, 분석 여부(1/0), 기록 수, 최근 작성 시각, R/G/B 합계, RGB가 있는 기록 수, 강도 합계)
+        """
+        analysis = Record.emotion_analysis
+        analyzed = cast(analysis, String).notin_(("{}", "null"))
+        primary_type = RecordService._json_type(db, "$.primary_emotion")
+        primary = case(
+            (~analyzed, None),
+            (primary_type.is_(None), literal("기쁨")),
+            (primary_type == "null", None),
+            else_=analysis["primary_emotion"].as_string(),
+        )
+        analyzed_flag = case((analyzed, 1), else_=0)
+        has_rgb = and_(analyzed, RecordService._json_array_length(db, "$.color.rgb") == 3,
+                       RecordService._json_type(db, "$.color.rgb") == "array")
+
+        intensity_type = RecordService._json_type(db, "$.color.intensity")
+        intensity_value = analysis[("color", "intensity")]
+        real_intensity = intensity_value.as_float()
+        intensity = case(
+            (intensity_type == "integer", intensity_value.as_integer()),
+            # 실수는 0 쪽으로 버림 (int(6.7) == 6)
+            (intensity_type.in_(("real", "double", "decimal")),
+             case((real_intensity < 0, func.ceil(real_intensity)), else_=func.floor(real_intensity))),
+            (and_(intensity_type.in_(("text", "string")), RecordService._is_integer_text(db, intensity_value.as_string())),
+             cast(func.trim(intensity_value.as_string()), Integer)),
+            else_=5,
+        )
+        
+        def rgb_sum(channel: int):
+            return func.sum(case((has_rgb, analysis[("color", "rgb", channel)].as_integer()), else_=0))
+        
+        return db.query(
+            primary,
+            analyzed_flag,
+            func.count(Record.id),
+            func.max(Record.created_at),
+            rgb_sum(0),
+            rgb_sum(1),
+            rgb_sum(2),
+            func.sum(case((has_rgb, 1), else_=0)),
+            func.sum(case((analyzed, intensity), else_=0)),
+        ).filter(
+            Record.user_id == user_id,
+            Record.created_at >= start_date,
+            Record.created_at <= end_date
+        ).group_by(primary, analyzed_flag).order_by(func.max(Record.created_at).desc()).all()
+    
     @staticmethod
     def get_emotion_statistics(db: Session, user_id: int, days: int = 7) -> Dict:
-        """감정 통계 조회 (일주일, 이주일, 한달간)"""
-        # 최적화된 기간별 조회 메서드 사용
-        records = RecordService.get_user_records_by_period(db, user_id, days)
+        """감정 통계 조회 (일주일, 이주일, 한달간) - 주감정별 집계 몇 행만 조회
+        일별 롤업(하루 마지막 기록 1건)이 아니라 records를 집계: 통계는 지금부터 days일 전 시각까지의 모든 기록
+        (개발자 모드의 하루 여러 건, 분석 결과가 없는 기록 포함)을 세므로 롤업으로는 같은 값을 낼 수 없음
+        ((user_id, created_at) 인덱스 범위 + 집계 컬럼만 읽음)"""
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=days)
+        rows = RecordService._aggregate_emotion_statistics(db, user_id, start_date, end_date)
+        record_count = sum(row[2] for row in rows)
         
-        if not records:
+        if not record_count:
             return {
                 "period": days,
                 "record_count": 0,
@@ -241,24 +596,34 @@ class RecordService:
                 "message": f"지난 {days}일간의 기록이 없습니다."
             }
         
-        # 감정 분포 계산
+        # 감정 분포 (최근에 나온 감정부터)
         emotion_distribution = {}
-        for record in records:
-            if record.emotion_analysis:
-                emotion = record.emotion_analysis.get("primary_emotion", "기쁨")
-                emotion_distribution[emotion] = emotion_distribution.get(emotion, 0) + 1
-        
-        # 평균 색상 계산
-        emotion_records = [
-            {"color": record.emotion_analysis["color"]} 
-            for record in records 
-            if record.emotion_analysis
-        ]
-        average_color = EmotionColorService.get_average_emotion_color(emotion_records)
+        rgb_totals = [0, 0, 0]
+        rgb_count = 0
+        intensity_total = 0
+        analyzed_count = 0
+        for emotion, analyzed, count, _, r_sum, g_sum, b_sum, with_rgb, intensity_sum in rows:
+            if not analyzed:
+                continue
+            emotion_distribution[emotion] = count
+            rgb_totals = [rgb_totals[0] + int(r_sum or 0), rgb_totals[1] + int(g_sum or 0), rgb_totals[2] + int(b_sum or 0)]
+            rgb_count += int(with_rgb or 0)
+            intensity_total += int(intensity_sum or 0)
+            analyzed_count += count
+        
+        # 평균 색상 계산 (채널별 평균은 버림, 강도 평균은 반올림)
+        if rgb_count:
+            average_color = EmotionColorService._representative_color(
+                tuple(int(total / rgb_count) for total in rgb_totals),
+                int(round(intensity_total / analyzed_count)),
+                rgb_count
+            )
+        else:
+            average_color = EmotionColorService._get_color_with_intensity("기쁨", 5)
         
         return {
             "period": days,
-            "record_count": len(records),
+            "record_count": record_count,
             "average_color": average_color,
             "emotion_distribution": emotion_distribution,
             "message": f"지난 {days}일간의 평균 감정색은 {average_color['name']}입니다."
@@ -267,19 +632,8 @@ class RecordService:
     @staticmethod
     def _extract_keywords(content: str) -> List[str]:
         """AI 키워드 추출 (간단한 구현)"""
-        # 실제로는 더 정교한 AI 모델을 사용해야 함
-        keywords = []
-        
-        # 감정 관련 키워드 (감정의 바퀴 기반)
-        emotion_keywords = [
-            '기쁨', '신뢰', '두려움', '놀람', '슬픔', '혐오', '분노', '기대',
-            '행복', '안전', '불안', '예상', '우울', '짜증', '화남', '희망'
-        ]
-        
-        # 내용에서 감정 키워드 찾기
-        for keyword in emotion_keywords:
-            if keyword in content:
-                keywords.append(keyword)
+        # 내용에서 감정 키워드 찾기 (공용 사전의 컴파일된 매처 사용)
+        keywords = emotion_lexicon.match(content).hits("record_keywords")["all"]
         
         # 기본 키워드 추가
         if len(keywords) == 0:
@@ -289,17 +643,11 @@ class RecordService:
     
     @staticmethod
     def _get_today_record(db: Session, user_id: int) -> Optional[Record]:
-        """오늘 작성한 감정 기록 조회 (내부 메서드)"""
-        from datetime import datetime, date
-        
-        today = date.today()
-        
-        # 오늘 날짜의 기록 조회 (created_at이 오늘인지 확인)
+        """오늘 작성한 감정 기록 조회 (내부 메서드) - (user_id, record_date) 인덱스 조회"""
         return db.query(Record).filter(
             Record.user_id == user_id,
-            Record.created_at >= datetime.combine(today, datetime.min.time()),
-            Record.created_at <= datetime.combine(today, datetime.max.time())
-        ).first()
+            Record.record_date == local_today()
+        ).order_by(Record.id).first()
     
     @staticmethod
     def _generate_summary(content: str) -> str:
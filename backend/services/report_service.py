@@ -96,53 +96,36 @@ class ReportService:
             one_line_summary = cache.one_line_summary or ""
             negative_ratio = cache.negative_ratio or 0.0
         else:
-            # 2) 캐시가 없거나 비어 있으면 최근 period_days 내 기록으로 즉석 요약 생성
-            from models.record import Record
-
-            end_dt = datetime.now()
-            start_dt = end_dt - timedelta(days=period_days)
-
-            records = (
-                db.query(Record)
-                .filter(
-                    Record.user_id == user_id,
-                    Record.created_at >= start_dt,
-                    Record.created_at <= end_dt,
-                )
-                .order_by(Record.created_at.asc())
-                .all()
-            )
-
-            if not records:
+            # 2) 캐시가 없거나 비어 있으면 최근 period_days 내 일별 롤업으로 즉석 요약 생성
+            #    (기록 본문/JSON 대신 (user_id, date) 범위 스캔 + 대표 기록의 요약 컬럼만 조회)
+            from services.daily_rollup_service import DailyRollupService
+
+            start_dt = datetime.now() - timedelta(days=period_days)
+            rollups = DailyRollupService.get_range(db, user_id, start_dt.date())
+
+            if not rollups:
                 # 최근 기간 내 일기가 0개면 공유 불가
                 raise ValueError("최근 7일 일기가 없습니다.")
 
             # 기록이 1개 이상이면 해당 범위 내에서 요약 생성
+            rollups = rollups[-period_days:]
+            summary_by_record = DailyRollupService.summaries_for(db, rollups)
             items = []
             summaries: List[str] = []
             neg = {"우울", "슬픔", "분노", "혐오", "두려움", "불안", "짜증", "화남"}
             neg_count = 0
 
-            for r in records[-period_days:]:
-                # 날짜
-                date_str = r.created_at.date().isoformat() if r.created_at else None
-                # 요약
-                summary = (r.ai_summary or "").strip()
+            for r in rollups:
+                summary = (summary_by_record.get(r.record_id) or "").strip()
                 if summary:
                     summaries.append(summary)
-                # 주감정
-                primary_emotion = ""
-                try:
-                    if r.emotion_analysis:
-                        primary_emotion = r.emotion_analysis.get("primary_emotion", "")
-                except Exception:
-                    primary_emotion = ""
+                primary_emotion = r.primary_emotion or ""
 
                 if primary_emotion in neg:
                     neg_count += 1
 
                 items.append({
-                    "date": date_str,
+                    "date": r.date.isoformat(),
                     "summary": summary,
                     "primary_emotion": primary_emotion,
                 })
@@ -0,0 +1,91 @@
+"""
+동일 요청 합치기 (single-flight)
+- 같은 키(항목 + 정규화된 본문)의 호출이 진행 중이면 새로 호출하지 않고 그 결과를 함께 받음
+- 재시도/중복 탭으로 같은 미리보기(/emotions/analyze, /analyze-ai, /summarize)가 동시에 들어와도
+  OpenAI 호출은 한 번만 나감 (완료된 결과 재사용은 ai_cache 담당)
+- 동기 엔드포인트(스레드풀)에서 쓰는 스레드 기반 구현
+"""
+import copy
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+from services.ai_cache import normalize_text
+from services.deadline import remaining_time, DeadlineExceeded
+
+
+class _Call:
+    __slots__ = ("event", "result", "error", "waiters")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """키별로 진행 중인 호출 하나만 실행하고 나머지는 결과를 기다림"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Tuple[str, str], _Call] = {}
+        # 항목(kind)별 카운터
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, kind: str, key: str) -> None:
+        stats = self._stats.setdefault(kind, {"executed": 0, "coalesced": 0, "errors": 0})
+        stats[key] += 1
+
+    def do(self, kind: str, text: str, func: Callable[[], Any]) -> Any:
+        """kind+본문이 같은 호출이 진행 중이면 그 결과를, 아니면 func() 실행 결과를 반환"""
+        key = (kind, normalize_text(text))
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._count(kind, "executed")
+            else:
+                call.waiters += 1
+                self._count(kind, "coalesced")
+
+        if leader:
+            try:
+                call.result = func()
+                return call.result
+            except BaseException as e:
+                call.error = e
+                with self._lock:
+                    self._count(kind, "errors")
+                raise
+            finally:
+                with self._lock:
+                    self._calls.pop(key, None)
+                call.event.set()
+
+        # 대기 중인 요청도 자기 요청 마감 시간까지만 기다림
+        if not call.event.wait(remaining_time()):
+            raise DeadlineExceeded()
+        if call.error is not None:
+            raise call.error
+        # 호출 측에서 결과를 수정해도 다른 요청에 영향이 없도록 복사본 반환
+        return copy.deepcopy(call.result)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = {kind: dict(values) for kind, values in self._stats.items()}
+            in_flight = len(self._calls)
+        total_executed = sum(v["executed"] for v in stats.values())
+        total_coalesced = sum(v["coalesced"] for v in stats.values())
+        requests = total_executed + total_coalesced
+        return {
+            "kinds": stats,
+            "executed": total_executed,
+            "coalesced": total_coalesced,
+            "coalesce_ratio": round(total_coalesced / requests, 3) if requests else 0.0,
+            "in_flight": in_flight,
+        }
+
+
+# 프로세스 공용 (AI 미리보기 호출)
+ai_single_flight = SingleFlight()
@@ -0,0 +1,70 @@
+"""
+긴 본문 토큰 추정 / 분할 / 자르기
+- 토큰 수는 문자 수 기반 추정치 (한국어 기준 약 2자당 1토큰, 실제 사용량은 응답 usage로 확인)
+- 분할은 문단 → 문장 → 글자 순으로 경계를 찾아 조각마다 max_tokens 이하로 묶음
+"""
+import re
+from typing import List
+
+CHARS_PER_TOKEN = 2
+
+# 문장 경계 (마침표/물음표/느낌표/말줄임표/물결 뒤 공백)
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?。…~])\s+")
+_PARAGRAPH_BOUNDARY = re.compile(r"\n\s*\n|\n")
+
+TRUNCATION_MARK = "\n…(중략)…\n"
+
+
+def estimate_tokens(text: str) -> int:
+    """대략적인 토큰 수 (한국어 기준 약 2자당 1토큰)"""
+    return len(text or "") // CHARS_PER_TOKEN + 1
+
+
+def _split_long(piece: str, max_chars: int) -> List[str]:
+    """문장 단위로 나누고, 그래도 긴 문장은 글자 수로 자름"""
+    parts = []
+    for sentence in _SENTENCE_BOUNDARY.split(piece):
+        if len(sentence) <= max_chars:
+            parts.append(sentence)
+        else:
+            parts.extend(sentence[i:i + max_chars] for i in range(0, len(sentence), max_chars))
+    return parts
+
+
+def split_into_chunks(text: str, max_tokens: int) -> List[str]:
+    """본문을 max_tokens 이하 조각들로 분할 (문단/문장 경계 우선, 순서 유지)"""
+    max_chars = max(1, max_tokens * CHARS_PER_TOKEN)
+    pieces = []
+    for paragraph in _PARAGRAPH_BOUNDARY.split(text or ""):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+        else:
+            pieces.extend(p for p in _split_long(paragraph, max_chars) if p)
+
+    # 인접한 조각을 한도까지 이어 붙임
+    chunks: List[str] = []
+    current = ""
+    for piece in pieces:
+        candidate = f"{current}\n{piece}" if current else piece
+        if len(candidate) <= max_chars:
+            current = candidate
+        else:
+            chunks.append(current)
+            current = piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """max_tokens에 맞게 자름 (앞 2/3 + 뒤 1/3을 남기고 가운데 생략 - 일기의 시작과 마무리 유지)"""
+    text = text or ""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    budget = max(0, max_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARK))
+    head = budget * 2 // 3
+    tail = budget - head
+    return text[:head].rstrip() + TRUNCATION_MARK + (text[-tail:].lstrip() if tail else "")
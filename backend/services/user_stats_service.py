@@ -0,0 +1,135 @@
+"""
+사용자별 기록 카운터 (user_record_stats)
+- 총 기록 수, 연속 작성 일수(streak), 이번 달 기록 수를 기록 생성/삭제와 같은 트랜잭션에서 갱신 (커밋은 호출 측)
+- 생성은 카운터 행을 잠그고 증분 갱신, 삭제/과거 날짜 기록/카운터가 없는 사용자는 records에서 다시 계산
+- 날짜는 records.record_date(서비스 시간대 작성일) 기준
+- 카운터가 없는 사용자(도입 전 기록만 있는 사용자)는 첫 조회 때 records에서 계산해 저장
+  (서버 시작 시 작성일을 채운 경우 저장된 카운터를 지워 다시 계산되게 함), 불일치 복구: python maintenance_jobs.py record-stats
+"""
+import logging
+from datetime import date, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models.record import Record
+from models.user_record_stats import UserRecordStats
+from local_date import local_today
+
+
+class UserStatsService:
+
+    @staticmethod
+    def compute(db: Session, user_id: int) -> Dict:
+        """records에서 카운터 값 계산 ((user_id, record_date) 인덱스 사용)"""
+        month_start = local_today().replace(day=1)
+        total = db.query(func.count(Record.id)).filter(Record.user_id == user_id).scalar() or 0
+        month_records = db.query(func.count(Record.id)).filter(
+            Record.user_id == user_id,
+            Record.record_date >= month_start
+        ).scalar() or 0
+        days = db.query(Record.record_date).filter(
+            Record.user_id == user_id,
+            Record.record_date.isnot(None)
+        ).distinct().order_by(Record.record_date.desc())
+
+        # 가장 최근 작성일부터 하루씩 이어지는 동안 셈
+        last_record_date, streak, expected = None, 0, None
+        for (day,) in days:
+            if last_record_date is None:
+                last_record_date = expected = day
+            if day != expected:
+                break
+            streak += 1
+            expected = day - timedelta(days=1)
+
+        return {
+            "total_records": total,
+            "current_streak": streak,
+            "last_record_date": last_record_date,
+            "month_start": month_start,
+            "month_records": month_records,
+        }
+
+    @staticmethod
+    def recompute(db: Session, user_id: int) -> UserRecordStats:
+        """사용자 카운터를 records로 다시 계산해 저장 (커밋하지 않음)"""
+        db.flush()
+        values = UserStatsService.compute(db, user_id)
+        stats = db.query(UserRecordStats).filter(UserRecordStats.user_id == user_id).with_for_update().first()
+        if stats is None:
+            stats = UserRecordStats(user_id=user_id, **values)
+            try:
+                # 같은 사용자 카운터가 동시에 만들어지면 기본 키 충돌 → 세이브포인트만 되돌리고 그 행을 갱신
+                with db.begin_nested():
+                    db.add(stats)
+                return stats
+            except IntegrityError:
+                stats = db.query(UserRecordStats).filter(UserRecordStats.user_id == user_id).with_for_update().one()
+        for field, value in values.items():
+            setattr(stats, field, value)
+        return stats
+
+    @staticmethod
+    def on_record_created(db: Session, record: Record) -> UserRecordStats:
+        """기록 생성 후(커밋 전) 카운터 증분 갱신"""
+        db.flush()
+        stats = db.query(UserRecordStats).filter(UserRecordStats.user_id == record.user_id).with_for_update().first()
+        day: Optional[date] = record.record_date
+        if stats is None or day is None or (stats.last_record_date is not None and day < stats.last_record_date):
+            # 카운터가 아직 없거나 과거 날짜 기록이 끼어든 경우 → 전체 재계산
+            return UserStatsService.recompute(db, record.user_id)
+
+        stats.total_records += 1
+        if stats.last_record_date is None or day > stats.last_record_date:
+            continued = stats.last_record_date == day - timedelta(days=1)
+            stats.current_streak = stats.current_streak + 1 if continued else 1
+            stats.last_record_date = day
+        month_start = day.replace(day=1)
+        if stats.month_start == month_start:
+            stats.month_records += 1
+        elif stats.month_start is None or month_start > stats.month_start:
+            stats.month_start = month_start
+            stats.month_records = 1
+        return stats
+
+    @staticmethod
+    def on_record_deleted(db: Session, user_id: int) -> UserRecordStats:
+        """기록 삭제 후(커밋 전) 카운터 재계산 (연속 작성 일수가 끊길 수 있으므로)"""
+        return UserStatsService.recompute(db, user_id)
+
+    @staticmethod
+    def view(values: Dict) -> Dict:
+        """저장된 카운터 → 오늘 기준 값 (어제까지 이어지지 않은 streak, 지난달 카운터는 0)"""
+        today = local_today()
+        last_record_date = values.get("last_record_date")
+        streak_alive = last_record_date is not None and last_record_date >= today - timedelta(days=1)
+        return {
+            "total_records": values.get("total_records") or 0,
+            "current_streak": (values.get("current_streak") or 0) if streak_alive else 0,
+            "last_record_date": last_record_date,
+            "month_records": (values.get("month_records") or 0) if values.get("month_start") == today.replace(day=1) else 0,
+        }
+
+    @staticmethod
+    def get_stats(db: Session, user_id: int) -> Dict:
+        """사용자 카운터 조회 (기본 키 조회, 카운터가 아직 없으면 records에서 계산해 저장)"""
+        stats = db.get(UserRecordStats, user_id)
+        if stats is None:
+            try:
+                stats = UserStatsService.recompute(db, user_id)
+                db.commit()
+            except Exception as e:
+                # 저장에 실패해도 조회는 계산값으로 응답 (다음 조회/기록 생성 때 다시 저장)
+                db.rollback()
+                logging.warning(f"사용자 {user_id} 기록 카운터 저장 실패: {e}")
+                return UserStatsService.view(UserStatsService.compute(db, user_id))
+        return UserStatsService.view({
+            "total_records": stats.total_records,
+            "current_streak": stats.current_streak,
+            "last_record_date": stats.last_record_date,
+            "month_start": stats.month_start,
+            "month_records": stats.month_records,
+        })
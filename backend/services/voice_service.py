@@ -6,6 +6,8 @@ from typing import Dict, Optional
 import logging
 import io
 from pydub import AudioSegment
+from services.clova_client import clova_post, CLOVA_STT_URL
+from services.circuit_breaker import CircuitOpenError
 
 class VoiceService:
     """Naver Clova STT를 사용한 음성인식 서비스"""
@@ -14,7 +16,7 @@ class VoiceService:
         # 환경 변수 이름을 일치시킴
         self.client_id = os.getenv("CLOVA_CLIENT_ID") or os.getenv("NAVER_CLIENT_ID")
         self.client_secret = os.getenv("CLOVA_CLIENT_SECRET") or os.getenv("NAVER_CLIENT_SECRET")
-        self.stt_url = "https://naveropenapi.apigw.ntruss.com/recog/v1/stt"
+        self.stt_url = CLOVA_STT_URL
         
         if not self.client_id or not self.client_secret:
             logging.warning("Naver Clova API 키가 설정되지 않았습니다.")
@@ -89,8 +91,9 @@ class VoiceService:
             # logging.info(f"파라미터: {params}")
             # logging.info(f"오디오 데이터 크기: {len(audio_data)} bytes")
             
-            response = requests.post(
+            response = clova_post(
                 self.stt_url,
+                method="speech_to_text",
                 headers=headers,
                 params=params,
                 data=audio_data
@@ -115,6 +118,11 @@ class VoiceService:
                     "error": error_msg
                 }
                 
+        except CircuitOpenError:
+            return {
+                "success": False,
+                "error": "음성인식 서비스가 일시적으로 응답하지 않습니다. 잠시 후 다시 시도해주세요."
+            }
         except Exception as e:
             return {
                 "success": False,
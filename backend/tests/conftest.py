@@ -0,0 +1,72 @@
+"""
+백엔드 테스트 공통 설정
+- backend 디렉터리를 import 경로에 추가 (main.py와 같은 방식으로 `from models...`, `from services...` 사용)
+- 테스트마다 SQLite 메모리 DB 제공 (db: 세션, session_local: database.SessionLocal을 같은 DB로 교체)
+"""
+import os
+import sys
+import importlib
+import pkgutil
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database  # noqa: E402
+from database import Base  # noqa: E402
+import models  # noqa: E402
+
+# 모든 모델을 등록해야 외래 키 대상 테이블까지 create_all로 만들어짐
+for module in pkgutil.iter_modules(models.__path__):
+    importlib.import_module(f"models.{module.name}")
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+
+@pytest.fixture
+def session_local(engine, monkeypatch):
+    """서비스가 직접 여는 세션(SessionLocal())도 테스트 DB를 쓰도록 교체"""
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(database, "SessionLocal", factory)
+    return factory
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+class FakeClock:
+    """time.monotonic 대신 주입하는 시계 (advance로만 흐름)"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
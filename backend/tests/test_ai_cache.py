@@ -0,0 +1,87 @@
+"""AI 결과 캐시 (services/ai_cache.py) - DB 계층 조회 횟수, 부정 캐시, 일괄 작업 옵션, 테이블 정리"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from models.ai_analysis_cache import AIAnalysisCache
+from services.ai_cache import AIResultCache, ai_cache_options, make_cache_key
+
+MODEL = "test-model"
+VERSIONS = {"keywords": "v1", "summary": "v1", "emotion": "v1"}
+
+
+@pytest.fixture
+def cache(session_local):
+    return AIResultCache(persist=True)
+
+
+@pytest.fixture
+def selects(engine):
+    """ai_analysis_cache SELECT 실행 횟수"""
+    statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "ai_analysis_cache" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _count)
+    yield statements
+    event.remove(engine, "before_cursor_execute", _count)
+
+
+def test_get_many_reads_db_once(cache, selects):
+    found = cache.get_many(VERSIONS, "오늘은 기분이 좋다", MODEL)
+    assert found == {}
+    assert len(selects) == 1
+
+
+def test_persistent_hit_is_promoted_to_memory(cache, session_local, selects):
+    cache.set("summary", "본문", MODEL, "v1", "요약")
+    cache.clear()
+    selects.clear()
+    assert cache.get("summary", "본문", MODEL, "v1") == "요약"
+    assert cache.get("summary", "본문", MODEL, "v1") == "요약"
+    assert len(selects) == 1
+    assert cache.stats()["persistent_hits"] == 1
+
+
+def test_misses_are_not_requeried_until_set(cache, selects):
+    assert cache.get("emotion", "본문", MODEL, "v1") is None
+    assert cache.get("emotion", "본문", MODEL, "v1") is None
+    assert len(selects) == 1
+    assert cache.stats()["negative_hits"] == 1
+
+    cache.set("emotion", "본문", MODEL, "v1", {"primary_emotion": "기쁨"})
+    assert cache.get("emotion", "본문", MODEL, "v1") == {"primary_emotion": "기쁨"}
+
+
+def test_bulk_options_skip_db_tier(cache, session_local, selects):
+    with ai_cache_options(persist=False):
+        cache.set("keywords", "본문", MODEL, "v1", ["산책"])
+        assert cache.get("keywords", "본문", MODEL, "v1") == ["산책"]
+        assert cache.get("summary", "본문", MODEL, "v1") is None
+    assert selects == []
+    db = session_local()
+    assert db.query(AIAnalysisCache).count() == 0
+    db.close()
+
+    with ai_cache_options(read=False):
+        assert cache.get("keywords", "본문", MODEL, "v1") is None
+
+
+def test_purge_removes_expired_and_caps_rows(cache, session_local):
+    db = session_local()
+    now = datetime.utcnow()
+    for i in range(10):
+        db.add(AIAnalysisCache(
+            cache_key=make_cache_key("summary", f"본문 {i}", MODEL, "v1"), kind="summary", model=MODEL,
+            prompt_version="v1", payload=f"요약 {i}",
+            expires_at=now + timedelta(hours=i - 2),  # 0, 1은 이미 만료
+        ))
+    db.commit()
+
+    assert cache.purge_persistent(db, max_rows=5) == 5
+    left = sorted(payload for (payload,) in db.query(AIAnalysisCache.payload))
+    assert left == [f"요약 {i}" for i in range(5, 10)]
+    db.close()
@@ -0,0 +1,140 @@
+"""서킷 브레이커 (services/circuit_breaker.py) 상태 전이와 OpenAI 호출 폴백"""
+import pytest
+
+from services import circuit_breaker
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED, OPEN, HALF_OPEN
+
+
+def _breaker(clock, **kwargs):
+    options = dict(window_seconds=60, min_calls=4, error_rate=0.5, slow_call_seconds=8,
+                   slow_call_rate=0.5, open_seconds=30, half_open_probes=1)
+    options.update(kwargs)
+    return CircuitBreaker("test", clock=clock, **options)
+
+
+def _fail():
+    raise RuntimeError("upstream down")
+
+
+def _ok():
+    return "ok"
+
+
+def test_opens_on_error_rate(clock):
+    breaker = _breaker(clock)
+    breaker.call(_ok)
+    breaker.call(_ok)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            breaker.call(_fail)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.call(_ok)
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_stays_closed_below_min_calls(clock):
+    breaker = _breaker(clock)
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            breaker.call(_fail)
+    assert breaker.state == CLOSED
+
+
+def test_calls_outside_window_are_forgotten(clock):
+    breaker = _breaker(clock)
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            breaker.call(_fail)
+    clock.advance(61)
+    breaker.call(_ok)
+    assert breaker.state == CLOSED
+    assert breaker.stats()["window_calls"] == 1
+
+
+def test_opens_on_slow_calls(clock):
+    breaker = _breaker(clock)
+
+    def slow():
+        clock.advance(9)
+        return "late"
+
+    breaker.call(_ok)
+    breaker.call(_ok)
+    breaker.call(slow)
+    assert breaker.state == CLOSED
+    breaker.call(slow)
+    assert breaker.state == OPEN
+
+
+def test_client_errors_are_not_failures(clock):
+    breaker = _breaker(clock)
+    for _ in range(4):
+        with pytest.raises(RuntimeError):
+            breaker.call(_fail, is_failure=lambda e: False)
+    assert breaker.state == CLOSED
+
+
+def test_half_open_probe_closes_on_success(clock):
+    breaker = _breaker(clock)
+    for _ in range(4):
+        with pytest.raises(RuntimeError):
+            breaker.call(_fail)
+    clock.advance(29)
+    assert breaker.state == OPEN
+    clock.advance(1)
+    assert breaker.state == HALF_OPEN
+
+    # 시험 호출 슬롯은 하나뿐
+    assert breaker.allow_request() is True
+    assert breaker.allow_request() is False
+    breaker.record(0.1, failed=False)
+    assert breaker.state == CLOSED
+    assert breaker.stats()["window_calls"] == 0
+
+
+def test_half_open_probe_failure_reopens(clock):
+    breaker = _breaker(clock)
+    for _ in range(4):
+        with pytest.raises(RuntimeError):
+            breaker.call(_fail)
+    clock.advance(30)
+    with pytest.raises(RuntimeError):
+        breaker.call(_fail)
+    assert breaker.state == OPEN
+    assert breaker.stats()["opened"] == 2
+    # 다시 open_seconds만큼 기다려야 시험 호출 가능
+    clock.advance(29)
+    assert breaker.state == OPEN
+
+
+def test_open_breaker_short_circuits_to_fallback(clock, session_local, monkeypatch):
+    from services import ai_analysis_service
+    from services.ai_analysis_service import AIAnalysisService
+
+    calls = []
+
+    class _Completions:
+        def create(self, **kwargs):
+            calls.append(kwargs)
+            raise AssertionError("브레이커가 열려 있으면 호출하지 않아야 함")
+
+    class _Client:
+        chat = type("Chat", (), {"completions": _Completions()})()
+
+        def with_options(self, **kwargs):
+            return self
+
+    breaker = _breaker(clock)
+    for _ in range(4):
+        with pytest.raises(RuntimeError):
+            breaker.call(_fail)
+    monkeypatch.setattr(circuit_breaker, "_breakers", {"openai": breaker})
+    monkeypatch.setattr(ai_analysis_service, "get_openai_client", lambda: _Client())
+
+    result = AIAnalysisService.analyze_emotion_with_ai("오늘은 정말 행복하고 즐거웠다")
+    assert calls == []
+    assert breaker.stats()["rejected"] == 1
+    assert result["ai_used"] is False
+    assert result["ai_failed"] is True
+    assert result["primary_emotion"] == "기쁨"
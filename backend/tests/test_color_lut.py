@@ -0,0 +1,133 @@
+"""팔레트 룩업 테이블 (services/color_lut.py) - 선형 탐색과 같은 최근접 색을 고르는지"""
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from services.color_lut import PaletteLUT
+from services.emotion_color_service import (
+    EmotionColorService,
+    _EMOTION_LUT,
+    _EMOTION_NAMES,
+    _INTENSITY_LUTS,
+)
+
+INTENSITIES = sorted(EmotionColorService.INTENSITY_MODIFIERS)
+
+
+def brute_force_name(rgb, palette):
+    """기존 선형 탐색 (거리가 같으면 앞쪽 항목, 없으면 기쁨)"""
+    best_name = None
+    best_dist = float("inf")
+    for name, info in palette.items():
+        prgb = info.get("rgb")
+        if not prgb:
+            continue
+        dist = sum((a - b) ** 2 for a, b in zip(rgb, prgb))
+        if dist < best_dist:
+            best_dist = dist
+            best_name = name
+    return best_name or "기쁨"
+
+
+def brute_force_many(rgbs, colors):
+    """NumPy 전수 비교 (argmin은 같은 거리면 앞쪽 항목)"""
+    palette = np.array(colors, dtype=np.float64)
+    result = []
+    for chunk in np.array_split(np.asarray(rgbs, dtype=np.float64), max(1, len(rgbs) // 50000)):
+        result.append(((chunk[:, None, :] - palette[None, :, :]) ** 2).sum(axis=2).argmin(axis=1))
+    return np.concatenate(result)
+
+
+def boundary_grid():
+    """셀 경계(8의 배수와 그 앞뒤)를 모두 조합한 RGB 격자"""
+    values = sorted({v for k in range(0, 257, 8) for v in (k - 1, k, k + 1) if 0 <= v <= 255})
+    return np.array(list(itertools.product(values, repeat=3)), dtype=np.int64)
+
+
+def tie_points(colors):
+    """두 팔레트 색의 정수 중점 (두 색까지의 거리가 같음)"""
+    points = []
+    for a, b in itertools.combinations(colors, 2):
+        if all((x + y) % 2 == 0 for x, y in zip(a, b)):
+            points.append(tuple((x + y) // 2 for x, y in zip(a, b)))
+    return points
+
+
+def sample_points(colors, n=3000, seed=7):
+    rng = random.Random(seed)
+    points = [tuple(rng.randint(0, 255) for _ in range(3)) for _ in range(n)]
+    points += [tuple(c) for c in colors]
+    points += tie_points(colors)
+    # 범위 밖 값 (선형 탐색 폴백)
+    points += [(-5, 0, 0), (300, 128, 0), (255, 256, 255), (-1, -1, -1), (128.5, 64.25, 0.0)]
+    return points
+
+
+@pytest.mark.parametrize("intensity", INTENSITIES)
+def test_find_closest_from_palette_matches_brute_force(intensity):
+    palette = EmotionColorService._build_extended_palette(intensity)
+    names, lut = _INTENSITY_LUTS[intensity]
+    colors = [info["rgb"] for info in palette.values()]
+
+    for rgb in sample_points(colors):
+        expected = brute_force_name(rgb, palette)
+        # id(팔레트)로 LUT 경로를 타는 공개 경로, LUT 직접 호출, 복사본(선형 탐색 폴백) 모두 같은 이름
+        assert EmotionColorService._find_closest_from_palette(rgb, palette) == expected, rgb
+        assert names[lut.nearest(rgb)] == expected, rgb
+        assert EmotionColorService._find_closest_from_palette(rgb, dict(palette)) == expected, rgb
+
+
+@pytest.mark.parametrize("intensity", INTENSITIES)
+def test_nearest_many_matches_brute_force_on_cell_boundaries(intensity):
+    _, lut = _INTENSITY_LUTS[intensity]
+    grid = boundary_grid()
+    assert (lut.nearest_many(grid) == brute_force_many(grid, lut.colors)).all()
+
+
+def test_nearest_many_matches_scalar_nearest():
+    _, lut = _INTENSITY_LUTS[5]
+    points = sample_points(lut.colors)
+    expected = [lut.nearest(p) for p in points]
+    assert lut.nearest_many(np.array(points, dtype=np.float64)).tolist() == expected
+
+
+def test_distance_ties_pick_earlier_palette_entry():
+    # 가운데 점은 두 색과 거리가 같다 → 팔레트 앞쪽 항목
+    lut = PaletteLUT([(0, 0, 0), (16, 0, 0), (0, 16, 0)])
+    assert lut.nearest((8, 0, 0)) == 0
+    assert lut.nearest((0, 8, 0)) == 0
+    assert lut.nearest((8, 8, 0)) == 0
+    assert lut.nearest_many(np.array([(8, 0, 0), (0, 8, 0), (12, 0, 0)])).tolist() == [0, 0, 1]
+
+    reversed_lut = PaletteLUT([(16, 0, 0), (0, 0, 0)])
+    assert reversed_lut.nearest((8, 0, 0)) == 0
+    assert reversed_lut.nearest_many(np.array([(8, 0, 0)])).tolist() == [0]
+
+
+def test_tie_points_exist_and_match_brute_force():
+    # 실제 팔레트에도 동점인 점이 있어야 이 검사가 의미가 있다
+    palette = EmotionColorService._build_extended_palette(5)
+    names, lut = _INTENSITY_LUTS[5]
+    ties = []
+    for rgb in tie_points(lut.colors):
+        dists = sorted(sum((a - b) ** 2 for a, b in zip(rgb, c)) for c in lut.colors)
+        if dists[0] == dists[1]:
+            ties.append(rgb)
+    assert ties
+    for rgb in ties:
+        assert names[lut.nearest(rgb)] == brute_force_name(rgb, palette)
+
+
+def test_emotion_lut_matches_brute_force():
+    colors = EmotionColorService.EMOTION_COLORS
+    for rgb in sample_points([info["rgb"] for info in colors.values()]):
+        assert EmotionColorService._find_closest_emotion(rgb) == brute_force_name(rgb, colors), rgb
+
+    grid = boundary_grid()
+    expected = brute_force_many(grid, _EMOTION_LUT.colors)
+    assert (_EMOTION_LUT.nearest_many(grid) == expected).all()
+    assert [_EMOTION_NAMES[i] for i in expected[:5]] == [
+        brute_force_name(tuple(p), colors) for p in grid[:5]
+    ]
@@ -0,0 +1,181 @@
+"""일별 감정 롤업 (services/daily_rollup_service.py) - 기록 생성/삭제/과거 날짜 갱신/전체 재계산"""
+from datetime import date, datetime
+
+import pytest
+
+from models.daily_emotion_rollup import DailyEmotionRollup
+from models.record import Record
+from models.user import User
+from services.daily_rollup_service import DailyRollupService
+from services.emotion_color_service import EmotionColorService
+from services.record_service import RecordService
+
+
+def _analysis(emotion, intensity):
+    return {"primary_emotion": emotion, "intensity": intensity,
+            "color": EmotionColorService._get_color_with_intensity(emotion, intensity)}
+
+
+def _add_record(db, created_at, emotion="기쁨", intensity=5, record_date=None, user_id=1, **fields):
+    record = Record(user_id=user_id, content=f"{emotion} 기록", emotion_analysis=_analysis(emotion, intensity),
+                    created_at=created_at, record_date=record_date or created_at.date(), **fields)
+    db.add(record)
+    db.flush()
+    return record
+
+
+def _rollups(db, user_id=1):
+    """{날짜: (대표 기록 id, 기록 수, 주감정, 강도, (R, G, B), 수면, 스트레스)}"""
+    return {
+        r.date: (r.record_id, r.record_count, r.primary_emotion, r.intensity,
+                 (r.color_r, r.color_g, r.color_b), r.sleep_score, r.stress_score)
+        for r in db.query(DailyEmotionRollup).filter(DailyEmotionRollup.user_id == user_id)
+    }
+
+
+@pytest.fixture
+def user(db):
+    db.add(User(id=1, email="rollup@example.com", nickname="rollup", is_developer=True))
+    db.add(User(id=2, email="other@example.com", nickname="other"))
+    db.commit()
+    return 1
+
+
+@pytest.fixture
+def local_analysis(monkeypatch):
+    """AI 호출 없이 본문 키워드 분석 결과로 저장"""
+    def analyze(content):
+        return ["키워드"], "요약", EmotionColorService.analyze_emotion_from_text(content)
+    monkeypatch.setattr(RecordService, "_analyze_content", staticmethod(analyze))
+
+
+def test_create_record_writes_rollup(db, user, local_analysis):
+    record = RecordService.create_record(db, user, "오늘은 정말 기쁘고 행복했다", sleep_score=7, stress_score=2)
+
+    rollup = db.query(DailyEmotionRollup).one()
+    assert (rollup.user_id, rollup.date) == (user, record.record_date)
+    assert rollup.record_id == record.id
+    assert rollup.record_count == 1
+    assert rollup.primary_emotion == record.emotion_analysis["primary_emotion"]
+    assert [rollup.color_r, rollup.color_g, rollup.color_b] == list(record.emotion_analysis["color"]["rgb"])
+    assert (rollup.sleep_score, rollup.stress_score) == (7, 2)
+
+    # 같은 날 두 번째 기록(개발자 모드) → 같은 행을 갱신, 대표 기록은 나중 기록
+    second = RecordService.create_record(db, user, "눈물이 나고 슬펐다", sleep_score=3)
+    rollup = db.query(DailyEmotionRollup).one()
+    assert (rollup.record_id, rollup.record_count, rollup.sleep_score) == (second.id, 2, 3)
+
+
+def test_delete_record_recomputes_or_removes_rollup(db, user):
+    first = _add_record(db, datetime(2026, 3, 1, 9, 0), "기쁨", 4)
+    second = _add_record(db, datetime(2026, 3, 1, 21, 0), "분노", 8)
+    other_day = _add_record(db, datetime(2026, 3, 2, 9, 0), "신뢰", 6)
+    DailyRollupService.rebuild_user(db, user)
+    db.commit()
+
+    # 그날 마지막 기록 삭제 → 남은 기록이 대표
+    assert RecordService.delete_record(db, second.id, user)
+    rollups = _rollups(db)
+    assert rollups[date(2026, 3, 1)][:4] == (first.id, 1, "기쁨", 4)
+
+    # 그날 마지막 남은 기록 삭제 → 롤업 행 삭제, 다른 날은 그대로
+    assert RecordService.delete_record(db, first.id, user)
+    rollups = _rollups(db)
+    assert date(2026, 3, 1) not in rollups
+    assert rollups[date(2026, 3, 2)][:3] == (other_day.id, 1, "신뢰")
+
+
+def test_past_dated_refresh_upserts_latest_record(db, user):
+    day = date(2025, 12, 31)
+    assert DailyRollupService.refresh_day(db, user, day) is None
+
+    # 과거 날짜 기록 → 롤업 생성 (upsert insert)
+    morning = _add_record(db, datetime(2025, 12, 31, 8, 0), "슬픔", 3, sleep_score=4)
+    rollup = DailyRollupService.refresh_record(db, morning)
+    assert (rollup.date, rollup.record_id, rollup.record_count, rollup.primary_emotion) == (day, morning.id, 1, "슬픔")
+
+    # 나중에 만들어졌지만(id가 더 큼) 작성 시각이 더 이른 기록 → 대표는 작성 시각이 가장 늦은 기록 (upsert update)
+    earlier = _add_record(db, datetime(2025, 12, 31, 6, 0), "두려움", 9)
+    rollup = DailyRollupService.refresh_record(db, earlier)
+    assert (rollup.record_id, rollup.record_count, rollup.primary_emotion, rollup.sleep_score) == (morning.id, 2, "슬픔", 4)
+    assert db.query(DailyEmotionRollup).count() == 1
+
+    # 같은 작성 시각이면 id가 큰 기록
+    tie = _add_record(db, datetime(2025, 12, 31, 8, 0), "기대", 7)
+    rollup = DailyRollupService.refresh_day(db, user, day)
+    assert (rollup.record_id, rollup.record_count, rollup.primary_emotion) == (tie.id, 3, "기대")
+
+    # 날짜는 created_at이 아니라 record_date 기준 (서비스 시간대 작성일)
+    late_night = _add_record(db, datetime(2025, 12, 31, 23, 0), "분노", 10, record_date=date(2026, 1, 1))
+    DailyRollupService.refresh_record(db, late_night)
+    rollups = _rollups(db)
+    assert rollups[day][0] == tie.id
+    assert rollups[date(2026, 1, 1)][:3] == (late_night.id, 1, "분노")
+
+
+def test_refresh_records_covers_each_day_once(db, user):
+    records = [
+        _add_record(db, datetime(2026, 2, 1, 9, 0)),
+        _add_record(db, datetime(2026, 2, 1, 10, 0)),
+        _add_record(db, datetime(2026, 2, 2, 9, 0)),
+        _add_record(db, datetime(2026, 2, 2, 9, 0), user_id=2),
+    ]
+    assert DailyRollupService.refresh_records(db, [r.id for r in records]) == 3
+    assert DailyRollupService.refresh_records(db, []) == 0
+    assert _rollups(db)[date(2026, 2, 1)][:2] == (records[1].id, 2)
+    assert _rollups(db, user_id=2)[date(2026, 2, 2)][:2] == (records[3].id, 1)
+
+
+def test_rebuild_user_matches_refresh_day(db, user):
+    _add_record(db, datetime(2026, 1, 5, 9, 0), "기쁨", 3, sleep_score=5)
+    _add_record(db, datetime(2026, 1, 5, 22, 0), "슬픔", 6, stress_score=9)
+    _add_record(db, datetime(2026, 1, 5, 22, 0), "혐오", 2)
+    _add_record(db, datetime(2026, 1, 7, 12, 0), "놀람", 8)
+    _add_record(db, datetime(2026, 1, 9, 1, 0), "신뢰", 1, record_date=date(2026, 1, 8))
+    _add_record(db, datetime(2026, 1, 9, 12, 0), "기대", 5, user_id=2)
+    days = [date(2026, 1, 5), date(2026, 1, 7), date(2026, 1, 8)]
+
+    for day in days:
+        DailyRollupService.refresh_day(db, user, day)
+    db.flush()
+    refreshed = _rollups(db)
+
+    assert DailyRollupService.rebuild_user(db, user) == 3
+    db.flush()
+    assert _rollups(db) == refreshed
+    assert sorted(refreshed) == days
+    # 다른 사용자 롤업은 만들지 않음
+    assert _rollups(db, user_id=2) == {}
+
+
+def test_rebuild_user_from_start_day_keeps_earlier_rollups(db, user):
+    old = _add_record(db, datetime(2026, 1, 1, 9, 0), "기쁨", 5)
+    recent = _add_record(db, datetime(2026, 1, 10, 9, 0), "분노", 7)
+    DailyRollupService.rebuild_user(db, user)
+    db.flush()
+
+    # 예전 날짜 롤업을 손으로 바꿔 두고, 최근 날짜에는 기록 없는 남은 롤업 추가
+    db.query(DailyEmotionRollup).filter(DailyEmotionRollup.date == date(2026, 1, 1)).update({"record_count": 99})
+    db.add(DailyEmotionRollup(user_id=user, date=date(2026, 1, 11), record_count=1))
+    db.flush()
+
+    assert DailyRollupService.rebuild_user(db, user, start_day=date(2026, 1, 5)) == 1
+    db.flush()
+    db.expire_all()
+    rollups = _rollups(db)
+    assert rollups[date(2026, 1, 1)][:2] == (old.id, 99)
+    assert rollups[date(2026, 1, 10)][:3] == (recent.id, 1, "분노")
+    assert date(2026, 1, 11) not in rollups
+
+
+def test_rollup_values_tolerates_malformed_analysis():
+    assert DailyRollupService.rollup_values(1, None, None, None) == {
+        "record_id": 1, "record_count": 1, "primary_emotion": None, "intensity": None,
+        "color_r": None, "color_g": None, "color_b": None, "sleep_score": None, "stress_score": None,
+    }
+    values = DailyRollupService.rollup_values(
+        2, {"primary_emotion": "", "intensity": "강함", "color": {"rgb": [1, 2]}}, 3, 4, record_count=2
+    )
+    assert (values["primary_emotion"], values["intensity"], values["color_r"]) == (None, None, None)
+    values = DailyRollupService.rollup_values(3, {"intensity": "7", "color": "red"}, None, None)
+    assert values["intensity"] == 7
@@ -0,0 +1,60 @@
+"""요청 마감 시간 (services/deadline.py) - 남은 예산으로 외부 호출 타임아웃 축소"""
+import pytest
+
+from services import deadline
+from services.deadline import DeadlineExceeded, call_timeout, deadline_budget, has_deadline, remaining_time
+
+
+@pytest.fixture(autouse=True)
+def fake_time(clock, monkeypatch):
+    monkeypatch.setattr(deadline, "time", clock)
+    return clock
+
+
+def test_without_budget_uses_client_default():
+    assert has_deadline() is False
+    assert remaining_time(12) == 12
+    assert call_timeout(30) == 30
+
+
+def test_timeout_shrinks_to_remaining_budget(clock):
+    with deadline_budget(10):
+        assert call_timeout(30) == 10
+        assert call_timeout(4) == 4
+        clock.advance(7)
+        assert call_timeout(30) == pytest.approx(3)
+        clock.advance(3)
+        with pytest.raises(DeadlineExceeded):
+            call_timeout(30)
+    assert has_deadline() is False
+
+
+def test_nested_budget_cannot_extend_outer(clock):
+    with deadline_budget(5):
+        with deadline_budget(20):
+            assert remaining_time() == 5
+        with deadline_budget(2):
+            assert remaining_time() == 2
+        assert remaining_time() == 5
+
+
+def test_openai_call_gets_remaining_budget(clock, monkeypatch):
+    from services.ai_analysis_service import AIAnalysisService
+    from services import ai_analysis_service
+
+    class _Client:
+        def __init__(self):
+            self.options = {}
+
+        def with_options(self, **kwargs):
+            self.options.update(kwargs)
+            return self
+
+    client = _Client()
+    monkeypatch.setattr(ai_analysis_service, "OPENAI_READ_TIMEOUT", 30.0)
+    with deadline_budget(25):
+        clock.advance(20)
+        used, timeout = AIAnalysisService._openai_call_options(client)
+    assert timeout == pytest.approx(5)
+    # 예산이 있으면 SDK 재시도로 마감 시간을 넘기지 않음
+    assert used.options == {"max_retries": 0}
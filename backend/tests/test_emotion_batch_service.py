@@ -0,0 +1,180 @@
+"""NumPy 일괄 감정 분석 (services/emotion_batch_service.py) - 단건 경로와 결과가 같은지"""
+import random
+
+import numpy as np
+import pytest
+
+from services.emotion_batch_service import EmotionBatchService, EMOTIONS
+from services.emotion_color_service import EmotionColorService
+from services.emotion_lexicon import LEXICON
+
+SCORE_KEYWORDS = [k for keywords in LEXICON["color_scores"].values() for k in keywords]
+OTHER_KEYWORDS = sorted({
+    k for group, labels in LEXICON.items() if group != "color_scores"
+    for keywords in labels.values() for k in keywords
+} - set(SCORE_KEYWORDS))
+
+TEXTS = [
+    "",
+    " ",
+    "오늘은 평범한 하루였다",
+    # 다른 그룹 키워드만 (점수와 무관 → 기쁨 0.1)
+    "스트레스 때문에 답답하고 후회된다",
+    # 여러 감정에 속한 키워드 (화나/짜증/분노/열받은 혐오와 분노 모두) → 동점이면 앞 열(혐오)
+    "짜증",
+    "화나고 열받아서 분노가 치민다",
+    # 분노에만 있는 키워드가 더해져 분노가 앞섬
+    "화가 폭발해서 열이 난다",
+    # 감정 사이 동점 (기쁨 1 : 슬픔 1), 기대 1 : 신뢰 1
+    "좋았지만 눈물이 났다",
+    "믿음과 기대",
+    # 많은 키워드 (강도 상한 10)
+    "기쁘고 행복하고 즐거워 웃으며 신나서 좋고 만족하며 감사하다",
+    "슬프고 우울하고 속상하고 서럽고 눈물 나고 비통하고 허전하다",
+    "무서워서 겁나고 불안하고 걱정되고 두려워 떨리고 긴장된다",
+    # 같은 키워드 반복은 한 번만
+    "행복 행복 행복 행복",
+]
+
+
+def _random_texts(count: int, seed: int = 11):
+    rnd = random.Random(seed)
+    vocabulary = SCORE_KEYWORDS + OTHER_KEYWORDS + list("가나다 오늘,.")
+    return ["".join(rnd.choice(vocabulary) for _ in range(rnd.randint(0, 15))) for _ in range(count)]
+
+
+def _assert_same_as_scalar(texts):
+    batch = EmotionBatchService.analyze_texts(texts)
+    results = EmotionBatchService.to_results(batch)
+    assert len(results) == len(texts)
+    for text, result in zip(texts, results):
+        expected = EmotionColorService.analyze_emotion_from_text(text)
+        assert result == expected, text
+        # 점수 열 순서도 단건 결과의 감정 순서와 같아야 함
+        assert list(result["emotion_scores"]) == list(expected["emotion_scores"]) == EMOTIONS
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_analyze_texts_matches_scalar(text):
+    _assert_same_as_scalar([text])
+
+
+def test_analyze_texts_matches_scalar_in_one_batch():
+    _assert_same_as_scalar(TEXTS + _random_texts(3000))
+
+
+def test_empty_batch():
+    batch = EmotionBatchService.analyze_texts([])
+    assert batch["scores"].shape == (0, len(EMOTIONS))
+    assert EmotionBatchService.to_results(batch) == []
+
+
+def test_ties_pick_first_emotion_column():
+    batch = EmotionBatchService.analyze_texts(["짜증", "좋았지만 눈물이 났다"])
+    assert batch["primary_emotion"] == ["혐오", "기쁨"]
+
+
+def _color_record(rgb=None, intensity=5, **extra):
+    color = {"intensity": intensity}
+    if rgb is not None:
+        color["rgb"] = list(rgb)
+    return dict({"color": color}, **extra)
+
+
+def _assert_average_colors_same_as_scalar(records_by_key):
+    keys, rgbs, intensities = EmotionBatchService.columns_from_records(records_by_key)
+    results = EmotionBatchService.average_colors(keys, rgbs, intensities)
+    assert set(results) == set(records_by_key)
+    for key, records in records_by_key.items():
+        assert results[key] == EmotionColorService.get_average_emotion_color(records), key
+
+
+def test_average_colors_truncates_average_rgb():
+    # 채널 합/개수 = 100.5, 50.67, 0.33 → 버림
+    records = {1: [_color_record((100, 50, 1)), _color_record((101, 51, 0)), _color_record((100, 51, 0))]}
+    keys, rgbs, intensities = EmotionBatchService.columns_from_records(records)
+    assert EmotionBatchService.average_colors(keys, rgbs, intensities) == {
+        1: EmotionColorService._representative_color((100, 50, 0), 5, 3)
+    }
+    _assert_average_colors_same_as_scalar({
+        1: [_color_record((255, 0, 0)), _color_record((0, 0, 254))],
+        2: [_color_record((1, 2, 3)), _color_record((2, 3, 4)), _color_record((2, 3, 4))],
+    })
+
+
+def test_average_colors_rounds_intensity_half_to_even():
+    # 평균 강도 2.5 → 2, 3.5 → 4, 5.5 → 6, 6.5 → 6
+    records = {
+        "a": [_color_record((200, 10, 10), 2), _color_record((200, 10, 10), 3)],
+        "b": [_color_record((200, 10, 10), 3), _color_record((200, 10, 10), 4)],
+        "c": [_color_record((200, 10, 10), 5), _color_record((200, 10, 10), 6)],
+        "d": [_color_record((200, 10, 10), 6), _color_record((200, 10, 10), 7)],
+    }
+    keys, rgbs, intensities = EmotionBatchService.columns_from_records(records)
+    results = EmotionBatchService.average_colors(keys, rgbs, intensities)
+    assert {key: result["average_intensity"] for key, result in results.items()} == {
+        "a": 2.0, "b": 4.0, "c": 6.0, "d": 6.0,
+    }
+    _assert_average_colors_same_as_scalar(records)
+
+
+def test_average_colors_records_without_color():
+    # 색 정보가 없는 기록은 NaN 행 → 평균 RGB에서는 빠지고 강도 평균에는 포함
+    records = {1: [_color_record((10, 200, 10), 9), _color_record(None, 1), {"intensity": 2}, {}]}
+    keys, rgbs, intensities = EmotionBatchService.columns_from_records(records)
+    assert np.isnan(rgbs[1:]).all() and not np.isnan(rgbs[0]).any()
+    assert intensities.tolist() == [9, 1, 2, 5]
+    _assert_average_colors_same_as_scalar(records)
+
+
+def test_average_colors_non_int_intensity_becomes_five():
+    records = {
+        1: [_color_record((10, 10, 200), "강함"), _color_record((10, 10, 200), None)],
+        2: [_color_record((10, 10, 200), "7"), _color_record((10, 10, 200), 8.9)],
+        3: [_color_record((10, 10, 200), 1), {"color": {"rgb": [10, 10, 200]}, "intensity": "x"}],
+    }
+    _, _, intensities = EmotionBatchService.columns_from_records(records)
+    assert intensities.tolist() == [5, 5, 7, 8, 1, 5]
+    _assert_average_colors_same_as_scalar(records)
+
+
+def test_average_colors_group_without_rgb_falls_back():
+    records = {
+        1: [_color_record(None, 9), {"color": {"rgb": [1, 2]}}],
+        2: [_color_record((120, 40, 200), 3)],
+    }
+    keys, rgbs, intensities = EmotionBatchService.columns_from_records(records)
+    results = EmotionBatchService.average_colors(keys, rgbs, intensities)
+    assert results[1] == EmotionColorService._get_color_with_intensity("기쁨", 5)
+    _assert_average_colors_same_as_scalar(records)
+
+
+def test_average_colors_composite_keys():
+    # (사용자, 주 번호) 복합 키 → 결과 키는 튜플
+    records = {
+        (1, 40): [_color_record((250, 10, 10), 8), _color_record((240, 30, 10), 7)],
+        (1, 41): [_color_record((10, 10, 250), 2)],
+        (2, 40): [_color_record(None, 4)],
+        (2, 41): [_color_record((10, 250, 10), 5), _color_record((200, 200, 10), 6)],
+    }
+    keys, _, _ = EmotionBatchService.columns_from_records(records)
+    assert keys.shape == (6, 2)
+    _assert_average_colors_same_as_scalar(records)
+
+
+def test_average_colors_random_groups_match_scalar():
+    rnd = random.Random(5)
+    records = {}
+    for user_id in range(60):
+        group = []
+        for _ in range(rnd.randint(1, 12)):
+            roll = rnd.random()
+            rgb = None if roll < 0.1 else tuple(rnd.randint(0, 255) for _ in range(3))
+            intensity = rnd.choice([rnd.randint(1, 10), rnd.randint(1, 10), "?", None, 2.5])
+            group.append(_color_record(rgb, intensity))
+        records[user_id] = group
+    _assert_average_colors_same_as_scalar(records)
+
+
+def test_average_colors_empty():
+    assert EmotionBatchService.average_colors([], np.empty((0, 3)), []) == {}
@@ -0,0 +1,44 @@
+"""감정 API 디버그 엔드포인트 (controllers/emotion_controller.py) - AI 지표 초기화 권한"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from controllers.emotion_controller import router
+from models.user import User
+from services.ai_metrics import ai_metrics
+from services.user_service import get_current_user
+
+
+@pytest.fixture
+def client_as():
+    def _client(is_developer: bool) -> TestClient:
+        app = FastAPI()
+        app.include_router(router)
+        app.dependency_overrides[get_current_user] = lambda: User(id=1, nickname="u", is_developer=is_developer)
+        return TestClient(app)
+
+    ai_metrics.reset()
+    yield _client
+    ai_metrics.reset()
+
+
+def _calls() -> int:
+    return ai_metrics.snapshot()["totals"]["calls"]
+
+
+def test_metrics_get_does_not_reset(client_as):
+    ai_metrics.observe("openai", "test", 0.1)
+    response = client_as(False).get("/emotions/debug/ai-metrics", params={"reset": "true"})
+    assert response.status_code == 200
+    assert _calls() == 1
+
+
+def test_reset_requires_developer(client_as):
+    ai_metrics.observe("openai", "test", 0.1)
+    assert client_as(False).post("/emotions/debug/ai-metrics/reset").status_code == 403
+    assert _calls() == 1
+
+    response = client_as(True).post("/emotions/debug/ai-metrics/reset")
+    assert response.status_code == 200
+    assert response.json()["totals"]["calls"] == 1
+    assert _calls() == 0
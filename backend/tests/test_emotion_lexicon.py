@@ -0,0 +1,211 @@
+"""키워드 사전 매처 (services/emotion_lexicon.py)
+Aho-Corasick 매칭 결과가 예전 `keyword in text` 반복문과 같은지 - 매처 단위와 네 가지 폴백 함수 단위로 비교"""
+import random
+
+import pytest
+
+from services import emotion_lexicon
+from services.emotion_lexicon import LEXICON, KeywordMatcher
+from services.ai_analysis_service import AIAnalysisService
+from services.emotion_color_service import EmotionColorService
+from services.record_service import RecordService
+
+ALL_KEYWORDS = sorted({k for groups in LEXICON.values() for keywords in groups.values() for k in keywords})
+
+FIXED_TEXTS = [
+    "",
+    "   ",
+    "오늘은 평범한 하루",
+    "ABC 기쁨 😀",
+    # 겹치는 키워드: 화/화나/화남/화가남, 싫/싫어/싫음, 힘들/힘들어, 피곤/피곤해, 놀라/놀람/놀라움
+    "화가남. 정말 화나고 싫어서 싫음",
+    "힘들어서 피곤해, 지쳐서 지치고 힘들다",
+    "놀라움과 놀람, 그리고 놀라서 깜짝",
+    # 여러 그룹/감정에 같은 키워드 (두려움, 불안, 걱정, 짜증, 분노, 기대, 희망, 신뢰, 안전)
+    "두려움과 불안, 걱정, 짜증, 분노가 뒤섞였다",
+    "기대와 희망, 신뢰와 안전을 느꼈다",
+    # 부정/긍정 동점, 부정 세부 감정 우선순위
+    "좋은데 답답하다",
+    "충격적이고 신기했지만 무섭고 걱정된다",
+    "죽고싶을 만큼 절망적이고 무기력하다",
+    "행복행복행복 좋좋좋",
+    "미래 계획을 준비하며 새로운 꿈을 꾼다",
+]
+
+
+def _random_texts(count: int, seed: int = 7):
+    """키워드 조각과 일반 글자를 섞은 본문 (겹침/이어붙임이 자주 생기도록)"""
+    rnd = random.Random(seed)
+    filler = list("가나다라 오늘은하루였다 ,.!?") + ["", " "]
+    texts = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rnd.randint(0, 12)):
+            if rnd.random() < 0.6:
+                keyword = rnd.choice(ALL_KEYWORDS)
+                # 키워드 일부만 넣어 부분 일치도 섞음
+                if rnd.random() < 0.2 and len(keyword) > 1:
+                    keyword = keyword[:rnd.randint(1, len(keyword) - 1)]
+                parts.append(keyword)
+            else:
+                parts.append(rnd.choice(filler))
+        texts.append("".join(parts))
+    return texts
+
+
+RANDOM_TEXTS = _random_texts(500)
+
+
+# ----- 예전 구현 (키워드 사전 도입 전 코드 그대로) -----
+def _old_color_scores(content):
+    emotion_keywords = {
+        "기쁨": ["기쁘", "행복", "즐거", "웃", "신나", "좋", "만족", "감사"],
+        "신뢰": ["믿", "안전", "안정", "확신", "신뢰", "의지"],
+        "두려움": ["무서", "겁", "불안", "걱정", "두려", "떨", "긴장"],
+        "놀람": ["놀라", "깜짝", "예상", "갑작", "충격", "놀람"],
+        "슬픔": ["슬프", "우울", "속상", "서럽", "눈물", "비통", "허전"],
+        "혐오": ["싫", "역겨", "불쾌", "짜증", "화나", "분노", "열받"],
+        "분노": ["화나", "열받", "짜증", "분노", "화", "열", "폭발"],
+        "기대": ["기대", "희망", "꿈", "미래", "계획", "준비", "새로운"]
+    }
+    scores = {emotion: 0.0 for emotion in emotion_keywords.keys()}
+    for emotion, keywords in emotion_keywords.items():
+        for keyword in keywords:
+            if keyword in content:
+                scores[emotion] += 0.3
+    if max(scores.values()) == 0:
+        scores["기쁨"] = 0.1
+    return scores
+
+
+def _old_fallback_emotion(content):
+    negative_keywords = {
+        '힘들', '어렵', '스트레스', '피곤', '지치', '불안', '걱정', '우울', '슬픔',
+        '화나', '짜증', '답답', '절망', '무기력', '의미없', '싫', '혐오', '두려움',
+        '무섭', '놀람', '충격', '실망', '후회', '미안', '죄송', '부끄러', '창피',
+        '죽고싶', '자살', '끝내', '그만', '싫어', '힘들어', '지쳐', '피곤해'
+    }
+    positive_keywords = {
+        '기쁘', '행복', '즐겁', '신나', '좋', '만족', '감사', '희망', '기대',
+        '설렘', '신뢰', '안전', '편안', '평온', '차분', '여유', '성취', '성공',
+        '자랑', '뿌듯', '감동', '감탄', '놀라', '신기', '재미', '웃음'
+    }
+    content_lower = content.lower()
+    negative_score = sum(1 for keyword in negative_keywords if keyword in content_lower)
+    positive_score = sum(1 for keyword in positive_keywords if keyword in content_lower)
+    if negative_score > positive_score:
+        if any(k in content_lower for k in ['힘들', '지치', '피곤', '무기력', '절망', '죽고싶']):
+            primary_emotion = "슬픔"
+        elif any(k in content_lower for k in ['화나', '짜증', '답답']):
+            primary_emotion = "분노"
+        elif any(k in content_lower for k in ['불안', '걱정', '두려움', '무섭']):
+            primary_emotion = "두려움"
+        elif any(k in content_lower for k in ['놀람', '충격', '신기']):
+            primary_emotion = "놀람"
+        else:
+            primary_emotion = "슬픔"
+        intensity = min(10, max(1, negative_score * 2))
+    elif positive_score > negative_score:
+        primary_emotion = "기쁨"
+        intensity = min(10, max(1, positive_score * 2))
+    else:
+        primary_emotion = "신뢰" if negative_score == 0 and positive_score == 0 else "슬픔"
+        intensity = 5
+    return primary_emotion, intensity, negative_score, positive_score
+
+
+def _old_extract_keywords_fallback(content):
+    emotion_keywords = {
+        '기쁨': ['기쁨', '행복', '즐거움', '신남', '좋음', '만족', '감사', '희망', '기대'],
+        '슬픔': ['슬픔', '우울', '힘듦', '지침', '피곤', '무기력', '절망', '실망'],
+        '분노': ['분노', '화남', '짜증', '답답', '열받음', '화가남'],
+        '두려움': ['두려움', '불안', '걱정', '무섭', '긴장', '스트레스'],
+        '놀람': ['놀람', '충격', '예상외', '신기', '놀라움'],
+        '신뢰': ['신뢰', '안전', '편안', '평온', '차분', '여유'],
+        '혐오': ['혐오', '싫음', '불쾌', '역겨움'],
+        '기대': ['기대', '설렘', '희망', '미래', '꿈']
+    }
+    content_lower = content.lower()
+    found_keywords = []
+    for emotion, keywords in emotion_keywords.items():
+        for keyword in keywords:
+            if keyword in content_lower:
+                found_keywords.append(keyword)
+                break
+    primary_emotion = _old_fallback_emotion(content)[0]
+    if primary_emotion not in found_keywords:
+        found_keywords.insert(0, primary_emotion)
+    if not found_keywords:
+        found_keywords.append(primary_emotion)
+    return found_keywords[:5]
+
+
+def _old_record_keywords(content):
+    emotion_keywords = [
+        '기쁨', '신뢰', '두려움', '놀람', '슬픔', '혐오', '분노', '기대',
+        '행복', '안전', '불안', '예상', '우울', '짜증', '화남', '희망'
+    ]
+    keywords = [keyword for keyword in emotion_keywords if keyword in content]
+    if len(keywords) == 0:
+        keywords = ['일상', '감정기록']
+    return keywords[:5]
+
+
+# ----- 매처 단위 -----
+def _assert_match_equals_substring_loops(text):
+    match = emotion_lexicon.match(text)
+    for group, labels in LEXICON.items():
+        expected_hits = {label: [k for k in keywords if k in text] for label, keywords in labels.items()}
+        assert match.hits(group) == expected_hits
+        assert match.counts(group) == {label: len(hits) for label, hits in expected_hits.items()}
+        expected_first = next((label for label, hits in expected_hits.items() if hits), "없음")
+        assert match.first_label(group, "없음") == expected_first
+
+
+@pytest.mark.parametrize("text", FIXED_TEXTS)
+def test_match_equals_substring_loops(text):
+    _assert_match_equals_substring_loops(text)
+
+
+def test_match_equals_substring_loops_random():
+    for text in RANDOM_TEXTS:
+        _assert_match_equals_substring_loops(text)
+
+
+def test_matcher_handles_overlapping_patterns():
+    patterns = ["a", "ab", "abc", "bc", "c", "bca", "caa", "aa"]
+    matcher = KeywordMatcher(patterns)
+    rnd = random.Random(3)
+    for _ in range(2000):
+        text = "".join(rnd.choice("abcx") for _ in range(rnd.randint(0, 10)))
+        assert matcher.find(text) == {p for p in patterns if p in text}, text
+
+
+def test_lexicon_has_no_duplicate_keywords_within_a_label():
+    # counts()는 키워드 목록 기준이므로 같은 분류에 중복이 있으면 예전 집합(set) 기준 점수와 달라짐
+    for group, labels in LEXICON.items():
+        for label, keywords in labels.items():
+            assert len(keywords) == len(set(keywords)), (group, label)
+
+
+# ----- 폴백 함수 단위 -----
+def _assert_fallbacks_match(text):
+    assert EmotionColorService._analyze_emotion_keywords(text) == _old_color_scores(text)
+
+    primary_emotion, intensity, negative_score, positive_score = _old_fallback_emotion(text)
+    result = AIAnalysisService.analyze_emotion_fallback(text)
+    assert (result["primary_emotion"], result["intensity"]) == (primary_emotion, intensity)
+    assert result["reasoning"].startswith(f"키워드 분석 결과: 부정({negative_score}), 긍정({positive_score})")
+
+    assert AIAnalysisService._extract_keywords_fallback(text) == _old_extract_keywords_fallback(text)
+    assert RecordService._extract_keywords(text) == _old_record_keywords(text)
+
+
+@pytest.mark.parametrize("text", FIXED_TEXTS)
+def test_fallbacks_match_previous_implementation(text):
+    _assert_fallbacks_match(text)
+
+
+def test_fallbacks_match_previous_implementation_random():
+    for text in RANDOM_TEXTS:
+        _assert_fallbacks_match(text)
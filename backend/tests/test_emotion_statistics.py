@@ -0,0 +1,132 @@
+"""감정 통계 (RecordService.get_emotion_statistics) - SQL 집계가 이전 Python 집계와 같은 결과인지"""
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from models.record import Record
+from models.user import User
+from services.emotion_color_service import EmotionColorService
+from services.record_service import RecordService
+
+EMOTIONS = list(EmotionColorService.EMOTION_COLORS)
+
+
+def python_statistics(db, user_id, days):
+    """이전 구현: 기간 내 기록 전체를 읽어 Python에서 집계"""
+    records = RecordService.get_user_records_by_period(db, user_id, days)
+    if not records:
+        return {
+            "period": days,
+            "record_count": 0,
+            "average_color": EmotionColorService._get_color_with_intensity("기쁨", 5),
+            "emotion_distribution": {},
+            "message": f"지난 {days}일간의 기록이 없습니다."
+        }
+    emotion_distribution = {}
+    for record in records:
+        if record.emotion_analysis:
+            emotion = record.emotion_analysis.get("primary_emotion", "기쁨")
+            emotion_distribution[emotion] = emotion_distribution.get(emotion, 0) + 1
+    emotion_records = [
+        {"color": record.emotion_analysis.get("color", {})}
+        for record in records if record.emotion_analysis
+    ]
+    average_color = EmotionColorService.get_average_emotion_color(emotion_records)
+    return {
+        "period": days,
+        "record_count": len(records),
+        "average_color": average_color,
+        "emotion_distribution": emotion_distribution,
+        "message": f"지난 {days}일간의 평균 감정색은 {average_color['name']}입니다."
+    }
+
+
+def _assert_same(db, user_id, days):
+    expected = python_statistics(db, user_id, days)
+    actual = RecordService.get_emotion_statistics(db, user_id, days)
+    assert actual == expected
+    # 분포는 최근에 나온 감정부터 (키 순서까지 같아야 함)
+    assert list(actual["emotion_distribution"]) == list(expected["emotion_distribution"])
+
+
+def _add(db, analysis, hours_ago, user_id=1):
+    db.add(Record(user_id=user_id, content="기록", emotion_analysis=analysis,
+                  created_at=datetime.now() - timedelta(hours=hours_ago)))
+
+
+@pytest.fixture
+def user(db):
+    db.add(User(id=1, email="stats@example.com", nickname="stats"))
+    db.commit()
+    return 1
+
+
+def test_no_records(db, user):
+    _assert_same(db, user, 7)
+
+
+@pytest.mark.parametrize("analysis", [
+    # primary_emotion이 없는 예전 기록 → 기쁨
+    {"color": EmotionColorService._get_color_with_intensity("슬픔", 3)},
+    {"color": {"rgb": [200, 10, 30]}},
+    {"intensity": 4},
+    # 목록에 없는 감정 이름은 그대로 집계
+    {"primary_emotion": "평온", "color": {"rgb": [120, 200, 120], "intensity": 2}},
+    {"primary_emotion": "평온"},
+    # primary_emotion이 null
+    {"primary_emotion": None, "color": {"rgb": [10, 20, 30], "intensity": 7}},
+    {"primary_emotion": None},
+    # 분석 결과가 없거나 비어 있음 → 개수에만 포함
+    None,
+    {},
+    # 강도 형식이 다름
+    {"primary_emotion": "분노", "color": {"rgb": [250, 0, 0], "intensity": "8"}},
+    {"primary_emotion": "분노", "color": {"rgb": [250, 0, 0], "intensity": 6.7}},
+    {"primary_emotion": "분노", "color": {"rgb": [250, 0, 0], "intensity": "강함"}},
+    {"primary_emotion": "분노", "color": {"rgb": [250, 0, 0], "intensity": None}},
+    # RGB 형식이 다름
+    {"primary_emotion": "신뢰", "color": {"rgb": [1, 2]}},
+    {"primary_emotion": "신뢰", "color": {"name": "초록"}},
+])
+def test_unusual_analysis_matches_python(db, user, analysis):
+    _add(db, {"primary_emotion": "기쁨", "color": EmotionColorService._get_color_with_intensity("기쁨", 9)}, 30)
+    _add(db, analysis, 2)
+    _add(db, {"primary_emotion": "슬픔", "color": EmotionColorService._get_color_with_intensity("슬픔", 4)}, 1)
+    db.commit()
+    _assert_same(db, user, 7)
+
+
+def test_only_unanalyzed_records(db, user):
+    _add(db, None, 1)
+    _add(db, {}, 2)
+    db.commit()
+    _assert_same(db, user, 7)
+
+
+def test_random_records_match_python(db):
+    rnd = random.Random(2)
+    for user_id in range(1, 11):
+        db.add(User(id=user_id, email=f"u{user_id}@example.com", nickname=f"u{user_id}"))
+    db.flush()
+    for user_id in range(1, 11):
+        for _ in range(rnd.randint(0, 30)):
+            emotion = rnd.choice(EMOTIONS)
+            intensity = rnd.randint(1, 10)
+            roll = rnd.random()
+            if roll < 0.05:
+                analysis = None
+            elif roll < 0.1:
+                analysis = {"primary_emotion": None, "color": {"rgb": [10, 20, 30]}}
+            elif roll < 0.15:
+                analysis = {"primary_emotion": "평온", "color": {"name": "x"}}
+            elif roll < 0.2:
+                analysis = {"color": EmotionColorService._get_color_with_intensity(emotion, intensity)}
+            else:
+                analysis = {"primary_emotion": emotion, "intensity": intensity,
+                            "color": EmotionColorService._get_color_with_intensity(emotion, intensity)}
+            _add(db, analysis, rnd.uniform(0, 35 * 24), user_id)
+    db.commit()
+    for user_id in range(1, 11):
+        for days in (7, 14, 30):
+            _assert_same(db, user_id, days)
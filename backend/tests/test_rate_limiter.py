@@ -0,0 +1,146 @@
+"""OpenAI 속도 제한 (services/rate_limiter.py) - 주입한 시계로 버킷 보충, 우선순위 예약분, 대기열 포기, 사용량 보정 확인"""
+import pytest
+
+from services import rate_limiter
+from services.rate_limiter import (
+    RateLimiter, RateLimitShed, INTERACTIVE, BACKGROUND, COSMETIC, current_priority
+)
+
+
+@pytest.fixture(autouse=True)
+def max_waits(monkeypatch):
+    """환경 변수와 상관없이 기본 대기 시간 사용"""
+    for priority, seconds in ((INTERACTIVE, 10.0), (BACKGROUND, 60.0), (COSMETIC, 0.0)):
+        monkeypatch.setitem(rate_limiter.PRIORITIES[priority], "max_wait", seconds)
+
+
+def _limiter(clock, rpm=60, tpm=1_000_000, queue_size=10):
+    # sleep이 시계를 앞으로 돌리므로 대기도 즉시 끝남
+    # (실제 sleep처럼 최소 1ms는 흐르게 함 - 부동소수 오차로 남은 극소 대기가 시계를 못 움직이는 것 방지)
+    return RateLimiter(rpm=rpm, tpm=tpm, queue_size=queue_size, clock=clock,
+                       sleep=lambda seconds: clock.advance(max(seconds, 0.001)))
+
+
+def _drain(limiter, requests):
+    for _ in range(requests):
+        limiter.acquire(1, INTERACTIVE)
+
+
+def test_bucket_refills_over_time(clock):
+    limiter = _limiter(clock, rpm=60)
+    _drain(limiter, 60)
+    assert limiter.stats()["available_requests"] == 0
+
+    started = clock.now
+    limiter.acquire(1, INTERACTIVE)
+    # 분당 60회 → 1초에 하나 보충
+    assert clock.now - started == pytest.approx(1.0, abs=0.25)
+    assert limiter.stats()["priorities"][INTERACTIVE]["waited"] == 1
+
+    clock.advance(3600)
+    assert limiter.stats()["available_requests"] == 60
+
+
+def test_token_bucket_limits_large_requests(clock):
+    limiter = _limiter(clock, rpm=1000, tpm=6000)
+    limiter.acquire(5000, INTERACTIVE)
+    started = clock.now
+    limiter.acquire(2000, INTERACTIVE)
+    # 1000 토큰 부족, 분당 6000 → 10초
+    assert clock.now - started == pytest.approx(10.0, abs=0.25)
+
+
+def test_lower_priorities_keep_a_reserve(clock):
+    limiter = _limiter(clock, rpm=10)
+    _drain(limiter, 8)
+
+    # cosmetic은 버킷의 50%가 남아야 하고 기다리지 않음
+    with pytest.raises(RateLimitShed):
+        limiter.acquire(1, COSMETIC)
+    # interactive는 예약분 없이 바로 사용
+    limiter.acquire(1, INTERACTIVE)
+    assert limiter.stats()["available_requests"] == 1
+
+    # background는 사용 후 20%(2회분)가 남아야 함 → 3회분이 모일 때까지(12초) 대기
+    started = clock.now
+    limiter.acquire(1, BACKGROUND)
+    assert clock.now - started == pytest.approx(12.0, abs=0.25)
+    stats = limiter.stats()["priorities"]
+    assert stats[COSMETIC]["shed"] == 1
+    assert stats[BACKGROUND]["waited"] == 1
+
+
+def test_wait_longer_than_max_wait_is_shed(clock, monkeypatch):
+    limiter = _limiter(clock, rpm=6)
+    _drain(limiter, 6)
+    # 다음 요청까지 10초, interactive 최대 대기 5초 → 기다리지 않고 바로 포기
+    monkeypatch.setitem(rate_limiter.PRIORITIES[INTERACTIVE], "max_wait", 5.0)
+    started = clock.now
+    with pytest.raises(RateLimitShed):
+        limiter.acquire(1, INTERACTIVE)
+    assert clock.now == started
+    assert limiter.stats()["waiting"] == 0
+
+
+def test_queue_serves_higher_priority_first(clock):
+    limiter = _limiter(clock, rpm=60)
+    _drain(limiter, 60)
+    background, background_give_up = limiter._start(1, BACKGROUND)
+    interactive, interactive_give_up = limiter._start(1, INTERACTIVE)
+    clock.advance(30)
+
+    # 먼저 도착했어도 background는 interactive 뒤
+    assert limiter._poll(background, background_give_up, clock.now) == pytest.approx(0.05)
+    assert limiter._poll(interactive, interactive_give_up, clock.now) == 0.0
+    assert limiter._poll(background, background_give_up, clock.now) == 0.0
+
+
+def test_full_queue_sheds_lowest_priority(clock):
+    limiter = _limiter(clock, rpm=60, queue_size=1)
+    _drain(limiter, 60)
+    background, give_up = limiter._start(1, BACKGROUND)
+
+    # 대기열이 가득 찼을 때 더 높은 우선순위가 오면 가장 낮은 대기자가 포기
+    interactive, _ = limiter._start(1, INTERACTIVE)
+    assert background.shed is True
+    with pytest.raises(RateLimitShed):
+        limiter._poll(background, give_up, clock.now)
+
+    # 같거나 낮은 우선순위는 들어오지 못하고 바로 포기
+    with pytest.raises(RateLimitShed):
+        limiter._start(1, BACKGROUND)
+    assert limiter.stats()["waiting"] == 1
+    assert limiter.stats()["priorities"][BACKGROUND]["shed"] == 1
+
+
+def test_settle_corrects_token_estimate(clock):
+    limiter = _limiter(clock, rpm=1000, tpm=6000)
+    limiter.acquire(1000, INTERACTIVE)
+    assert limiter.stats()["available_tokens"] == 5000
+
+    limiter.settle(1000, 200)  # 추정보다 적게 사용 → 환급
+    assert limiter.stats()["available_tokens"] == 5800
+    limiter.settle(1000, 1500)  # 추정보다 많이 사용 → 추가 차감
+    assert limiter.stats()["available_tokens"] == 5300
+    limiter.settle(1000, None)  # 사용량을 모르면 그대로
+    assert limiter.stats()["available_tokens"] == 5300
+    limiter.settle(10000, 0)  # 버킷 용량을 넘지 않음
+    assert limiter.stats()["available_tokens"] == 6000
+
+
+def test_background_analysis_runs_at_background_priority(monkeypatch):
+    from services.analysis_worker import RecordAnalysisWorker
+    from services.record_service import RecordService
+
+    seen = []
+
+    def complete(record_id, claimed=False):
+        seen.append(current_priority())
+        return True
+
+    monkeypatch.setattr(RecordService, "complete_record_analysis", staticmethod(complete))
+    worker = RecordAnalysisWorker(max_workers=1)
+    worker.submit(1)
+    assert worker.wait(1, 5)
+    assert seen == [BACKGROUND]
+    assert current_priority() == INTERACTIVE
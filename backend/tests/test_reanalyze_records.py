@@ -0,0 +1,76 @@
+"""과거 기록 일괄 재분석 (reanalyze_records.py) - llm 모드 실패 집계와 캐시 옵션"""
+import argparse
+
+import pytest
+
+import reanalyze_records
+from models.record import Record
+from models.user import User
+from services import ai_cache
+from services.ai_analysis_service import AIAnalysisService
+
+GOOD = {
+    "keywords": ["산책", "햇살"],
+    "summary": "산책하며 기분이 좋아진 하루",
+    "emotion": {"primary_emotion": "기쁨", "intensity": 6, "confidence": 0.9,
+                "reasoning": "긍정 표현", "color_name": "밝은 노랑"},
+}
+
+
+def _args(tmp_path, **kwargs):
+    values = dict(mode="llm", fields="keywords,summary,emotion", chunk_size=10, concurrency=2, processes=1,
+                  checkpoint=str(tmp_path / "checkpoint.json"), reset=True, retry_failed=False, user_id=None,
+                  start_id=0, end_id=None, limit=None, dry_run=False, no_cache=False)
+    values.update(kwargs)
+    return argparse.Namespace(**values)
+
+
+@pytest.fixture
+def records(session_local, monkeypatch):
+    monkeypatch.setattr(reanalyze_records, "SessionLocal", session_local)
+    db = session_local()
+    db.add(User(id=1, email="re@example.com", nickname="re"))
+    db.flush()
+    for content in ("좋은 하루", "주감정 없음", "요약 없음"):
+        db.add(Record(user_id=1, content=content, ai_summary="예전 요약"))
+    db.commit()
+    ids = {record.content: record.id for record in db.query(Record)}
+    db.close()
+    return ids
+
+
+def test_incomplete_llm_results_are_failures(tmp_path, session_local, records, monkeypatch):
+    responses = {
+        "좋은 하루": GOOD,
+        "주감정 없음": dict(GOOD, emotion={"intensity": 3, "reasoning": "?"}),
+        "요약 없음": dict(GOOD, summary="  "),
+    }
+    monkeypatch.setattr(AIAnalysisService, "analyze_record_with_gpt4o", staticmethod(responses.get))
+
+    reanalyze_records.run(_args(tmp_path))
+
+    checkpoint = reanalyze_records.load_checkpoint(str(tmp_path / "checkpoint.json"))
+    assert checkpoint["updated"] == 1
+    assert sorted(checkpoint["failed_ids"]) == sorted([records["주감정 없음"], records["요약 없음"]])
+
+    db = session_local()
+    rows = {record.content: record for record in db.query(Record)}
+    assert rows["좋은 하루"].emotion_primary == "기쁨"
+    assert rows["좋은 하루"].ai_summary == GOOD["summary"]
+    # 실패한 기록은 폴백 결과로 덮어쓰지 않음
+    assert rows["주감정 없음"].ai_summary == "예전 요약"
+    assert rows["주감정 없음"].emotion_analysis is None
+    db.close()
+
+
+@pytest.mark.parametrize("no_cache, expected", [(False, (True, False)), (True, (False, False))])
+def test_llm_mode_cache_options(tmp_path, records, monkeypatch, no_cache, expected):
+    seen = []
+
+    def analyze(content):
+        seen.append(ai_cache._options.get())
+        return GOOD
+
+    monkeypatch.setattr(AIAnalysisService, "analyze_record_with_gpt4o", staticmethod(analyze))
+    reanalyze_records.run(_args(tmp_path, no_cache=no_cache))
+    assert seen and set(seen) == {expected}
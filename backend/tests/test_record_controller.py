@@ -0,0 +1,85 @@
+"""기록 목록 API (controllers/record_controller.py) - view에 따라 응답 모델을 명시적으로 고르는지"""
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from controllers.record_controller import router
+from database import get_db
+from models.record import Record
+from models.user import User
+from services.emotion_color_service import EmotionColorService
+from services.user_service import get_current_user
+
+FULL_FIELDS = {"content", "ai_keywords", "emotion_analysis"}
+COMPACT_FIELDS = {"record_date", "emotion_primary", "emotion_intensity", "emotion_color_hex"}
+
+
+@pytest.fixture
+def client(db):
+    db.add(User(id=1, email="list@example.com", nickname="list"))
+    db.flush()
+    now = datetime.now()
+    for i in range(3):
+        db.add(Record(
+            user_id=1, content=f"기록 {i}", ai_keywords=["기쁨"], ai_summary=f"요약 {i}",
+            emotion_analysis={"primary_emotion": "기쁨", "color": EmotionColorService._get_color_with_intensity("기쁨", 6)},
+            created_at=now - timedelta(hours=i),
+        ))
+    db.commit()
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: User(id=1, nickname="list")
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path", ["/records/", "/records/period/7"])
+def test_full_view_returns_full_records(client, path):
+    response = client.get(path)
+    assert response.status_code == 200
+    items = response.json()
+    assert len(items) == 3
+    for item in items:
+        assert FULL_FIELDS <= set(item)
+        assert not COMPACT_FIELDS & set(item)
+
+
+@pytest.mark.parametrize("path", ["/records/", "/records/period/7"])
+def test_compact_view_returns_list_items(client, path):
+    response = client.get(path, params={"view": "compact"})
+    assert response.status_code == 200
+    items = response.json()
+    assert len(items) == 3
+    for item in items:
+        assert COMPACT_FIELDS <= set(item)
+        assert not FULL_FIELDS & set(item)
+        assert item["emotion_primary"] == "기쁨"
+
+
+def test_cursor_header_and_offset_paths(client):
+    response = client.get("/records/", params={"limit": 2, "view": "compact"})
+    assert len(response.json()) == 2
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = client.get("/records/", params={"limit": 2, "cursor": cursor})
+    assert [item["content"] for item in response.json()] == ["기록 2"]
+    assert "X-Next-Cursor" not in response.headers
+
+    response = client.get("/records/", params={"skip": 1, "view": "full"})
+    assert [item["content"] for item in response.json()] == ["기록 1", "기록 2"]
+
+
+def test_full_view_never_falls_back_to_compact(client, db):
+    # full 모델의 필수 값이 비어 있는 기록 → 요약 모델로 바뀌어 200이 나가면 안 됨
+    db.query(Record).filter(Record.content == "기록 1").update({"ai_summary": None}, synchronize_session=False)
+    db.commit()
+
+    response = client.get("/records/")
+    assert response.status_code == 400
+    # compact 화면은 그대로 조회됨
+    response = client.get("/records/", params={"view": "compact"})
+    assert response.status_code == 200
+    assert len(response.json()) == 3
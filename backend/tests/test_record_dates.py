@@ -0,0 +1,93 @@
+"""기존 기록 작성일 채우기 (models/record.py backfill_record_dates) - 하루 한 번 제한이 기존 기록에도 적용되는지"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from local_date import local_date, local_today
+from models.record import Record, backfill_record_dates, record_date_updates
+from models.user import User
+from services.record_service import DAILY_LIMIT_MESSAGE, RecordService
+
+
+def _insert_legacy(connection, user_id, created_at, **values):
+    """컬럼 추가(ALTER) 직후처럼 record_date/daily_record_date가 빈 기록 (ORM 이벤트를 거치지 않음)"""
+    return connection.execute(insert(Record.__table__).values(
+        user_id=user_id, content="예전 기록", created_at=created_at, analysis_status="completed",
+        share_with_counselor=False, **values
+    )).inserted_primary_key[0]
+
+
+def _dates(db):
+    db.expire_all()
+    return {r.id: (r.record_date, r.daily_record_date) for r in db.query(Record)}
+
+
+@pytest.fixture
+def users(db):
+    db.add(User(id=1, email="limit@example.com", nickname="limit"))
+    db.add(User(id=2, email="dev@example.com", nickname="dev", is_developer=True))
+    db.commit()
+
+
+def test_backfill_assigns_dates_and_daily_slots(engine, db, users):
+    now = datetime.now()
+    with engine.begin() as connection:
+        first = _insert_legacy(connection, 1, now - timedelta(minutes=30))
+        second = _insert_legacy(connection, 1, now - timedelta(minutes=10))
+        older = _insert_legacy(connection, 1, now - timedelta(days=3))
+        developer = _insert_legacy(connection, 2, now - timedelta(minutes=5))
+        assert backfill_record_dates(connection) == 4
+
+    today = local_today()
+    assert _dates(db) == {
+        first: (today, today),
+        # 같은 날 두 번째 기록은 작성일만 있고 제한 슬롯은 없음
+        second: (today, None),
+        older: (local_date(now - timedelta(days=3)), local_date(now - timedelta(days=3))),
+        # 개발자 모드 기록은 제한 슬롯 없음
+        developer: (today, None),
+    }
+
+    # 다시 실행해도 바뀌는 행 없음
+    with engine.begin() as connection:
+        assert backfill_record_dates(connection) == 0
+
+
+def test_backfilled_record_blocks_second_entry_today(engine, db, users):
+    with engine.begin() as connection:
+        _insert_legacy(connection, 1, datetime.now() - timedelta(minutes=1))
+        backfill_record_dates(connection)
+
+    assert RecordService.get_today_record(db, 1) is not None
+    with pytest.raises(ValueError, match=DAILY_LIMIT_MESSAGE):
+        RecordService.create_record(db, 1, "오늘 두 번째 기록")
+
+
+def test_backfill_moves_slot_to_earlier_legacy_record(engine, db, users):
+    # 마이그레이션 이후 새 기록이 오늘 슬롯을 가져갔는데, 더 먼저 쓴 예전 기록이 NULL로 남은 경우
+    now = datetime.now()
+    today = local_today()
+    with engine.begin() as connection:
+        legacy = _insert_legacy(connection, 1, now - timedelta(minutes=20))
+        recent = _insert_legacy(connection, 1, now, record_date=today, daily_record_date=today)
+        # 슬롯을 비우는 UPDATE를 먼저 실행하므로 유니크 인덱스와 충돌하지 않음
+        assert backfill_record_dates(connection) == 2
+
+    assert _dates(db) == {legacy: (today, today), recent: (today, None)}
+
+
+def test_record_date_updates_skips_unchanged_rows():
+    day = local_date(datetime(2026, 5, 1, 12, 0))
+    rows = [
+        (1, datetime(2026, 5, 1, 12, 0), day, day),
+        (2, datetime(2026, 5, 1, 13, 0), None, None),
+        (3, None, day, None),
+    ]
+    assert record_date_updates(rows, daily_limited=True) == [
+        {"b_id": 2, "record_date": day, "daily_record_date": None},
+    ]
+    assert record_date_updates(rows, daily_limited=False) == [
+        {"b_id": 1, "record_date": day, "daily_record_date": None},
+        {"b_id": 2, "record_date": day, "daily_record_date": None},
+    ]
@@ -0,0 +1,50 @@
+"""커서 기반 기록 목록 조회 (RecordService.get_user_records_page)"""
+from datetime import datetime, timedelta
+
+from models.record import Record
+from models.user import User
+from services.record_service import RecordService
+
+
+def _walk_pages(db, user_id, limit, **kwargs):
+    """커서가 끝날 때까지 모든 페이지를 읽어 id 목록 반환"""
+    ids, cursor = [], None
+    for _ in range(100):
+        records, cursor = RecordService.get_user_records_page(db, user_id, limit=limit, cursor=cursor, **kwargs)
+        ids.extend(record.id for record in records)
+        if cursor is None:
+            return ids
+    raise AssertionError(f"커서가 끝나지 않음: {ids[:20]}")
+
+
+def _seed(db):
+    db.add(User(id=1, email="page@example.com", nickname="page"))
+    db.add(User(id=2, email="other@example.com", nickname="other"))
+    db.flush()
+    # created_at 서버 기본값(초 단위까지만 저장) - 같은 초에 여러 건
+    for i in range(7):
+        db.add(Record(user_id=1, content=f"기본값 {i}"))
+    db.flush()
+    # ORM에서 직접 넣은 created_at (마이크로초 포함/미포함, 같은 시각 중복)
+    base = datetime(2026, 1, 1, 9, 30, 0)
+    for i in range(9):
+        db.add(Record(user_id=1, content=f"지정 {i}", created_at=base - timedelta(seconds=i // 3, microseconds=(i % 2) * 250)))
+    db.add(Record(user_id=2, content="다른 사용자", created_at=base))
+    db.commit()
+
+
+def test_walks_all_pages_without_repeats(db):
+    _seed(db)
+    expected = {record_id for (record_id,) in db.query(Record.id).filter(Record.user_id == 1)}
+
+    for limit in (1, 2, 3, 5, 100):
+        ids = _walk_pages(db, 1, limit)
+        assert len(ids) == len(set(ids)), f"limit={limit} 중복 id: {ids}"
+        assert set(ids) == expected
+
+
+def test_pages_are_newest_first(db):
+    _seed(db)
+    ids = _walk_pages(db, 1, 4, compact=True)
+    created = {record.id: record.created_at for record in db.query(Record).filter(Record.user_id == 1)}
+    assert [created[i] for i in ids] == sorted((created[i] for i in ids), reverse=True)
@@ -0,0 +1,256 @@
+"""기록 검색 (services/record_search_service.py) - 메모리 역색인 순위/필터, 스니펫 강조 구간, FULLTEXT 비활성화 조건"""
+import math
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy.exc import InternalError
+
+import services.record_search_service as search_module
+from models.record import Record
+from models.user import User
+from services.record_search_service import RecordSearchService, _UserIndex, _tokens
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    """테스트마다 역색인 캐시/FULLTEXT 사용 여부 초기화"""
+    monkeypatch.setattr(search_module, "_indexes", {})
+    monkeypatch.setattr(search_module, "_fulltext_available", True)
+
+
+def _add(db, content, created_at, summary=None, keywords=None, emotion="기쁨", user_id=1, record_date=None):
+    record = Record(user_id=user_id, content=content, ai_summary=summary, ai_keywords=keywords,
+                    emotion_analysis={"primary_emotion": emotion}, created_at=created_at,
+                    record_date=record_date or created_at.date())
+    db.add(record)
+    db.flush()
+    return record.id
+
+
+@pytest.fixture
+def records(db):
+    db.add(User(id=1, email="search@example.com", nickname="search"))
+    db.add(User(id=2, email="other@example.com", nickname="other"))
+    db.flush()
+    ids = {
+        "content": _add(db, "오늘은 공원에서 산책을 했다", datetime(2026, 4, 1, 9, 0)),
+        "keyword": _add(db, "하루 종일 집에 있었다", datetime(2026, 4, 2, 9, 0), keywords=["산책"], emotion="슬픔"),
+        "summary": _add(db, "친구를 만났다", datetime(2026, 4, 3, 9, 0), summary="저녁 산책", emotion="신뢰"),
+        "none": _add(db, "회의가 길었다", datetime(2026, 4, 4, 9, 0), emotion="분노"),
+        "older_twin": _add(db, "비 오는 날 우산", datetime(2026, 3, 1, 9, 0)),
+        "newer_twin": _add(db, "비 오는 날 우산", datetime(2026, 3, 5, 9, 0)),
+        "other_user": _add(db, "산책 산책 산책", datetime(2026, 4, 1, 9, 0), user_id=2),
+    }
+    db.commit()
+    return ids
+
+
+def _ids(results):
+    return [result["id"] for result in results]
+
+
+# ----- 메모리 역색인 순위 -----
+
+def test_ranking_weights_keywords_over_summary_over_content(db, records):
+    results = RecordSearchService.search(db, 1, "산책")
+    assert _ids(results) == [records["keyword"], records["summary"], records["content"]]
+    assert results[0]["score"] > results[1]["score"] > results[2]["score"] > 0
+
+
+def test_ranking_ties_are_newest_first_and_other_users_excluded(db, records):
+    assert _ids(RecordSearchService.search(db, 1, "우산")) == [records["newer_twin"], records["older_twin"]]
+    assert records["other_user"] not in _ids(RecordSearchService.search(db, 1, "산책"))
+    assert RecordSearchService.search(db, 1, "없는말") == []
+    assert RecordSearchService.search(db, 1, "  ") == []
+
+
+def test_bm25_score_matches_formula():
+    rows = [
+        (1, "산책", None, None, None, None, None),
+        (2, "산책 산책 공원", None, None, None, None, None),
+        (3, "공원", None, None, None, None, None),
+    ]
+    index = _UserIndex(rows)
+    # 토큰: 1 → [산책], 2 → [산책, 산책, 공원], 3 → [공원] (단어별 bigram)
+    assert index.lengths == {1: 1.0, 2: 3.0, 3: 1.0}
+    average = 5 / 3
+    idf = math.log(1 + (3 - 2 + 0.5) / (2 + 0.5))
+
+    def expected(tf, length):
+        norm = 1 - 0.75 + 0.75 * length / average
+        return idf * tf * 2.2 / (tf + 1.2 * norm)
+
+    scores = index.score("산책")
+    assert scores[1] == pytest.approx(expected(1.0, 1.0))
+    assert scores[2] == pytest.approx(expected(2.0, 3.0))
+    assert 3 not in scores
+
+
+def test_limit_and_cache_invalidation(db, records):
+    assert len(RecordSearchService.search(db, 1, "산책", limit=2)) == 2
+    # 새 기록 저장 → 사용자 캐시가 비워져 바로 검색됨
+    new_id = _add(db, "산책 산책 산책 산책", datetime(2026, 4, 5, 9, 0), keywords=["산책"])
+    db.commit()
+    assert RecordSearchService.search(db, 1, "산책", limit=1)[0]["id"] == new_id
+
+
+# ----- 필터 -----
+
+def test_emotion_filter(db, records):
+    assert _ids(RecordSearchService.search(db, 1, "산책", emotion="신뢰")) == [records["summary"]]
+    assert RecordSearchService.search(db, 1, "산책", emotion="두려움") == []
+
+
+def test_date_filters_are_inclusive_on_record_date(db, records):
+    search = RecordSearchService.search
+    assert _ids(search(db, 1, "산책", start_date=date(2026, 4, 2))) == [records["keyword"], records["summary"]]
+    assert _ids(search(db, 1, "산책", end_date=date(2026, 4, 2))) == [records["keyword"], records["content"]]
+    assert _ids(search(db, 1, "산책", start_date=date(2026, 4, 3), end_date=date(2026, 4, 3))) == [records["summary"]]
+    assert search(db, 1, "산책", start_date=date(2026, 4, 10)) == []
+
+
+def test_date_filter_skips_records_without_record_date(db, records):
+    db.query(Record).filter(Record.id == records["keyword"]).update({"record_date": None}, synchronize_session=False)
+    db.commit()
+    RecordSearchService.invalidate(1)
+    assert records["keyword"] in _ids(RecordSearchService.search(db, 1, "산책"))
+    assert records["keyword"] not in _ids(RecordSearchService.search(db, 1, "산책", start_date=date(2026, 1, 1)))
+
+
+# ----- 스니펫/강조 구간 -----
+
+def _highlighted(snippet, highlights):
+    return [snippet[start:end] for start, end in highlights]
+
+
+def test_snippet_short_text_highlights_whole_words_case_insensitive():
+    snippet, highlights = RecordSearchService.snippet("Walk in the park, long walk", "walk")
+    assert snippet == "Walk in the park, long walk"
+    assert highlights == [[0, 4], [23, 27]]
+    assert _highlighted(snippet, highlights) == ["Walk", "walk"]
+
+
+def test_snippet_prefix_shifts_highlight_offsets():
+    text = "가" * 100 + " 산책 " + "나" * 100
+    snippet, highlights = RecordSearchService.snippet(text, "산책", size=30)
+    first = text.index("산책")
+    start = first - 10
+    assert snippet == "…" + text[start:start + 30] + "…"
+    # 앞에 붙은 "…" 한 글자만큼 오프셋이 밀림
+    assert highlights == [[first - start + 1, first - start + 3]]
+    assert _highlighted(snippet, highlights) == ["산책"]
+
+
+def test_snippet_window_at_text_end_merges_adjacent_matches():
+    text = "나" * 50 + "산책" * 3
+    snippet, highlights = RecordSearchService.snippet(text, "산책", size=10)
+    # 끝에 가까우면 창을 텍스트 끝에 맞춤 (접미사 없음), 붙어 있는 일치 구간은 하나로 합침
+    assert snippet == "…" + text[-10:]
+    assert highlights == [[5, 11]]
+    assert _highlighted(snippet, highlights) == ["산책" * 3]
+
+
+def test_snippet_clips_highlights_at_window_edges():
+    text = "산책" * 20
+    snippet, highlights = RecordSearchService.snippet(text, "산책", size=10)
+    # 창이 텍스트 앞에서 시작 → 접두사 없음, 합쳐진 일치 구간은 창 끝에서 잘림
+    assert snippet == text[:10] + "…"
+    assert highlights == [[0, 10]]
+
+
+def test_snippet_bigram_fallback_and_no_match():
+    # 검색어 단어 전체는 없고 bigram만 일치 (ngram 검색과 같음)
+    snippet, highlights = RecordSearchService.snippet("공원 산책로를 걸었다", "산책길")
+    assert _highlighted(snippet, highlights) == ["산책"]
+
+    text = "가" * 100
+    assert RecordSearchService.snippet(text, "산책", size=20) == ("가" * 20 + "…", [])
+    assert RecordSearchService.snippet("짧은 글", "산책") == ("짧은 글", [])
+    assert RecordSearchService.snippet(None, "산책") == ("", [])
+
+
+def test_find_spans_merges_overlaps_in_order():
+    assert RecordSearchService._find_spans("산책산책 공원", ["산책", "책산", "공원"]) == [[0, 4], [5, 7]]
+    assert RecordSearchService._find_spans("aaa", ["aa"]) == [[0, 3]]
+    assert RecordSearchService._find_spans("abc", ["", "x"]) == []
+
+
+def test_search_uses_summary_snippet_when_content_has_no_match(db, records):
+    results = {result["id"]: result for result in RecordSearchService.search(db, 1, "산책")}
+    summary = results[records["summary"]]
+    assert summary["snippet"] == "저녁 산책"
+    assert _highlighted(summary["snippet"], summary["highlights"]) == ["산책"]
+    content = results[records["content"]]
+    assert _highlighted(content["snippet"], content["highlights"]) == ["산책"]
+    # 키워드에서만 맞은 기록은 강조 없이 본문 앞부분
+    assert results[records["keyword"]]["highlights"] == []
+
+
+def test_tokens_are_word_bigrams():
+    assert _tokens("산책을 했다 a") == ["산책", "책을", "했다", "a"]
+    assert _tokens(None) == []
+
+
+# ----- FULLTEXT 비활성화 (MySQL 1191만) -----
+
+class _MySQLDialect:
+    name = "mysql"
+
+
+class _MySQLBind:
+    """SQLite 연결을 그대로 쓰면서 dialect 이름만 mysql로 보이게 함"""
+
+    def __init__(self, bind):
+        self._bind = bind
+        self.dialect = _MySQLDialect()
+
+    def __getattr__(self, name):
+        return getattr(self._bind, name)
+
+
+@pytest.fixture
+def mysql_session(db, records, monkeypatch):
+    monkeypatch.setattr(db, "bind", _MySQLBind(db.bind))
+    return db
+
+
+def _fulltext_raising(code, calls):
+    def _search_fulltext(*args, **kwargs):
+        calls.append(code)
+        raise InternalError("SELECT ... MATCH", {}, Exception(code, "error"))
+    return staticmethod(_search_fulltext)
+
+
+def test_other_match_errors_fall_back_for_one_request(mysql_session, records, monkeypatch):
+    calls = []
+    monkeypatch.setattr(RecordSearchService, "_search_fulltext", _fulltext_raising(1064, calls))
+    for _ in range(2):
+        assert _ids(RecordSearchService.search(mysql_session, 1, "산책"))[0] == records["keyword"]
+    # 1191이 아니면 계속 FULLTEXT를 먼저 시도
+    assert calls == [1064, 1064]
+    assert search_module._fulltext_available is True
+
+
+def test_missing_fulltext_index_disables_match(mysql_session, records, monkeypatch):
+    calls = []
+    monkeypatch.setattr(RecordSearchService, "_search_fulltext", _fulltext_raising(1191, calls))
+    for _ in range(2):
+        assert _ids(RecordSearchService.search(mysql_session, 1, "산책"))[0] == records["keyword"]
+    # 1191이면 이후 요청은 MATCH를 시도하지 않음
+    assert calls == [1191]
+    assert search_module._fulltext_available is False
+
+
+def test_fulltext_hits_are_used_when_available(mysql_session, records, monkeypatch):
+    monkeypatch.setattr(RecordSearchService, "_search_fulltext",
+                        staticmethod(lambda *args, **kwargs: [(records["content"], 3.5)]))
+    results = RecordSearchService.search(mysql_session, 1, "산책")
+    assert _ids(results) == [records["content"]]
+    assert results[0]["score"] == 3.5
+
+
+def test_is_missing_fulltext_index_checks_error_code():
+    assert RecordSearchService._is_missing_fulltext_index(InternalError("s", {}, Exception(1191, "x")))
+    assert not RecordSearchService._is_missing_fulltext_index(InternalError("s", {}, Exception(1064, "x")))
+    assert not RecordSearchService._is_missing_fulltext_index(InternalError("s", {}, Exception()))
+    assert not RecordSearchService._is_missing_fulltext_index(ValueError(1191))
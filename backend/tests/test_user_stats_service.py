@@ -0,0 +1,171 @@
+"""사용자 기록 카운터 (services/user_stats_service.py) - 연속 작성 일수/이번 달 기록 수 증분 갱신과 재계산"""
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from models.record import Record
+from models.user import User
+from models.user_record_stats import UserRecordStats
+from services.record_service import RecordService
+from services.user_stats_service import UserStatsService
+
+
+@pytest.fixture
+def today(monkeypatch):
+    """서비스 시간대 오늘 날짜 고정 (set으로 날짜를 바꿈)"""
+    class Today:
+        value = date(2026, 3, 10)
+
+        def set(self, value):
+            self.value = value
+
+    current = Today()
+    monkeypatch.setattr("services.user_stats_service.local_today", lambda: current.value)
+    return current
+
+
+@pytest.fixture
+def user(db):
+    db.add(User(id=1, email="stats@example.com", nickname="stats"))
+    db.commit()
+    return 1
+
+
+def _create(db, record_date, created_at=None, user_id=1):
+    """기록 생성 경로와 같이 저장 후 카운터 증분 갱신"""
+    created_at = created_at or datetime.combine(record_date, datetime.min.time()).replace(hour=12)
+    record = Record(user_id=user_id, content="기록", created_at=created_at, record_date=record_date)
+    db.add(record)
+    db.flush()
+    UserStatsService.on_record_created(db, record)
+    db.commit()
+    return record
+
+
+def _stored(db, user_id=1):
+    db.expire_all()
+    stats = db.get(UserRecordStats, user_id)
+    return {
+        "total_records": stats.total_records,
+        "current_streak": stats.current_streak,
+        "last_record_date": stats.last_record_date,
+        "month_start": stats.month_start,
+        "month_records": stats.month_records,
+    }
+
+
+def _assert_matches_compute(db, user_id=1):
+    assert _stored(db, user_id) == UserStatsService.compute(db, user_id)
+
+
+def test_streak_across_midnight(db, user, today):
+    # 23:50과 다음 날 00:10 기록 → 작성일이 이어지므로 연속 2일
+    _create(db, date(2026, 3, 8), datetime(2026, 3, 8, 23, 50))
+    _create(db, date(2026, 3, 9), datetime(2026, 3, 9, 0, 10))
+    assert _stored(db)["current_streak"] == 2
+    _assert_matches_compute(db)
+
+    # 어제까지 이어진 streak는 오늘 아직 안 써도 유지, 자정이 지나 이틀 전이 되면 0
+    today.set(date(2026, 3, 10))
+    assert UserStatsService.get_stats(db, user)["current_streak"] == 2
+    today.set(date(2026, 3, 11))
+    assert UserStatsService.get_stats(db, user)["current_streak"] == 0
+
+
+def test_same_day_records_do_not_extend_streak(db, user, today):
+    _create(db, date(2026, 3, 9), datetime(2026, 3, 9, 8, 0))
+    _create(db, date(2026, 3, 9), datetime(2026, 3, 9, 23, 59))
+    stored = _stored(db)
+    assert (stored["total_records"], stored["current_streak"], stored["month_records"]) == (2, 1, 2)
+    _assert_matches_compute(db)
+
+
+def test_broken_streak_restarts(db, user, today):
+    for day in (date(2026, 3, 1), date(2026, 3, 2), date(2026, 3, 3)):
+        _create(db, day)
+    assert _stored(db)["current_streak"] == 3
+
+    # 하루 건너뜀 → 1부터 다시
+    _create(db, date(2026, 3, 5))
+    assert _stored(db)["current_streak"] == 1
+    _create(db, date(2026, 3, 6))
+    assert _stored(db)["current_streak"] == 2
+    _assert_matches_compute(db)
+
+    today.set(date(2026, 3, 6))
+    assert UserStatsService.get_stats(db, user) == {
+        "total_records": 5, "current_streak": 2, "last_record_date": date(2026, 3, 6), "month_records": 5,
+    }
+
+
+def test_month_rollover(db, user, today):
+    today.set(date(2026, 1, 31))
+    _create(db, date(2026, 1, 30))
+    _create(db, date(2026, 1, 31))
+    assert (_stored(db)["month_start"], _stored(db)["month_records"]) == (date(2026, 1, 1), 2)
+
+    # 다음 달 첫 기록 → 월 카운터는 1부터, streak는 이어짐
+    today.set(date(2026, 2, 1))
+    assert UserStatsService.get_stats(db, user)["month_records"] == 0
+    _create(db, date(2026, 2, 1))
+    stored = _stored(db)
+    assert (stored["month_start"], stored["month_records"], stored["current_streak"]) == (date(2026, 2, 1), 1, 3)
+    _assert_matches_compute(db)
+
+    # 저장된 카운터가 지난달 것이면 조회 시 이번 달 기록 수는 0
+    today.set(date(2026, 3, 1))
+    stats = UserStatsService.get_stats(db, user)
+    assert (stats["month_records"], stats["current_streak"], stats["total_records"]) == (0, 0, 3)
+
+
+def test_past_dated_record_triggers_recompute(db, user, today):
+    _create(db, date(2026, 3, 7))
+    _create(db, date(2026, 3, 9))
+    assert _stored(db)["current_streak"] == 1
+    # 빠진 날짜를 나중에 채움 → 전체 재계산으로 streak 3
+    _create(db, date(2026, 3, 8))
+    assert _stored(db)["current_streak"] == 3
+    _assert_matches_compute(db)
+
+
+def test_delete_triggers_recompute(db, user, today):
+    records = [_create(db, date(2026, 3, day)) for day in (6, 7, 8, 9)]
+    assert _stored(db)["current_streak"] == 4
+
+    # 가운데 날짜 삭제 → streak가 끊김
+    assert RecordService.delete_record(db, records[1].id, user)
+    stored = _stored(db)
+    assert (stored["total_records"], stored["current_streak"], stored["month_records"]) == (3, 2, 3)
+
+    # 마지막 날짜 삭제 → 직전 날짜까지의 streak
+    assert RecordService.delete_record(db, records[3].id, user)
+    stored = _stored(db)
+    assert (stored["total_records"], stored["current_streak"], stored["last_record_date"]) == (2, 1, date(2026, 3, 8))
+    _assert_matches_compute(db)
+
+
+def test_first_read_computes_and_saves_counters(db, user, today):
+    # 카운터 도입 전 기록 (on_record_created를 거치지 않음)
+    for day in (8, 9, 10):
+        db.add(Record(user_id=user, content="예전 기록", created_at=datetime(2026, 3, day, 9, 0),
+                      record_date=date(2026, 3, day)))
+    db.commit()
+    assert db.get(UserRecordStats, user) is None
+
+    stats = UserStatsService.get_stats(db, user)
+    assert stats == {"total_records": 3, "current_streak": 3, "last_record_date": date(2026, 3, 10), "month_records": 3}
+    assert db.get(UserRecordStats, user) is not None
+    _assert_matches_compute(db)
+
+    # 이후 기록은 저장된 카운터에 증분 갱신
+    _create(db, date(2026, 3, 11))
+    assert _stored(db)["current_streak"] == 4
+
+
+def test_user_without_records_gets_empty_counters(db, user, today):
+    assert UserStatsService.get_stats(db, user) == {
+        "total_records": 0, "current_streak": 0, "last_record_date": None, "month_records": 0,
+    }
+    _create(db, date(2026, 3, 10))
+    stored = _stored(db)
+    assert (stored["total_records"], stored["current_streak"], stored["month_records"]) == (1, 1, 1)